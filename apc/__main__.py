@@ -1,9 +1,12 @@
 from apc.logging_config import setup_logging
 setup_logging()
 
-from apc import fur_seed, hacks, hacks2, config
+import argparse
+from pathlib import Path
 
-def main():
+def hack():
+  # the helpers need the dev dependencies (pyautogui), keep them out of the batch workers
+  from apc import fur_seed, hacks, hacks2, config
   #hacks.seed_animals("emerald")
   #hacks.seed_animals("sundarpatan")
   #hacks.merge_animal_details()
@@ -17,6 +20,22 @@ def main():
     # hacks.seed_animals3(reserve)
     # hacks2a.seed_fur_ids(reserve)
 
+def main():
+  parser = argparse.ArgumentParser(prog="apc", description="Modify theHunter: Call of the Wild animal populations without the GUI")
+  commands = parser.add_subparsers(dest="command", required=True)
+  batch_parser = commands.add_parser("batch", help="apply a recipe of modifications, one reserve per worker process")
+  batch_parser.add_argument("recipe", type=Path, help="JSON or YAML recipe, see apc/batch.py")
+  batch_parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the CPU count")
+  batch_parser.add_argument("--modded", action="store_true", help="start from the modded files instead of the saves")
+  batch_parser.add_argument("--seed", type=int, default=None, help="seed the random picks so the run can be repeated, overrides the recipe's seed")
+  commands.add_parser("hacks", help="run the development helpers in apc/__main__.py")
+  args = parser.parse_args()
+
+  if args.command == "batch":
+    from apc import batch
+    raise SystemExit(batch.main(args.recipe, workers=args.workers, modded=args.modded, seed=args.seed))
+  hack()
+
 
 if __name__ == "__main__":
   main()
@@ -1,21 +1,23 @@
-from apc.logging_config import get_logger
+from apc.logging_config import debug_enabled, get_logger
 
 logger = get_logger(__name__)
 
 import contextlib
-import random
 import struct
 import zlib
 from copy import deepcopy
 from dataclasses import dataclass
 from pathlib import Path
 
-from apc import config, fur_seed
+import numpy as np
+
+from apc import config, fur_seed, hash_names, profiling, thresholds
 from apc.adf_profile import (AdfArray, create_f32, create_u8, create_u32,
-                             insert_data, read_f32, read_u8, read_u32,
-                             write_value)
-from deca.ff_adf import Adf, AdfValue
+                             get_primitive_size, insert_data, read_f32,
+                             read_u8, read_u32, write_value)
+from deca.ff_adf import Adf, AdfValue, typedef_f32, typedef_u8, typedef_u32
 from deca.file import ArchiveFile
+from deca.hashes import hash32_func
 
 
 class FileNotFound(Exception):
@@ -30,6 +32,7 @@ class DecompressedAdfFile():
         self.data = data
         self.org_size = len(header + data)
 
+    @profiling.timed("DecompressedAdfFile.save")
     def save(self, destination: Path) -> None:
         decompressed_data_bytes = self.header + self.data
         new_size = len(decompressed_data_bytes)
@@ -59,6 +62,7 @@ class LoadedReserve:
     json_config: dict
     modded: bool
     changed: bool
+    in_session: bool
     parsed_adf = ParsedAdfFile
     population_description: list[list]
     species_groups: dict
@@ -71,22 +75,235 @@ class LoadedReserve:
         self.json_config = config.RESERVES[reserve_key]
         self.modded = modded
         self.changed = False  # should the file be reloaded when changing UI views?
+        self.in_session = False
+        self._session_changed = False
+        self._animal_table = None
+        self._animal_index = None
         self.parse() if parse else None
         self.population_description = None
         self.species_groups = None
 
     def parse(self, txt: bool = False) -> None:
         self.parsed_adf = load_adf(self.filename, txt=False)
+        self.reset_animals()
+
+    def reset_animals(self) -> None:
+        '''Drop the animal table and index; call after animals are added or removed since every later offset moves'''
+        self._animal_table = None
+        self._animal_index = None
+
+    def refresh_animals(self, offsets: list[int]) -> None:
+        '''Re-classify animals, identified by their data offset, in the index if it has been built'''
+        if self._animal_index is not None:
+            self._animal_index.refresh(self._animal_table.rows_at(offsets))
+
+    @property
+    def animal_table(self) -> 'AnimalTable':
+        if self._animal_table is None:
+            self._animal_table = AnimalTable(self.parsed_adf.adf, self.parsed_adf.decompressed.data)
+        return self._animal_table
+
+    @property
+    def animal_index(self) -> 'AnimalIndex':
+        if self._animal_index is None:
+            self._animal_index = AnimalIndex(self.reserve_key, self.animal_table)
+        return self._animal_index
 
     # def describe_reserve(self) -> None:
     #     self.population_description, self.species_groups = describe_reserve(reserve_key, loaded_reserve.parsed_adf.adf)
 
     def save(self) -> None:
+        if self.in_session:
+            # the in-memory data stays authoritative until the session is committed
+            self._session_changed = True
+            return
         self.parsed_adf.decompressed.save(config.MOD_DIR_PATH)
         self.filename = _get_file_name(self.reserve_key, mod=True)
         self.modded = True
         self.parse()
 
+    def reparse(self) -> None:
+        '''Re-parse the in-memory data without saving it, keeping any unsaved changes'''
+        decompressed = self.parsed_adf.decompressed
+        _save_file(decompressed.filename, decompressed.data)
+        self.parsed_adf = ParsedAdfFile(decompressed, parse_adf(decompressed.filename))
+        self.reset_animals()
+
+    def begin(self) -> None:
+        '''
+        Start an edit session: strategies keep modifying the in-memory data and `save` is deferred until `commit`.
+        A whole party can then be applied with a single save and parse.
+        '''
+        self.in_session = True
+        self._session_changed = False
+
+    def commit(self) -> bool:
+        '''End the edit session and save once if anything changed'''
+        self.in_session = False
+        if not self._session_changed:
+            return False
+        self._session_changed = False
+        self.save()
+        return True
+
+    @contextlib.contextmanager
+    def edit_session(self):
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.commit()
+
+class AnimalTable:
+    '''
+    Column view of every animal in a population file.
+    Field offsets are collected with a single walk of the parsed ADF and values are read straight from the decompressed bytes.
+    Without `data` the values are copied out of the parsed ADF instead.
+    Rows are ordered by population, then group, so each population is a contiguous slice.
+    '''
+    COLUMNS = {
+        "gender": np.uint8,
+        "weight": np.float32,
+        "score": np.float32,
+        "great_one": np.uint8,
+        "seed": np.uint32,
+    }
+
+    def __init__(self, reserve_adf: Adf, data: bytearray = None) -> None:
+        self.data = data
+        self.animals: list[AdfValue] = []
+        self.population_groups: list[int] = []
+        populations = reserve_adf.table_instance_full_values[0].value["Populations"].value
+        population_index = []
+        group_index = []
+        leaves = {name: [] for name in self.COLUMNS}
+        for population_i, population in enumerate(populations):
+            groups = population.value["Groups"].value
+            self.population_groups.append(len(groups))
+            for group_i, group in enumerate(groups):
+                for animal in group.value["Animals"].value:
+                    fields = animal.value
+                    self.animals.append(animal)
+                    population_index.append(population_i)
+                    group_index.append(group_i)
+                    leaves["gender"].append(fields["Gender"])
+                    leaves["weight"].append(fields["Weight"])
+                    leaves["score"].append(fields["Score"])
+                    leaves["great_one"].append(_great_one_value(fields))
+                    leaves["seed"].append(fields["VisualVariationSeed"])
+        self.populations = np.array(population_index, dtype=np.int32)
+        self.groups = np.array(group_index, dtype=np.int32)
+        self.population_starts = np.searchsorted(self.populations, np.arange(len(populations) + 1))
+        self.dtypes = dict(self.COLUMNS)
+        if leaves["great_one"] and get_primitive_size(leaves["great_one"][0].type_id) == 4:
+            self.dtypes["great_one"] = np.uint32
+        self.offsets = {name: np.array([v.data_offset for v in values], dtype=np.int64) for name, values in leaves.items()}
+        self._values = None
+        if data is None:
+            self._values = {name: np.array([v.value for v in values], dtype=self.dtypes[name]) for name, values in leaves.items()}
+
+    def __len__(self) -> int:
+        return len(self.animals)
+
+    def population_slice(self, population_i: int) -> slice:
+        return slice(int(self.population_starts[population_i]), int(self.population_starts[population_i + 1]))
+
+    def column(self, name: str, rows: np.ndarray = None) -> np.ndarray:
+        if self._values is not None:
+            return self._values[name].copy() if rows is None else self._values[name][rows]
+        dtype = np.dtype(self.dtypes[name]).newbyteorder("<")
+        offsets = self.offsets[name] if rows is None else self.offsets[name][rows]
+        buffer = np.frombuffer(self.data, dtype=np.uint8)
+        # gather byte-wise so unaligned fields can be read in one go
+        raw = buffer[offsets[:, None] + np.arange(dtype.itemsize)]
+        del buffer  # release the export so the bytearray can still be resized
+        return raw.view(dtype).reshape(-1)
+
+    def rows_at(self, offsets: list[int]) -> np.ndarray:
+        return np.flatnonzero(np.isin(self.offsets["gender"], offsets))
+
+    def genders(self, rows: np.ndarray = None) -> np.ndarray:
+        return self.column("gender", rows)
+
+    def weights(self, rows: np.ndarray = None) -> np.ndarray:
+        return self.column("weight", rows).astype(np.float64)
+
+    def scores(self, rows: np.ndarray = None) -> np.ndarray:
+        return self.column("score", rows).astype(np.float64)
+
+    def great_ones(self, rows: np.ndarray = None) -> np.ndarray:
+        return self.column("great_one", rows) == 1
+
+    def seeds(self, rows: np.ndarray = None) -> np.ndarray:
+        return self.column("seed", rows)
+
+class AnimalIndex:
+    '''
+    Rows of an AnimalTable bucketed per species by gender, diamond and Great One status.
+    Call `refresh` with the rows a mutation touched; only the buckets of the affected species are rebuilt.
+    '''
+    MALE = 1
+    DIAMOND = 2
+    GREAT_ONE = 4
+
+    def __init__(self, reserve_key: str, table: AnimalTable) -> None:
+        self.reserve_key = reserve_key
+        self.table = table
+        self.species: list[str] = config.RESERVES[reserve_key]["species"]
+        self.categories = np.zeros(len(table), dtype=np.uint8)
+        self._buckets: dict[int, list[np.ndarray]] = {}
+        self.refresh(np.arange(len(table)))
+
+    def refresh(self, rows: np.ndarray) -> None:
+        rows = np.asarray(rows, dtype=np.int64)
+        populations = self.table.populations[rows]
+        genders = self.table.genders(rows)
+        scores = self.table.scores(rows)
+        diamonds = np.zeros(len(rows), dtype=bool)
+        for population_i in np.unique(populations).tolist():
+            in_population = populations == population_i
+            if population_i < len(self.species):
+                diamonds[in_population] = thresholds.classify_diamonds(self.species[population_i], genders[in_population], scores[in_population])
+            self._buckets.pop(population_i, None)
+        categories = np.where(genders == self.MALE, self.MALE, 0) | np.where(diamonds, self.DIAMOND, 0) | np.where(self.table.great_ones(rows), self.GREAT_ONE, 0)
+        self.categories[rows] = categories
+
+    def _species_buckets(self, species_key: str) -> list[np.ndarray]:
+        population_i = self.species.index(species_key)
+        if (buckets := self._buckets.get(population_i)) is None:
+            population = self.table.population_slice(population_i)
+            categories = self.categories[population]
+            order = np.argsort(categories, kind="stable") + population.start
+            bounds = np.cumsum(np.bincount(categories, minlength=8))
+            buckets = np.split(order, bounds[:-1])
+            self._buckets[population_i] = buckets
+        return buckets
+
+    def eligible(self, species_key: str, gender: str, include_diamonds: bool = False, include_great_ones: bool = False) -> np.ndarray:
+        buckets = self._species_buckets(species_key)
+        selected = []
+        for category, bucket in enumerate(buckets):
+            if category & self.GREAT_ONE and not include_great_ones:
+                continue
+            if category & self.DIAMOND and not include_diamonds:
+                continue
+            if gender == "both" or gender == ("male" if category & self.MALE else "female"):
+                selected.append(bucket)
+        return np.concatenate(selected) if selected else np.zeros(0, dtype=np.int64)
+
+    def sample(self, rows: np.ndarray, k: int, rng: np.random.Generator = None) -> np.ndarray:
+        return rows[config.random_generator(rng).choice(len(rows), size=k, replace=False)]
+
+    def animals(self, rows: np.ndarray, species_key: str) -> list['AdfAnimal']:
+        return [AdfAnimal(self.table.animals[row], species_key, self.reserve_key) for row in rows.tolist()]
+
+def _great_one_value(fields: dict) -> AdfValue:
+    if "IsGreatOne" in fields:
+      return fields["IsGreatOne"]
+    if "FeatureModifiers" in fields:
+      return fields["FeatureModifiers"].value["Flags"]
+    raise ValueError
+
 # @dataclass
 # class StatWithOffset:
 #   value: any
@@ -145,20 +362,7 @@ class AdfAnimal:
         self.scripted_offset = self.great_one_offset + 1
 
     def _parse_trophy(self) -> None:
-      if self.great_one:
-        self.trophy = config.GREATONE
-        return
-      species_config = config.get_species(self.species_key)
-      if species_config is None:
-        self.trophy = config.UNKNOWN
-        return
-      trophy_config = species_config.get("trophy", {})
-      for level in ["bronze", "silver", "gold", "diamond"]:
-        data = trophy_config.get(level)
-        if data and data["score_low"] <= self.score <= data["score_high"]:
-            self.trophy = getattr(config, level.upper())
-            return
-      self.trophy = config.NONE
+      self.trophy = thresholds.find_trophy(self.species_key, self.score, self.great_one)
 
     def __repr__(self) -> str:
       return str({
@@ -186,12 +390,12 @@ class AdfAnimal:
       return animal_bytes
 
     def clone(self) -> 'AdfAnimal':
-      logger.debug(f"Cloning animal: {self.species_key} {self.gender} @ {self.reserve_key}")
+      logger.debug("Cloning animal: %s %s @ %s", self.species_key, self.gender, self.reserve_key)
       cloned_adf = deepcopy(self.adf)
       clone = AdfAnimal(cloned_adf, self.species_key, self.reserve_key)
       return clone
 
-    def _randomize(self, gender: str = None, fur_key: str = None, keep_great_one: bool = False) -> None:
+    def _randomize(self, gender: str = None, fur_key: str = None, keep_great_one: bool = False, rng: np.random.Generator = None) -> None:
       '''
       Generate random gender, weight, score, and fur seed.
       Does not randomly generate Great Ones due to unknown in-game spawn chance.
@@ -199,7 +403,8 @@ class AdfAnimal:
       fur_key == "copy" will attempt to generate a new seed for the same fur if it's valid for the new gender
       Great One status will be removed if gender cannot be a Great One
       '''
-      logger.debug(self)
+      logger.debug("Randomizing animal: %s", self)
+      rng = config.random_generator(rng)
       great_one_gender = config.get_great_one_gender(self.species_key)
       great_one = (
           keep_great_one
@@ -213,18 +418,18 @@ class AdfAnimal:
           if great_one and great_one_gender != "both":
               gender = great_one_gender
           else:
-              gender = random.choice(("male", "female"))
+              gender = ("male", "female")[rng.integers(2)]
       gender_key = f"great_one_{gender}" if great_one else gender
       gender_config = config.get_species(self.species_key)["gender"][gender_key]
 
-      new_weight, new_score = config.generate_weight_and_score(gender_config)
+      new_weight, new_score = config.generate_weight_and_score(gender_config, rng=rng)
 
       if fur_key == "copy":
         fur_key = fur_seed.get_fur_for_seed(self.visual_seed, self.species_key, self.gender, self.great_one)
       if fur_key not in config.get_furs(self.species_key, gender, great_one):
         # fur_key is invalid for new gender/Great One status or can't be parsed from seed
         fur_key = None
-      new_fur_seed = fur_seed.find_fur_seed(self.species_key, gender, great_one=great_one, fur_key=fur_key)
+      new_fur_seed = fur_seed.find_fur_seed(self.species_key, gender, great_one=great_one, fur_key=fur_key, rng=rng)
 
       self.adf.value["Gender"].value = 1 if gender == "male" else 2
       self.adf.value["Weight"].value = new_weight
@@ -238,7 +443,7 @@ class AdfAnimal:
       self.adf.value["VisualVariationSeed"].value = new_fur_seed
       self.adf.value["Id"].value = 0
       self._parse_details()
-      logger.debug(f"Cloned animal: {self}")
+      logger.debug("Cloned animal: %s", self)
 
 def _get_file_name(reserve_key: str, mod: bool = False) -> Path:
     save_path = config.MOD_DIR_PATH if mod else config.get_save_path()
@@ -270,18 +475,24 @@ def _save_file(filename: Path, data_bytes: bytearray):
     filename.write_bytes(data_bytes)
     logger.debug(f"Saved {filename}")
 
-def _parse_adf_file(filename: Path, txt: bool = False, suffix: str = None) -> Adf:
+def _parse_adf_file(filename: Path, txt: bool = False, suffix: str = None, jsonl: bool = False) -> Adf:
     obj = Adf()
     with ArchiveFile(open(filename, 'rb')) as f:
-        with contextlib.redirect_stdout(None):
+        with contextlib.redirect_stdout(None), profiling.span("Adf.deserialize"):
             obj.deserialize(f)
-    if txt or suffix:
-      content = obj.dump_to_string()
-      suffix = f"_{suffix}.txt" if suffix else ".txt"
+    if txt or suffix or jsonl:
+      hash_names.load(config.CONFIG_PATH)
+      extension = ".jsonl" if jsonl else ".txt"
+      suffix = f"_{suffix}{extension}" if suffix else extension
       txt_filename = config.APP_DIR_PATH / f".working/{filename.name}{suffix}"
-      _save_file(txt_filename, bytearray(content, 'utf-8'))
+      txt_filename.parent.mkdir(exist_ok=True)
+      # written as it is formatted, a whole reserve dump never sits in memory
+      with txt_filename.open("w", encoding="utf-8") as f, profiling.span("Adf.dump"):
+        obj.dump(f, jsonl=jsonl)
+      logger.debug(f"Saved {txt_filename}")
     return obj
 
+@profiling.timed("decompress_adf_file")
 def _decompress_adf_file(filename: Path) -> DecompressedAdfFile:
     # read entire adf file
     data_bytes = _read_file(filename)
@@ -312,19 +523,19 @@ def _decompress_adf_file(filename: Path) -> DecompressedAdfFile:
         decompressed_data_bytes
     )
 
-def parse_adf(filename: Path, txt: bool = False, suffix: str = None) -> Adf:
+def parse_adf(filename: Path, txt: bool = False, suffix: str = None, jsonl: bool = False) -> Adf:
     logger.debug(f"Parsing {filename}")
-    return _parse_adf_file(filename, txt=txt, suffix=suffix)
+    return _parse_adf_file(filename, txt=txt, suffix=suffix, jsonl=jsonl)
 
-def load_adf(filename: Path, txt: bool = False, suffix: str = None) -> ParsedAdfFile:
+def load_adf(filename: Path, txt: bool = False, suffix: str = None, jsonl: bool = False) -> ParsedAdfFile:
     data = _decompress_adf_file(filename)
-    adf = parse_adf(data.filename, txt=txt, suffix=suffix)
+    adf = parse_adf(data.filename, txt=txt, suffix=suffix, jsonl=jsonl)
     return ParsedAdfFile(data, adf)
 
-def load_reserve(reserve_key: str, mod: bool = False, txt: bool = False, suffix: str = None) -> ParsedAdfFile:
+def load_reserve(reserve_key: str, mod: bool = False, txt: bool = False, suffix: str = None, jsonl: bool = False) -> ParsedAdfFile:
     filename = _get_file_name(reserve_key, mod)
     logger.debug(f"[bright_blue]{filename}[/bright_blue]")
-    return load_adf(filename, txt=txt, suffix=suffix)
+    return load_adf(filename, txt=txt, suffix=suffix, jsonl=jsonl)
 
 def update_offsets(value, changed_size: int, reserve_bytes: bytearray = None, offset_to_check: int = 0) -> None:
     if isinstance(value, AdfValue):
@@ -356,7 +567,7 @@ def update_value_offsets(value: AdfValue, changed_size: int, reserve_bytes: byte
 def _update_non_instance_offsets(loaded_reserve: LoadedReserve, changed_size: int) -> list[dict]:
     extracted_adf = loaded_reserve.parsed_adf.adf
     reserve_bytes = loaded_reserve.parsed_adf.decompressed.data
-    logger.debug(f"  Updating file header offsets by {changed_size}")
+    logger.debug("  Updating file header offsets by %d", changed_size)
     offsets_and_values = [
         (extracted_adf.header_profile["instance_offset_offset"], extracted_adf.instance_offset),
         (extracted_adf.header_profile["typedef_offset_offset"], extracted_adf.typedef_offset),
@@ -385,7 +596,7 @@ def _update_non_instance_offsets(loaded_reserve: LoadedReserve, changed_size: in
         extracted_adf.table_instance[0].header_profile[k] = v + changed_size
 
 def _update_instance_offsets(loaded_reserve: LoadedReserve, changed_size: int, offset_to_check: int) -> list[dict]:
-    logger.debug(f"Updating all offsets larger than {offset_to_check}")
+    logger.debug("Updating all offsets larger than %d", offset_to_check)
     reserve_bytes = loaded_reserve.parsed_adf.decompressed.data
     update_offsets(loaded_reserve.parsed_adf.adf.table_instance_full_values[0], changed_size, reserve_bytes=reserve_bytes, offset_to_check=offset_to_check)
 
@@ -395,15 +606,15 @@ def _insert_animal(loaded_reserve: LoadedReserve, group: AdfValue, animal: AdfAn
   group_animals: AdfValue = group.value["Animals"]
   array_length_offset = group_animals.info_offset + 8
   array_length = read_u32(reserve_bytes[array_length_offset:array_length_offset+4])
-  logger.debug(f"Updating array length at offset {array_length_offset} from {array_length} to {array_length+1}")
+  logger.debug("Updating array length at offset %d from %d to %d", array_length_offset, array_length, array_length + 1)
   write_value(reserve_bytes, create_u32(array_length + 1), array_length_offset)
   # write animal bytes into reserve_bytes
   animal_bytes = animal.to_bytes()
-  logger.debug(f"Writing animal data at offset {animal.offset}: {animal_bytes}")
+  logger.debug("Writing animal data at offset %d: %s", animal.offset, animal_bytes)
   insert_data(reserve_bytes, animal_bytes, animal.offset)
   write_value(reserve_bytes, create_u32(3), 4)  # ADFv3 to prevent crash on load
   # insert animal into Group list in extracted ADF
-  logger.debug(f"Inserting animal into ADF >> Species: {animal.species_key}")
+  logger.debug("Inserting animal into ADF >> Species: %s", animal.species_key)
   group_animals.value.insert(0, animal.adf)
 
 def _remove_animal(loaded_reserve: LoadedReserve, group: AdfValue, animal: AdfAnimal) -> None:
@@ -412,33 +623,35 @@ def _remove_animal(loaded_reserve: LoadedReserve, group: AdfValue, animal: AdfAn
   group_animals: AdfValue = group.value["Animals"]
   array_length_offset = group_animals.info_offset + 8
   array_length = read_u32(reserve_bytes[array_length_offset:array_length_offset+4])
-  logger.debug(f"Updating array length at offset {array_length_offset} from {array_length} to {array_length-1}")
+  logger.debug("Updating array length at offset %d from %d to %d", array_length_offset, array_length, array_length - 1)
   write_value(reserve_bytes, create_u32(array_length - 1), array_length_offset)
   # delete animal bytes from reserve_bytes
   animal_bytes = animal.to_bytes()
   if reserve_bytes[animal.offset:animal.offset+len(animal_bytes)] != animal_bytes:
     raise ValueError("Encountered an error removing the animal. Try again.")
-  logger.debug(f"Deleting animal data at offset {animal.offset}: {animal_bytes}")
-  logger.debug(f"sanity check for data @ offset {animal.offset}: {reserve_bytes[animal.offset:animal.offset+len(animal_bytes)]}")
+  if debug_enabled(logger):
+    logger.debug("Deleting animal data at offset %d: %s", animal.offset, animal_bytes)
+    logger.debug("sanity check for data @ offset %d: %s", animal.offset, reserve_bytes[animal.offset:animal.offset+len(animal_bytes)])
   del reserve_bytes[animal.offset:animal.offset+len(animal_bytes)]
   write_value(reserve_bytes, create_u32(3), 4)  # ADFv3 to prevent crash on load
   # insert animal into Group list in extracted ADF
-  logger.debug(f"Deleting animal from ADF >> Species: {animal.species_key}")
+  logger.debug("Deleting animal from ADF >> Species: %s", animal.species_key)
   del group_animals.value[0]
 
-def add_animal_to_group(loaded_reserve: LoadedReserve, group: AdfValue, species_key: str, gender: str) -> None:
+def add_animal_to_group(loaded_reserve: LoadedReserve, group: AdfValue, species_key: str, gender: str, rng: np.random.Generator = None) -> None:
     # Clone the first animal in the group
     adf_to_clone = group.value["Animals"].value[0]
     animal_to_clone = AdfAnimal(adf_to_clone, species_key, loaded_reserve.reserve_key)
     clone = animal_to_clone.clone()
     # Randomize the cloned animal's stats
-    clone._randomize(gender=gender)
+    clone._randomize(gender=gender, rng=rng)
     added_size = len(clone.to_bytes())
     # Update file header offsets and offsets of everything located after the cloned animal in the file
     _update_non_instance_offsets(loaded_reserve, added_size)
     _update_instance_offsets(loaded_reserve, added_size, clone.offset)
     # Insert the cloned animal at the beginning of the group
     _insert_animal(loaded_reserve, group, clone)
+    loaded_reserve.reset_animals()
 
 def remove_animal_from_group(loaded_reserve: LoadedReserve, group: AdfValue, species_key: str, gender: str) -> bool:
     # Select the first eligible animal in the group to remove
@@ -452,6 +665,143 @@ def remove_animal_from_group(loaded_reserve: LoadedReserve, group: AdfValue, spe
       _update_instance_offsets(loaded_reserve, removed_size, animal_to_remove.offset)
       # Delete the animal at the beginning of the group
       _remove_animal(loaded_reserve, group, animal_to_remove)
+      loaded_reserve.reset_animals()
       return True
     # Return False if we did not find an eligible animal to remove
     return False
+
+@dataclass
+class PopulationAnimal:
+    '''
+    One animal of a population file written by `write_population_adf`.
+    Weight, score and map position are stored as 32-bit floats, so compare values already rounded with `np.float32`.
+    '''
+    gender: int  # thresholds.MALE or thresholds.FEMALE
+    weight: float
+    score: float
+    great_one: bool = False
+    visual_seed: int = 0
+    id: int = 0
+    scripted: bool = False
+    map_position: tuple[float, float] = (0.0, 0.0)
+
+# populations > groups > animals, in reserve species order
+PopulationModel = list[list[list[PopulationAnimal]]]
+
+_POPULATION_NAMES = [
+    b"instance", b"Root", b"Populations", b"Population", b"Groups", b"Group", b"Animals", b"Animal",
+    b"Gender", b"Weight", b"Score", b"IsGreatOne", b"IsScripted", b"VisualVariationSeed", b"Id", b"MapPosition", b"X", b"Y",
+    b"Vec2", b"A_Population", b"A_Group", b"A_Animal",
+]
+_NAME_INDEX = {name: i for i, name in enumerate(_POPULATION_NAMES)}
+_ANIMAL = struct.Struct("<BxxxffBBxxIIff")
+_ARRAY = struct.Struct("<III")  # offset, flags, count
+_HEADER = struct.Struct("<4sIIIIIIIIII")
+_INSTANCE = struct.Struct("<IIIIQ")
+
+def _member_def(name: bytes, type_hash: int, size: int, offset: int) -> bytes:
+    # name, type, size, offset, default type, default value
+    return struct.pack("<QIIIIQ", _NAME_INDEX[name], type_hash, size, offset, 0, 0)
+
+def _struct_def(name: bytes, size: int, alignment: int, members: list[bytes]) -> bytes:
+    # metatype, size, alignment, type hash, name, flags, element type, element length, member count
+    return struct.pack("<IIIIQIIII", 1, size, alignment, hash32_func(name), _NAME_INDEX[name], 0, 0, 0, len(members)) + b"".join(members)
+
+def _array_def(name: bytes, element: bytes) -> bytes:
+    return struct.pack("<IIIIQIIII", 3, 16, 8, hash32_func(name), _NAME_INDEX[name], 0, hash32_func(element), 0, 0)
+
+def _population_typedefs() -> list[bytes]:
+    return [
+        _struct_def(b"Vec2", 8, 4, [_member_def(b"X", typedef_f32, 4, 0), _member_def(b"Y", typedef_f32, 4, 4)]),
+        _struct_def(b"Animal", _ANIMAL.size, 4, [
+            _member_def(b"Gender", typedef_u8, 1, 0),
+            _member_def(b"Weight", typedef_f32, 4, 4),
+            _member_def(b"Score", typedef_f32, 4, 8),
+            _member_def(b"IsGreatOne", typedef_u8, 1, 12),
+            _member_def(b"IsScripted", typedef_u8, 1, 13),
+            _member_def(b"VisualVariationSeed", typedef_u32, 4, 16),
+            _member_def(b"Id", typedef_u32, 4, 20),
+            _member_def(b"MapPosition", hash32_func(b"Vec2"), 8, 24),
+        ]),
+        _array_def(b"A_Animal", b"Animal"),
+        _struct_def(b"Group", 16, 8, [_member_def(b"Animals", hash32_func(b"A_Animal"), 16, 0)]),
+        _array_def(b"A_Group", b"Group"),
+        _struct_def(b"Population", 16, 8, [_member_def(b"Groups", hash32_func(b"A_Group"), 16, 0)]),
+        _array_def(b"A_Population", b"Population"),
+        _struct_def(b"Root", 16, 8, [_member_def(b"Populations", hash32_func(b"A_Population"), 16, 0)]),
+    ]
+
+def _population_instance(model: PopulationModel) -> bytearray:
+    # each array's elements are followed by their children, array offsets are relative to the instance
+    data = bytearray(16)
+    populations_offset = len(data)
+    data += bytearray(16 * len(model))
+    _ARRAY.pack_into(data, 0, populations_offset, 1, len(model))
+    for p, groups in enumerate(model):
+        groups_offset = len(data)
+        data += bytearray(16 * len(groups))
+        _ARRAY.pack_into(data, populations_offset + 16 * p, groups_offset if groups else 0, 1, len(groups))
+        for g, animals in enumerate(groups):
+            _ARRAY.pack_into(data, groups_offset + 16 * g, len(data) if animals else 0, 1, len(animals))
+            for animal in animals:
+                data += _ANIMAL.pack(
+                    animal.gender, animal.weight, animal.score, int(animal.great_one), int(animal.scripted),
+                    animal.visual_seed, animal.id, *animal.map_position,
+                )
+    return data
+
+def _aligned(offset: int) -> int:
+    return (offset + 15) // 16 * 16
+
+def write_population_adf(model: PopulationModel) -> bytearray:
+    '''
+    Serialize `model` into an uncompressed ADF with the layout `deca.ff_adf.Adf.deserialize` reads:
+    header, comment, instance data, instance table, typedefs and name table.
+    '''
+    instance = _population_instance(model)
+    typedefs = _population_typedefs()
+    typedef_bytes = b"".join(typedefs)
+    name_table = bytes(len(name) for name in _POPULATION_NAMES) + b"".join(name + b"\0" for name in _POPULATION_NAMES)
+    data_offset = _aligned(0x40 + 1)  # header and an empty comment
+    instance_offset = _aligned(data_offset + len(instance))
+    typedef_offset = instance_offset + _INSTANCE.size
+    nametable_offset = typedef_offset + len(typedef_bytes)
+    out = bytearray(nametable_offset + len(name_table))
+    _HEADER.pack_into(out, 0, b" FDA", 4, 1, instance_offset, len(typedefs), typedef_offset, 0, 0, len(_POPULATION_NAMES), nametable_offset, len(out))
+    _INSTANCE.pack_into(out, instance_offset, hash32_func(b"instance"), hash32_func(b"Root"), data_offset, len(instance), _NAME_INDEX[b"instance"])
+    out[data_offset:data_offset + len(instance)] = instance
+    out[typedef_offset:nametable_offset] = typedef_bytes
+    out[nametable_offset:] = name_table
+    return out
+
+def write_population_file(model: PopulationModel, filename: Path) -> None:
+    '''Write `model` as a compressed population file that `load_adf` reads like one saved by the game'''
+    decompressed = bytes(5) + write_population_adf(model)
+    file_header = bytearray(32)
+    struct.pack_into("I", file_header, 8, len(decompressed))
+    struct.pack_into("I", file_header, 24, len(decompressed))
+    _save_file(filename, file_header + _compress_bytes(decompressed))
+
+def read_population_model(reserve_adf: Adf) -> PopulationModel:
+    '''The animals of a parsed population file, `read_population_model(parse(write_population_file(model))) == model`'''
+    model = []
+    for population in reserve_adf.table_instance_full_values[0].value["Populations"].value:
+        groups = []
+        for group in population.value["Groups"].value:
+            animals = []
+            for animal in group.value["Animals"].value:
+                fields = animal.value
+                map_position = fields["MapPosition"].value
+                animals.append(PopulationAnimal(
+                    int(fields["Gender"].value),
+                    float(fields["Weight"].value),
+                    float(fields["Score"].value),
+                    bool(fields["IsGreatOne"].value) if "IsGreatOne" in fields else False,
+                    int(fields["VisualVariationSeed"].value),
+                    int(fields["Id"].value),
+                    bool(fields["IsScripted"].value) if "IsScripted" in fields else False,
+                    (float(map_position["X"].value), float(map_position["Y"].value)),
+                ))
+            groups.append(animals)
+        model.append(groups)
+    return model
@@ -0,0 +1,167 @@
+"""
+Apply a recipe of modifications to many reserves without the GUI.
+
+A recipe is a JSON (or YAML, when PyYAML is installed) file with a list of steps:
+
+  {
+    "modded": false,
+    "seed": 42,
+    "steps": [
+      {"reserve": "hirsch", "species": "red_deer", "strategy": "diamond-some", "modifier": 10, "percentage": true},
+      {"reserve": ["hirsch", "layton"], "species": "roe_deer", "strategy": "great-one-some", "modifier": 5},
+      {"reserve": "layton", "species": "moose", "strategy": "add", "modifier": 20, "gender": "female"},
+      {"reserve": "layton", "species": "moose", "strategy": "furs", "modifier": 10, "furs": {"male": ["albino"], "female": ["piebald"]}}
+    ]
+  }
+
+`strategy` is a `config.Strategy` value or "furs". `modifier` is the number (or percentage) of animals to change,
+  "furs" changes that many of each gender it has furs for, at most all of them.
+  `rares`/`party` are passed on to `populations.mod`, and `gender` picks the animals "add" and "remove" work on.
+Every reserve is loaded, modified and saved to the mods folder by one worker process, its steps run in one edit session.
+With a `seed` every reserve draws from its own seeded generator, so running the recipe again picks the same animals and values.
+
+  python -m apc batch recipe.json [--workers 4] [--modded] [--seed 42]
+"""
+
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from apc import adf, config, populations
+from apc.config import Strategy
+
+FURS = "furs"
+STRATEGIES = [strategy.value for strategy in Strategy] + [FURS]
+
+class RecipeError(Exception):
+  pass
+
+def _read_recipe(filename: Path) -> dict:
+  text = filename.read_text(encoding="utf-8")
+  if filename.suffix.lower() in (".yaml", ".yml"):
+    try:
+      import yaml
+    except ImportError:
+      raise RecipeError(f"{filename}: PyYAML is needed for YAML recipes (pip install pyyaml)")
+    return yaml.safe_load(text)
+  return json.loads(text)
+
+def _check_step(i: int, step: dict) -> list[str]:
+  '''The reserve keys of a valid step, raises `RecipeError` otherwise'''
+  for field in ("reserve", "species", "strategy"):
+    if field not in step:
+      raise RecipeError(f"step {i}: missing {field}")
+  reserve_keys = step["reserve"] if isinstance(step["reserve"], list) else [step["reserve"]]
+  for reserve_key in reserve_keys:
+    if reserve_key not in config.RESERVES:
+      raise RecipeError(f"step {i}: unknown reserve {reserve_key}")
+    if not config.valid_species_for_reserve(step["species"], reserve_key):
+      raise RecipeError(f"step {i}: {step['species']} does not live on {reserve_key}")
+  if step["strategy"] not in STRATEGIES:
+    raise RecipeError(f"step {i}: unknown strategy {step['strategy']}, expected one of {', '.join(STRATEGIES)}")
+  if step["strategy"] not in (Strategy.great_one_all, Strategy.great_one_furs, Strategy.diamond_all, Strategy.diamond_furs) and "modifier" not in step:
+    raise RecipeError(f"step {i}: {step['strategy']} needs a modifier")
+  if step["strategy"] in (Strategy.add, Strategy.remove) and step.get("gender") not in ("male", "female"):
+    raise RecipeError(f"step {i}: {step['strategy']} needs a gender of male or female")
+  if step["strategy"] == FURS and not step.get("furs"):
+    raise RecipeError(f"step {i}: furs needs the fur keys for each gender")
+  return reserve_keys
+
+def load_recipe(filename: Path) -> tuple[dict[str, list[dict]], bool, int | None]:
+  '''The recipe's steps grouped by reserve in recipe order, whether to start from the modded files and its seed'''
+  recipe = _read_recipe(filename)
+  steps = recipe.get("steps") if isinstance(recipe, dict) else recipe
+  if not steps:
+    raise RecipeError(f"{filename}: no steps")
+  reserves = {}
+  for i, step in enumerate(steps, 1):
+    for reserve_key in _check_step(i, step):
+      reserves.setdefault(reserve_key, []).append(step)
+  if not isinstance(recipe, dict):
+    return reserves, False, None
+  seed = recipe.get("seed")
+  if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+    raise RecipeError(f"{filename}: seed must be a non-negative integer")
+  return reserves, bool(recipe.get("modded", False)), seed
+
+def _apply(loaded_reserve: adf.LoadedReserve, step: dict, rng: np.random.Generator) -> None:
+  species_key = step["species"]
+  strategy = step["strategy"]
+  modifier = step.get("modifier")
+  if strategy == FURS:
+    furs = step["furs"]
+    male_furs = furs.get("male", [])
+    female_furs = furs.get("female", [])
+    percentage = step.get("percentage", False)
+    male_cnt = populations.fur_count(loaded_reserve, species_key, "male", modifier, percentage) if male_furs else 0
+    female_cnt = populations.fur_count(loaded_reserve, species_key, "female", modifier, percentage) if female_furs else 0
+    populations.mod_furs(loaded_reserve, species_key, male_furs, female_furs, male_cnt, female_cnt, rng=rng)
+  elif strategy in (Strategy.add, Strategy.remove):
+    populations.mod_animal_cnt(loaded_reserve, species_key, modifier if strategy == Strategy.add else -modifier, step["gender"], rng=rng)
+  else:
+    populations.mod(loaded_reserve, species_key, strategy, modifier, step.get("percentage", False), step.get("rares", False), step.get("party", False), rng=rng)
+
+def run_reserve(reserve_key: str, steps: list[dict], modded: bool = False, seed: int = None) -> dict:
+  '''Load one reserve, apply its steps and save it once. Runs in a worker process, failures are returned rather than raised'''
+  start = time.perf_counter()
+  result = {"reserve": reserve_key, "steps": len(steps), "file": None, "error": None}
+  # the reserve key picks the reserve's stream of the seed, whichever worker runs it
+  rng = np.random.default_rng(None if seed is None else [seed, zlib.crc32(reserve_key.encode("utf-8"))])
+  try:
+    loaded_reserve = adf.LoadedReserve(reserve_key, modded, parse=True)
+    loaded_reserve.begin()
+    for step in steps:
+      _apply(loaded_reserve, step, rng)
+    # a failed step leaves the session open so nothing is saved
+    if loaded_reserve.commit():
+      result["file"] = str(config.MOD_DIR_PATH / loaded_reserve.popfilename)
+  except adf.FileNotFound as ex:
+    logger.error(f"{reserve_key}: {ex}")
+    result["error"] = str(ex)
+  except Exception as ex:
+    logger.error(f"{reserve_key} failed: {ex}", exc_info=True)
+    result["error"] = str(ex)
+  result["seconds"] = time.perf_counter() - start
+  return result
+
+def run(reserves: dict[str, list[dict]], modded: bool = False, workers: int = None, seed: int = None) -> list[dict]:
+  '''Run every reserve's steps, one reserve per worker process. With one worker they run in this process'''
+  workers = min(workers or os.cpu_count() or 1, len(reserves))
+  if workers <= 1:
+    return [run_reserve(reserve_key, steps, modded, seed) for reserve_key, steps in reserves.items()]
+  results = []
+  with ProcessPoolExecutor(max_workers=workers) as pool:
+    futures = [pool.submit(run_reserve, reserve_key, steps, modded, seed) for reserve_key, steps in reserves.items()]
+    for future in as_completed(futures):
+      results.append(future.result())
+  order = list(reserves)
+  return sorted(results, key=lambda result: order.index(result["reserve"]))
+
+def print_summary(results: list[dict], elapsed: float) -> None:
+  print(f"{'reserve':20} {'steps':>5} {'seconds':>8}  result")
+  for result in results:
+    outcome = f"failed: {result['error']}" if result["error"] else result["file"] or "nothing changed"
+    print(f"{result['reserve']:20} {result['steps']:5} {result['seconds']:8.2f}  {outcome}")
+  busy = sum(result["seconds"] for result in results)
+  failed = sum(1 for result in results if result["error"])
+  print(f"{len(results)} reserves, {failed} failed, {elapsed:.2f}s wall, {busy:.2f}s in workers")
+
+def main(recipe: Path, workers: int = None, modded: bool = False, seed: int = None) -> int:
+  try:
+    reserves, recipe_modded, recipe_seed = load_recipe(recipe)
+  except (OSError, ValueError, RecipeError) as ex:
+    print(ex)
+    return 2
+  start = time.perf_counter()
+  results = run(reserves, modded=modded or recipe_modded, workers=workers, seed=recipe_seed if seed is None else seed)
+  print_summary(results, time.perf_counter() - start)
+  return 1 if any(result["error"] for result in results) else 0
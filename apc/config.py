@@ -2,15 +2,19 @@ from apc.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+import functools
 import gettext
 import json
 import locale
 import os
-import random
 import re
 import sys
+import threading
 from enum import Enum
 from pathlib import Path
+from typing import Callable
+
+import numpy as np
 
 from apc import __app_name__
 
@@ -35,7 +39,17 @@ def get_languages() -> list:
 
 LOCALE_PATH = Path(getattr(sys, '_MEIPASS', Path(__file__).resolve().parent)) / "locale/"
 _default, use_languages = get_languages()
-t = gettext.translation("apc", localedir=LOCALE_PATH, languages=use_languages)
+_translations: dict[tuple[str], gettext.NullTranslations] = {}
+
+def _translation(languages: list[str]) -> gettext.NullTranslations:
+  '''The parsed catalog for `languages`, each `.mo` file is only read once'''
+  key = tuple(languages)
+  if (t := _translations.get(key)) is None:
+    t = gettext.translation("apc", localedir=LOCALE_PATH, languages=languages)
+    _translations[key] = t
+  return t
+
+t = _translation(use_languages)
 translate = t.gettext
 
 def setup_translations() -> None:
@@ -323,16 +337,25 @@ def setup_translations() -> None:
   UPDATED_MULTIPLE_RESERVES = translate("Updated animals on multiple reserves. Use")
   global UPDATED_MULTIPLE_RESERVES_2
   UPDATED_MULTIPLE_RESERVES_2 = translate("to load the modded files for each reserve:")
+  global CANCELLED
+  CANCELLED = translate("Cancelled")
+  global STILL_WORKING
+  STILL_WORKING = translate("Still working, wait for it to finish or cancel it")
+  global ALL
+  ALL = translate("All")
 
 setup_translations()
 
 def update_language(locale: str) -> None:
   global use_languages
   use_languages = [locale]
-  t = gettext.translation("apc", localedir=LOCALE_PATH, languages=use_languages)
+  t = _translation(use_languages)
   global translate
   translate = t.gettext
   setup_translations()
+  _clear_config_index()
+  # the GUI redraws the window right away, build the name tables next to it
+  threading.Thread(target=_name_tables, name="apc-translations", daemon=True).start()
 
 def _find_saves_path() -> Path:
     home_dir = Path.home()
@@ -373,24 +396,65 @@ def load_json(file: Path) -> dict:
   return data
 
 APP_DIR_PATH = Path(getattr(sys, '_MEIPASS', Path(__file__).resolve().parent))
+# directories are created on first write with `ensure_dir`, not at import
 EXPORTS_PATH = APP_DIR_PATH / "exports"
-EXPORTS_PATH.mkdir(exist_ok=True, parents=True)
-DEFAULT_SAVE_PATH = _find_saves_path()
 CONFIG_PATH = APP_DIR_PATH / "config"
 SAVE_PATH = CONFIG_PATH / "save_path.txt"
-SAVE_PATH.parent.mkdir(exist_ok=True, parents=True)
 MOD_DIR_PATH = Path().cwd() / "mods"
-MOD_DIR_PATH.mkdir(exist_ok=True, parents=True)
 BACKUP_DIR_PATH = Path().cwd() / "backups"
-BACKUP_DIR_PATH.mkdir(exist_ok=True, parents=True)
 HIGH_NUMBER = 100000
-
-ANIMAL_NAMES = load_json(CONFIG_PATH / "animal_names.json")
-FUR_NAMES = load_json(CONFIG_PATH / "fur_names.json")
-RESERVES = load_json(CONFIG_PATH / "reserve_details.json")
-ANIMALS = load_json(CONFIG_PATH / "animal_details.json")
 GLOBAL_ANIMAL_TYPES = CONFIG_PATH / "global_animal_types.blo"
 
+# config data loaded on first use through `__getattr__`, e.g. `config.ANIMALS`
+CONFIG_FILES = {
+  "ANIMAL_NAMES": "animal_names.json",
+  "FUR_NAMES": "fur_names.json",
+  "RESERVES": "reserve_details.json",
+  "ANIMALS": "animal_details.json",
+}
+_compiled_config = None
+
+def compiled_config():
+  '''The config data with its typed tables, see `apc.config_cache`'''
+  global _compiled_config
+  if _compiled_config is None:
+    from apc import config_cache
+    _compiled_config = config_cache.load(CONFIG_PATH, CONFIG_FILES)
+    globals().update(_compiled_config.data)
+  return _compiled_config
+
+def _config_data(name: str) -> dict:
+  if (data := globals().get(name)) is None:
+    data = compiled_config().data[name]
+  return data
+
+def _animal_names() -> dict:
+  return _config_data("ANIMAL_NAMES")
+
+def _fur_names() -> dict:
+  return _config_data("FUR_NAMES")
+
+def _reserves() -> dict:
+  return _config_data("RESERVES")
+
+def _animals() -> dict:
+  return _config_data("ANIMALS")
+
+@functools.cache
+def _default_save_path() -> Path | None:
+  return _find_saves_path()
+
+def __getattr__(name: str):
+  if name in CONFIG_FILES:
+    return _config_data(name)
+  if name == "DEFAULT_SAVE_PATH":
+    return _default_save_path()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def ensure_dir(path: Path) -> Path:
+  path.mkdir(exist_ok=True, parents=True)
+  return path
+
 # TODO: diamonds that can be both genders need different weight / score values
 
 class Reserve(str, Enum):
@@ -439,30 +503,25 @@ class Levels(int, Enum):
   LEGENDARY = 9
   GREAT_ONE = 10
 
+def _level_names(translate: Callable[[str], str]) -> list[str]:
+  '''Indexed by `Levels`, `translate` is passed in so the names match the rest of the name tables'''
+  return [
+    translate("Unknown"),
+    translate("Trivial"),
+    translate("Minor"),
+    translate("Very Easy"),
+    translate("Easy"),
+    translate("Medium"),
+    translate("Hard"),
+    translate("Very Hard"),
+    translate("Mythical"),
+    translate("Legendary"),
+    translate("Great One"),
+  ]
+
 def get_level_name(level: Levels):
-  if level == Levels.UNKNOWN:
-    return translate("Unknown")
-  if level == Levels.TRIVIAL:
-   return translate("Trivial")
-  if level == Levels.MINOR:
-    return translate("Minor")
-  if level == Levels.VERY_EASY:
-    return translate("Very Easy")
-  if level == Levels.EASY:
-    return translate("Easy")
-  if level == Levels.MEDIUM:
-    return translate("Medium")
-  if level == Levels.HARD:
-    return translate("Hard")
-  if level == Levels.VERY_HARD:
-    return translate("Very Hard")
-  if level == Levels.MYTHICAL:
-    return translate("Mythical")
-  if level == Levels.LEGENDARY:
-    return translate("Legendary")
-  if level == Levels.GREAT_ONE:
-    return translate("Great One")
-  return None
+  level_names = _name_tables()["levels"]
+  return level_names[level] if 0 <= level < len(level_names) else None
 
 def get_difficulty(difficulty: str):
   match difficulty:
@@ -501,9 +560,10 @@ def get_save_path() -> Path:
       return loaded_save_path
     else:
       logger.warning("Unable to load from save path %s", loaded_save_path)
-  return DEFAULT_SAVE_PATH
+  return _default_save_path()
 
 def write_save_path(save_path_location: str) -> None:
+  ensure_dir(SAVE_PATH.parent)
   SAVE_PATH.write_text(save_path_location)
 
 def get_reserve_species_renames(reserve_key: str) -> dict:
@@ -511,65 +571,36 @@ def get_reserve_species_renames(reserve_key: str) -> dict:
   return reserve["renames"] if "renames" in reserve else {}
 
 def get_species_name(species_key: str, star: bool = False) -> str:
-  is_unique = species_unique_to_reserve(species_key)
-  return F"{translate(ANIMAL_NAMES[species_key]['animal_name'])}{' ⭐' if is_unique and star else ''}"
+  species_name = _name_tables()["species"][species_key]
+  return f"{species_name} ⭐" if star and species_unique_to_reserve(species_key) else species_name
 
 def get_fur_name(key: str) -> str:
-  if fur := FUR_NAMES.get(key):
-    return translate(fur["fur_name"])
-  else:
+  if (fur_name := _name_tables()["furs"].get(key)) is None:
     logger.error(f"Unable to translate fur: {key}")
-    return fur
+  return fur_name
 
 def get_furs(species_key: str, gender: str, great_one: bool = None) -> list[str]:
-  if (species_config := get_species(species_key)) is None:
+  if (profile := get_species_profile(species_key)) is None:
     return []
   gender_key = f"great_one_{gender}" if great_one else gender
-  gender_furs = sorted([fur for fur, probability in species_config["gender"][gender_key]["furs"].items() if probability > 0])  # exclude quest-only furs with 0 probability
-  return gender_furs
+  return list(profile.furs[gender_key])
 
 def get_rare_furs(species_key: str, gender: str) -> list[str]:
-  if (species_config := get_species(species_key)) is None:
+  if (profile := get_species_profile(species_key)) is None:
     return []
-  fur_total_probability = species_config["gender"][gender]["fur_total_probability"]
-  gender_furs = species_config["gender"][gender]["furs"]
-  '''
-  "Rarity" values in `global_animal_types.blo` are inconsistent.
-  Not worth adding/maintaining "rarity" values for each fur and muddying up the JSON.
-  "Uncommon" is a difficult distinction. Should those be included as "rare" if they are fairly low percentage (eg <10%)?
-  - Ring-Necked Pheasant: Mottling/Grey @ 12.5% are "common"
-  - Himalayan Tahrs: Light Brown/Straw @ 12.5% are "uncommon"
-  - Feral Goats: Black-Brown/Black-White/White-Brown @ 8.33% are "uncommon"
-  - Water Buffalo Black @ 2-3% are "uncommon"
-  All true "Rare" and "Very Rare" furs are below 1%
-  '''
-  rare_furs = [
-    fur for fur, probability in gender_furs.items()
-    if (
-      probability > 0  # exclude quest-only furs with 0 probability
-      and (probability/fur_total_probability) < 0.01  # This is 1%, not 0.01%
-    )
-  ]
-  logger.debug(f"{species_key} :: {gender} >> {rare_furs}")
-  return rare_furs
+  return list(profile.rare_furs[gender])
 
 def species(reserve_key: str, include_keys = False) -> list:
-  species_keys = RESERVES[reserve_key]["species"]
+  species_keys = _reserves()[reserve_key]["species"]
   return [f"{get_species_name(s)}{' (' + s + ')' if include_keys else ''}" for s in species_keys]
 
 def get_species_key(species_name: str) -> str:
-  for animal_name_key, names in ANIMAL_NAMES.items():
-    if names["animal_name"] == species_name:
-      return animal_name_key
-  return None
+  return _config_index()["species_keys"].get(species_name)
 
 def get_species_furs(species_key: str, gender: str, great_one: bool = None) -> list[str]:
-  if gender == "both":
-    males = get_furs(species_key, "male", great_one=great_one)
-    females = get_furs(species_key, "female", great_one=great_one)
-    return males + females
-  else:
-    return get_furs(species_key, gender, great_one=great_one)
+  if (profile := get_species_profile(species_key)) is None:
+    return []
+  return list(profile.species_furs(gender, great_one))
 
 def get_species_fur_names(species_key: str, gender: str, great_one: bool = None) -> dict[str, list[str]]:
   species_furs = get_species_furs(species_key, gender, great_one)
@@ -581,54 +612,117 @@ def get_reserve_species_name(species_key: str, reserve_key: str) -> str:
   return get_species_name(species_key, star=True)
 
 def get_reserve_name(key: str) -> str:
-  return translate(RESERVES[key]["reserve_name"])
+  return _name_tables()["reserves"][key]
 
 def reserve_keys() -> list[str]:
-  return list(dict.keys(RESERVES))
+  return list(dict.keys(_reserves()))
 
 def reserve_names(include_keys = False) -> list[str]:
-  keys = list(dict.keys(RESERVES))
-  return [f"{get_reserve_name(r)}{' (' + r + ')' if include_keys else ''}" for r in keys]
+  if include_keys:
+    return [f"{get_reserve_name(r)} ({r})" for r in reserve_keys()]
+  return list(_config_index()["reserve_names"])
 
 def reserves() -> list[dict]:
   return [{"key": key, "name": name} for key, name in zip(reserve_keys(), reserve_names())]
 
 def get_reserve_key_from_name(name: str) -> str:
-  return reserve_keys()[reserve_names().index(name)]
+  if (reserve_key := _config_index()["reserve_keys"].get(name)) is None:
+    raise ValueError(f"{name} is not a reserve name")
+  return reserve_key
 
 def get_reserve(reserve_key: str) -> dict:
-  return RESERVES[reserve_key]
+  return _reserves()[reserve_key]
 
 def get_reserve_species(reserve_key: str) -> list:
   return get_reserve(reserve_key)["species"]
 
 def get_species(species_key: str) -> dict:
-  return ANIMALS.get(species_key, None)
+  return _animals().get(species_key, None)
 
-def get_diamond_gender(species_key: str) -> str:
-    if (species_config := get_species(species_key)) is None:
-      return None
-    diamond_min = species_config["trophy"]["diamond"]["score_low"]
-    male_score = species_config["gender"]["male"]["score_high"]
-    female_score = species_config["gender"]["female"]["score_high"]
+class SpeciesProfile:
+  '''
+  Values derived from one species config: Diamond and Great One genders and the fur lists.
+  Built once per species by `get_species_profile`, the module functions return copies of the lists.
+  '''
+  def __init__(self, species_key: str, species_config: dict) -> None:
+    self.species_key = species_key
+    self.config = species_config
+    genders = species_config["gender"]
+    # exclude quest-only furs with 0 probability
+    self.furs = {
+      gender_key: tuple(sorted(fur for fur, probability in gender_config["furs"].items() if probability > 0))
+      for gender_key, gender_config in genders.items()
+    }
+    self.rare_furs = {gender_key: self._rare_furs(gender_config) for gender_key, gender_config in genders.items()}
+    self.diamond_gender = self._diamond_gender()
+    great_one_keys = {k.removeprefix("great_one_") for k in genders if k.startswith("great_one_")}
+    self.great_one_gender = ("both" if len(great_one_keys) == 2 else next(iter(great_one_keys))) if great_one_keys else None
+    self._species_furs = {}
+
+  def _rare_furs(self, gender_config: dict) -> tuple[str]:
+    fur_total_probability = gender_config["fur_total_probability"]
+    '''
+    "Rarity" values in `global_animal_types.blo` are inconsistent.
+    Not worth adding/maintaining "rarity" values for each fur and muddying up the JSON.
+    "Uncommon" is a difficult distinction. Should those be included as "rare" if they are fairly low percentage (eg <10%)?
+    - Ring-Necked Pheasant: Mottling/Grey @ 12.5% are "common"
+    - Himalayan Tahrs: Light Brown/Straw @ 12.5% are "uncommon"
+    - Feral Goats: Black-Brown/Black-White/White-Brown @ 8.33% are "uncommon"
+    - Water Buffalo Black @ 2-3% are "uncommon"
+    All true "Rare" and "Very Rare" furs are below 1%
+    '''
+    rare_furs = tuple(
+      fur for fur, probability in gender_config["furs"].items()
+      if (
+        probability > 0  # exclude quest-only furs with 0 probability
+        and (probability/fur_total_probability) < 0.01  # This is 1%, not 0.01%
+      )
+    )
+    return rare_furs
+
+  def _diamond_gender(self) -> str:
+    diamond_min = self.config["trophy"]["diamond"]["score_low"]
+    male_score = self.config["gender"]["male"]["score_high"]
+    female_score = self.config["gender"]["female"]["score_high"]
 
     if male_score >= diamond_min and female_score >= diamond_min:
-        return "both"
+      return "both"
     if male_score >= diamond_min:
       return "male"
     if female_score >= diamond_min:
       return "female"
-    logger.error(f"No valid Diamond genders for {species_key}")
+    logger.error(f"No valid Diamond genders for {self.species_key}")
     return None
 
-def get_great_one_gender(species_key: str) -> str | None:
-  if (species_config := get_species(species_key)) is None:
+  def species_furs(self, gender: str, great_one: bool = None) -> tuple[str]:
+    '''Furs for `gender`, males then females for "both"'''
+    key = (gender, bool(great_one))
+    if (furs := self._species_furs.get(key)) is None:
+      prefix = "great_one_" if great_one else ""
+      genders = ["male", "female"] if gender == "both" else [gender]
+      furs = tuple(fur for g in genders for fur in self.furs[f"{prefix}{g}"])
+      self._species_furs[key] = furs
+    return furs
+
+_species_profiles: dict[str, SpeciesProfile] = {}
+
+def get_species_profile(species_key: str) -> SpeciesProfile | None:
+  if (profile := _species_profiles.get(species_key)) is None:
+    if (species_config := get_species(species_key)) is None:
+      return None
+    profile = SpeciesProfile(species_key, species_config)
+    _species_profiles[species_key] = profile
+  return profile
+
+def get_diamond_gender(species_key: str) -> str:
+  if (profile := get_species_profile(species_key)) is None:
     return None
-  keys = species_config["gender"].keys()
-  great_one_keys = {k.removeprefix("great_one_") for k in keys if k.startswith("great_one_")}
-  if not great_one_keys:
+  return profile.diamond_gender
+
+def get_great_one_gender(species_key: str) -> str | None:
+  if (profile := get_species_profile(species_key)) is None:
     return None
-  return "both" if len(great_one_keys) == 2 else next(iter(great_one_keys))
+  return profile.great_one_gender
 
 def get_great_one_species(reserve_key: str) -> list[str]:
   great_one_species = []
@@ -653,7 +747,35 @@ def get_safe_diamond_values(species_config: dict) -> dict[str, float]:
     low_score = min(low_score, high_score) + (0.2 * abs(high_score - low_score))
   return {"weight_low": low_weight, "score_low": low_score, "weight_high": high_weight, "score_high": high_score}
 
-def generate_weight_and_score(gender_data, percentile: float = None, fuzz: bool = True) -> tuple[float, float]:
+_rng = np.random.default_rng()
+
+def random_generator(rng: np.random.Generator = None) -> np.random.Generator:
+  '''`rng`, or the unseeded module generator when a run was not given one'''
+  return _rng if rng is None else rng
+
+def generate_weights_and_scores(gender_data: dict, n: int, percentiles: np.ndarray = None, fuzz: bool = True, rng: np.random.Generator = None) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Batched `generate_weight_and_score` returning arrays of `n` weights and scores
+    Missing (or 0) percentiles are drawn at random; pass a seeded `rng` for reproducible results
+    '''
+    rng = random_generator(rng)
+    weight_low = gender_data.get("weight_low")
+    weight_high = gender_data.get("weight_high")
+    score_low = gender_data.get("score_low")
+    score_high = gender_data.get("score_high")
+    random_percentiles = rng.uniform(0.01, 1, n)
+    if percentiles is not None:
+      percentiles = np.asarray(percentiles, dtype=np.float64)
+      random_percentiles = np.where(percentiles == 0, random_percentiles, percentiles)
+    weight_variation = rng.uniform(-0.01, 0.01, n) * (weight_high - weight_low) if fuzz else 0
+    weights = weight_low + random_percentiles * (weight_high - weight_low) + weight_variation
+    weights = np.clip(weights, weight_low, weight_high)
+    score_variation = rng.uniform(-0.01, 0.01, n) * (score_high - score_low) if fuzz else 0
+    scores = score_low + random_percentiles * (score_high - score_low) + score_variation
+    scores = np.clip(scores, score_low, score_high)
+    return weights, scores
+
+def generate_weight_and_score(gender_data, percentile: float = None, fuzz: bool = True, rng: np.random.Generator = None) -> tuple[float, float]:
     '''
     Animals spawned by the game tend to have weight and score values in roughly the same percentile
     There is some variation of approximately to ±1% of the given range for randomness
@@ -663,25 +785,15 @@ def generate_weight_and_score(gender_data, percentile: float = None, fuzz: bool
     - That deer should have a score of roughly 173.35 (50th percentile, halfway between min/max scores)
     - 1% of the score range is ~2.04 points, so our 79.5kg male Whitetail Deer should have a score between 171.31-175.39
     '''
-    weight_low = gender_data.get("weight_low")
-    weight_high = gender_data.get("weight_high")
-    score_low = gender_data.get("score_low")
-    score_high = gender_data.get("score_high")
-    if not percentile:
-      percentile = random.uniform(0.01,1)
-    weight_variation = random.uniform(-0.01, 0.01) * (weight_high - weight_low) if fuzz else 0
-    weight = weight_low + percentile * (weight_high - weight_low) + weight_variation
-    weight = max(weight_low, min(weight_high, weight))
-    score_variation = random.uniform(-0.01, 0.01) * (score_high - score_low) if fuzz else 0
-    score = score_low + percentile * (score_high - score_low) + score_variation
-    score = max(score_low, min(score_high, score))
-    return weight, score
+    percentiles = [percentile] if percentile else None
+    weights, scores = generate_weights_and_scores(gender_data, 1, percentiles=percentiles, fuzz=fuzz, rng=rng)
+    return float(weights[0]), float(scores[0])
 
 def valid_species_for_reserve(species_key: str, reserve: str) -> bool:
-  return reserve in RESERVES and species_key in RESERVES[reserve]["species"]
+  return reserve in _reserves() and species_key in _reserves()[reserve]["species"]
 
 def valid_species(species_key: str) -> bool:
-  return species_key in list(ANIMALS.keys())
+  return species_key in _animals()
 
 def valid_great_one_species(species_key: str) -> bool:
     return get_great_one_gender(species_key) is not None
@@ -690,26 +802,78 @@ def valid_fur_species(species_key: str) -> bool:
   return True
 
 def get_population_file_name(reserve_key: str):
-    index = RESERVES[reserve_key]["index"]
+    index = _reserves()[reserve_key]["index"]
     return f"animal_population_{index}"
 
 def get_population_reserve_key(filename: str):
-  for _reserve, details in RESERVES.items():
-    reserve_filename = f"animal_population_{details['index']}"
-    if reserve_filename == filename:
-      return _reserve
-  return None
+  return _config_index()["population_reserve_keys"].get(filename)
 
 def get_population_name(filename: str):
-  for _reserve, details in RESERVES.items():
-    reserve_filename = f"animal_population_{details['index']}"
-    if reserve_filename == filename:
-      return translate(details["reserve_name"])
-  return None
+  if (reserve_key := get_population_reserve_key(filename)) is None:
+    return None
+  return get_reserve_name(reserve_key)
 
 def species_unique_to_reserve(species_key: str) -> bool:
-  cnt = 0
-  for _reserve_key, reserve_details in RESERVES.items():
-    if species_key in reserve_details["species"]:
-      cnt += 1
-  return (cnt == 1)
+  return _config_index()["species_reserve_counts"].get(species_key, 0) == 1
+
+_index: dict[str, dict] = None
+
+def _build_config_index() -> dict[str, dict]:
+  '''Reverse lookups for the name and key functions above, the first key wins where names repeat'''
+  species_keys = {}
+  for species_key, animal_names in _animal_names().items():
+    species_keys.setdefault(animal_names["animal_name"], species_key)
+  reserve_names = [get_reserve_name(reserve_key) for reserve_key in reserve_keys()]
+  reserve_keys_by_name = {}
+  for reserve_key, name in zip(reserve_keys(), reserve_names):
+    reserve_keys_by_name.setdefault(name, reserve_key)
+  population_reserve_keys = {}
+  species_reserve_counts = {}
+  for reserve_key, details in _reserves().items():
+    population_reserve_keys.setdefault(f"animal_population_{details['index']}", reserve_key)
+    for species_key in details["species"]:
+      species_reserve_counts[species_key] = species_reserve_counts.get(species_key, 0) + 1
+  return {
+    "species_keys": species_keys,
+    "reserve_names": reserve_names,
+    "reserve_keys": reserve_keys_by_name,
+    "population_reserve_keys": population_reserve_keys,
+    "species_reserve_counts": species_reserve_counts,
+  }
+
+def _config_index() -> dict[str, dict]:
+  global _index
+  if _index is None:
+    _index = _build_config_index()
+    logger.debug(f"Indexed {len(_index['species_keys'])} species and {len(_index['reserve_names'])} reserves")
+  return _index
+
+_names: dict[str, object] = None
+_names_lock = threading.Lock()
+
+def _name_tables() -> dict[str, object]:
+  '''
+  Species, fur, reserve and level names translated once for the current language.
+  `update_language` builds them on a background thread, lookups before it finishes wait for it.
+  '''
+  global _names
+  names = _names
+  if names is not None and names["translate"] is translate:
+    return names
+  with _names_lock:
+    if _names is None or _names["translate"] is not translate:
+      current = translate
+      _names = {
+        "translate": current,
+        "species": {species_key: current(animal_names["animal_name"]) for species_key, animal_names in _animal_names().items()},
+        "furs": {fur_key: current(fur["fur_name"]) for fur_key, fur in _fur_names().items() if fur},
+        "reserves": {reserve_key: current(details["reserve_name"]) for reserve_key, details in _reserves().items()},
+        "levels": _level_names(current),
+      }
+      logger.debug(f"Translated {len(_names['species'])} species and {len(_names['furs'])} fur names")
+    return _names
+
+def _clear_config_index() -> None:
+  '''Reserve names are translated, `update_language` rebuilds the index'''
+  global _index
+  _index = None
@@ -0,0 +1,263 @@
+"""
+Binary cache of the JSON config files.
+
+The cache keeps the config dicts pickled next to typed tables compiled from them:
+  gender and trophy weight/score bounds, level ranges, and cumulative fur probabilities,
+  with species and fur keys interned into indexes.
+The tables are read straight out of the memory-mapped file. When the cache is missing or was built from
+  different JSON files, the same tables are compiled from the JSON instead.
+
+  python -m apc.config_cache build    # run after editing the JSON config and before packaging
+  python -m apc.config_cache verify
+"""
+
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+import argparse
+import hashlib
+import json
+import mmap
+import pickle
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from apc.thresholds import TROPHY_TIERS
+
+MAGIC = b"APCC"
+CACHE_VERSION = 1
+CACHE_FILE = "config_cache.bin"
+# magic, version, source digest, pickled data size, table count
+HEADER = struct.Struct("<4sI20sII")
+# name, dtype, offset, dimensions, shape padded with zeros
+TABLE = struct.Struct("<16s4sQI3I")
+ALIGN = 16
+
+GENDERS = ["male", "female", "great_one_male", "great_one_female"]
+BOUNDS = ["weight_low", "weight_high", "score_low", "score_high"]
+
+class StaleCacheError(Exception):
+  pass
+
+class ConfigCache:
+  '''
+  Config data with typed tables per species. Bounds are `np.nan` where the species config has no value.
+  `source` is the file the tables are mapped from, None when they were compiled from the JSON.
+  '''
+  def __init__(self, data: dict, species_keys: list[str], fur_keys: list[str], tables: dict[str, np.ndarray], source: Path = None) -> None:
+    self.data = data
+    self.species_keys = species_keys
+    self.fur_keys = fur_keys
+    self.tables = tables
+    self.source = source
+    self._species_index = {species_key: i for i, species_key in enumerate(species_keys)}
+    self._fur_tables = {}
+
+  def species_index(self, species_key: str) -> int | None:
+    return self._species_index.get(species_key)
+
+  def gender_bounds(self, species_key: str, gender_key: str) -> np.ndarray | None:
+    '''weight_low, weight_high, score_low, score_high'''
+    if (i := self.species_index(species_key)) is None:
+      return None
+    return self.tables["gender_bounds"][i, GENDERS.index(gender_key)]
+
+  def trophy_bounds(self, species_key: str) -> np.ndarray | None:
+    '''One row of weight_low, weight_high, score_low, score_high for each of `TROPHY_TIERS`'''
+    if (i := self.species_index(species_key)) is None:
+      return None
+    return self.tables["trophy_bounds"][i]
+
+  def levels(self, species_key: str) -> np.ndarray | None:
+    '''low, high weight for each level'''
+    if (i := self.species_index(species_key)) is None:
+      return None
+    offsets = self.tables["level_offsets"]
+    return self.tables["levels"][offsets[i]:offsets[i + 1]]
+
+  def fur_table(self, species_key: str, gender_key: str) -> tuple[list[str], list[float]] | None:
+    '''
+    Fur keys in config order with their cumulative probability, for a `bisect` on a seed's probability.
+    Lists are kept per species and gender, they are faster than arrays for one lookup at a time.
+    '''
+    key = (species_key, gender_key)
+    if (table := self._fur_tables.get(key)) is None:
+      if (i := self.species_index(species_key)) is None or gender_key not in GENDERS:
+        return None
+      row = i * len(GENDERS) + GENDERS.index(gender_key)
+      start, end = self.tables["fur_offsets"][row:row + 2].tolist()
+      if start == end:
+        return None
+      fur_keys = [self.fur_keys[fur_id] for fur_id in self.tables["fur_ids"][start:end].tolist()]
+      table = (fur_keys, self.tables["fur_cumulative"][start:end].tolist())
+      self._fur_tables[key] = table
+    return table
+
+def _bounds(config: dict) -> list[float]:
+  return [float(config.get(bound, np.nan)) for bound in BOUNDS] if config else [np.nan] * len(BOUNDS)
+
+def compile_config(data: dict) -> ConfigCache:
+  '''Compile the tables from the config `data`, keyed like the `config` module globals'''
+  animals = data["ANIMALS"]
+  species_keys = list(animals)
+  fur_keys = sorted({fur_key for species_config in animals.values() for gender in species_config.get("gender", {}).values() for fur_key in gender.get("furs", {})})
+  fur_index = {fur_key: i for i, fur_key in enumerate(fur_keys)}
+
+  gender_bounds = np.full((len(species_keys), len(GENDERS), len(BOUNDS)), np.nan)
+  trophy_bounds = np.full((len(species_keys), len(TROPHY_TIERS), len(BOUNDS)), np.nan)
+  level_offsets = [0]
+  levels = []
+  fur_offsets = [0]
+  fur_ids = []
+  fur_cumulative = []
+  for i, species_config in enumerate(animals.values()):
+    for g, gender_key in enumerate(GENDERS):
+      gender_config = species_config.get("gender", {}).get(gender_key, {})
+      gender_bounds[i, g] = _bounds(gender_config)
+      if furs := gender_config.get("furs"):
+        # accumulated the same way as `fur_seed.get_fur_for_seed` so seeds resolve to the same fur
+        total = gender_config["fur_total_probability"]
+        cumulative = 0.0
+        for fur_key, probability in furs.items():
+          cumulative += probability / total
+          fur_ids.append(fur_index[fur_key])
+          fur_cumulative.append(cumulative)
+      fur_offsets.append(len(fur_ids))
+    for t, tier in enumerate(TROPHY_TIERS):
+      trophy_bounds[i, t] = _bounds(species_config.get("trophy", {}).get(tier))
+    levels.extend(species_config.get("level", []))
+    level_offsets.append(len(levels))
+
+  tables = {
+    "gender_bounds": gender_bounds,
+    "trophy_bounds": trophy_bounds,
+    "level_offsets": np.array(level_offsets, dtype=np.int32),
+    "levels": np.array(levels, dtype=np.float64).reshape(-1, 2),
+    "fur_offsets": np.array(fur_offsets, dtype=np.int32),
+    "fur_ids": np.array(fur_ids, dtype=np.int32),
+    "fur_cumulative": np.array(fur_cumulative, dtype=np.float64),
+  }
+  return ConfigCache(data, species_keys, fur_keys, tables)
+
+def source_digest(config_path: Path, config_files: dict[str, str]) -> bytes:
+  digest = hashlib.sha1()
+  for file in config_files.values():
+    digest.update((config_path / file).read_bytes())
+  return digest.digest()
+
+def load_json(config_path: Path, config_files: dict[str, str]) -> dict:
+  data = {}
+  for name, file in config_files.items():
+    with open(config_path / file, "r", encoding="utf-8") as f:
+      data[name] = json.load(f)
+  return data
+
+def _aligned(offset: int) -> int:
+  return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+def write(cache: ConfigCache, destination: Path, digest: bytes) -> None:
+  blob = pickle.dumps({"data": cache.data, "species_keys": cache.species_keys, "fur_keys": cache.fur_keys}, protocol=pickle.HIGHEST_PROTOCOL)
+  offset = _aligned(HEADER.size + TABLE.size * len(cache.tables) + len(blob))
+  entries = []
+  chunks = []
+  for name, table in cache.tables.items():
+    table = np.ascontiguousarray(table)
+    shape = (table.shape + (0, 0))[:3]
+    entries.append(TABLE.pack(name.encode(), table.dtype.str.encode(), offset, table.ndim, *shape))
+    chunks.append((offset, table.tobytes()))
+    offset = _aligned(offset + table.nbytes)
+
+  out = bytearray(offset)
+  HEADER.pack_into(out, 0, MAGIC, CACHE_VERSION, digest, len(blob), len(entries))
+  position = HEADER.size
+  for entry in entries:
+    out[position:position + TABLE.size] = entry
+    position += TABLE.size
+  out[position:position + len(blob)] = blob
+  for chunk_offset, chunk in chunks:
+    out[chunk_offset:chunk_offset + len(chunk)] = chunk
+  destination.write_bytes(out)
+  logger.info(f"Wrote config cache {destination} ({len(out)} bytes)")
+
+def read(filename: Path, digest: bytes) -> ConfigCache:
+  '''Map the cache file, raises `StaleCacheError` unless it was built by this version from the same JSON files'''
+  with open(filename, "rb") as f:
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  if len(buffer) < HEADER.size:
+    raise StaleCacheError(f"{filename} is truncated")
+  magic, version, cache_digest, blob_size, table_count = HEADER.unpack_from(buffer, 0)
+  if magic != MAGIC or version != CACHE_VERSION:
+    raise StaleCacheError(f"{filename} is not a version {CACHE_VERSION} config cache")
+  if cache_digest != digest:
+    raise StaleCacheError(f"{filename} was built from different config files")
+
+  tables = {}
+  position = HEADER.size
+  for _ in range(table_count):
+    name, dtype, offset, ndim, *shape = TABLE.unpack_from(buffer, position)
+    position += TABLE.size
+    shape = shape[:ndim]
+    table = np.frombuffer(buffer, dtype=np.dtype(dtype.rstrip(b"\0").decode()), count=int(np.prod(shape)), offset=offset)
+    tables[name.rstrip(b"\0").decode()] = table.reshape(shape)
+  blob = pickle.loads(buffer[position:position + blob_size])
+  return ConfigCache(blob["data"], blob["species_keys"], blob["fur_keys"], tables, filename)
+
+def load(config_path: Path, config_files: dict[str, str]) -> ConfigCache:
+  '''The cache in `config_path`, or the tables compiled from the JSON files when it is missing or stale'''
+  filename = config_path / CACHE_FILE
+  digest = source_digest(config_path, config_files)
+  try:
+    cache = read(filename, digest)
+    logger.debug(f"Loaded config cache {filename}")
+    return cache
+  except FileNotFoundError:
+    logger.debug("No config cache, loading JSON config")
+  except (StaleCacheError, ValueError, struct.error, pickle.UnpicklingError) as ex:
+    logger.info(f"Ignoring config cache: {ex}")
+  return compile_config(load_json(config_path, config_files))
+
+def build(config_path: Path, config_files: dict[str, str]) -> Path:
+  filename = config_path / CACHE_FILE
+  cache = compile_config(load_json(config_path, config_files))
+  write(cache, filename, source_digest(config_path, config_files))
+  return filename
+
+def verify(config_path: Path, config_files: dict[str, str]) -> list[str]:
+  '''Compare the cache file with the JSON files it was built from, returns the differences'''
+  expected = compile_config(load_json(config_path, config_files))
+  try:
+    cache = read(config_path / CACHE_FILE, source_digest(config_path, config_files))
+  except (FileNotFoundError, StaleCacheError) as ex:
+    return [str(ex)]
+  problems = []
+  if cache.data != expected.data:
+    problems.append("config data differs")
+  if cache.species_keys != expected.species_keys:
+    problems.append("species keys differ")
+  if cache.fur_keys != expected.fur_keys:
+    problems.append("fur keys differ")
+  for name, table in expected.tables.items():
+    if name not in cache.tables:
+      problems.append(f"{name} is missing")
+    elif not np.array_equal(cache.tables[name], table, equal_nan=True):
+      problems.append(f"{name} differs")
+  return problems
+
+def main() -> None:
+  from apc import config
+  parser = argparse.ArgumentParser(prog="python -m apc.config_cache", description="Build or verify the binary config cache")
+  parser.add_argument("command", choices=["build", "verify"])
+  args = parser.parse_args()
+  if args.command == "build":
+    print(f"Wrote {build(config.CONFIG_PATH, config.CONFIG_FILES)}")
+  elif problems := verify(config.CONFIG_PATH, config.CONFIG_FILES):
+    print("\n".join(problems))
+    raise SystemExit(1)
+  else:
+    print(f"{config.CONFIG_PATH / CACHE_FILE} matches the JSON config")
+
+if __name__ == "__main__":
+  main()
@@ -6,11 +6,14 @@ Credit to xpltive/0xsthsth1337 for cracking the algorithm and sharing their code
 - https://next.nexusmods.com/profile/0xSthSth1337
 """
 
+import bisect
 import math
 import random
 import struct
 
-from apc import config
+import numpy as np
+
+from apc import config, profiling
 from apc.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -32,51 +35,46 @@ def get_fur_for_seed(seed: int, species_key: str, gender: str, great_one: bool =
     Attempt to calculate the `fur_key` for a given seed
     This is not always successful due to the imperfect cracked fur algorithm
     """
-    if great_one:
-        gender = f"great_one_{gender}"
-    species_config = config.get_species(species_key)
-    if not species_config:
-        # logger.warning("Unable to get species data for %s", species_key)
-        return None
-    gender_config = species_config.get("gender", {}).get(gender, {})
-    if not gender_config:
-        # logger.warning("Unable to read gender data for %s - %s", species_key, gender)
+    gender_key = f"great_one_{gender}" if great_one else gender
+    fur_table = config.compiled_config().fur_table(species_key, gender_key)
+    if fur_table is None:
+        # logger.warning("Unable to read fur data for %s - %s", species_key, gender_key)
         return None
 
     fl_probability = seed_to_probability(seed)
     if math.isnan(fl_probability) or math.isinf(fl_probability):
         # logger.debug(f"Cannot calculate probability for seed {seed} :: {gender} {species_key} >> fl_prob: {fl_probability}")
         return None
-    fur_total_probability = gender_config["fur_total_probability"]
-    cumulative = 0.0
-    # logger.debug(f"SPECIES: {species_key}   GENDER: {gender}   TOTAL_PROB: {fur_total_probability}")
-    for fur_key, fur_prob in gender_config["furs"].items():
-        # logger.debug(f" FUR: {fur_key}   PROB: {fur_prob}")
-        cumulative += fur_prob / fur_total_probability
-        if cumulative >= fl_probability:
-            return fur_key
+    # the first fur whose cumulative probability reaches the seed's probability
+    fur_keys, cumulative = fur_table
+    if (i := bisect.bisect_left(cumulative, fl_probability)) < len(fur_keys):
+        return fur_keys[i]
     logger.error(f"Unable to find fur for seed {seed} >> fl_prob {fl_probability}")
     raise ValueError(f"Unable to find fur for seed {seed} >> fl_prob {fl_probability}")
 
 
+@profiling.timed("find_fur_seed")
 def find_fur_seed(
     species_key: str,
     gender: str,
     great_one: bool = False,
     fur_key: str | None = None,
     max_attempts: int = 10_000_000,
+    rng: np.random.Generator | None = None,
 ) -> int | None:
     """
     Find a single seed that generates a valid fur or a specific fur if `fur_key` is provided.
+    Candidates come from a `random.Random` seeded by `rng` when one is given, so a seeded run finds the same seeds.
     Raises ValueError if no match is found within `max_attempts`.
     """
+    candidates = random if rng is None else random.Random(int(rng.integers(1 << 63)))
     for i in range(max_attempts):
-        seed = random.randint(0, 0xFFFFFFFF)
+        seed = candidates.randint(0, 0xFFFFFFFF)
         try:
             # logger.debug(f"Generating{f' {fur_key}' if fur_key else ''} seed for {species_key} {gender}{f' {great_one}' if great_one else ''} - {i}")
             if seeded_fur_key := get_fur_for_seed(seed, species_key, gender, great_one):
                 if seeded_fur_key == fur_key or fur_key is None:
-                    logger.debug(f"Found seed: {seed}{f' for fur: {fur_key}' if fur_key else ''}")
+                    logger.debug("Found seed: %d for fur: %s", seed, fur_key or "any")
                     return seed
         except ValueError as ex:
             logger.error(ex)
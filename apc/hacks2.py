@@ -15,8 +15,8 @@ import pyautogui
 
 from apc import adf, config, populations, utils
 from apc.adf import AdfAnimal, LoadedReserve
-from deca.ff_rtpc import RtpcNode, rtpc_from_binary
-from deca.hashes import hash32_func
+from deca.ff_rtpc import RtpcNode, h_prop_name, rtpc_from_buffer
+from deca.hashes import hash32_many
 
 ANIMAL_DETAILS_FILE = Path(config.CONFIG_PATH / "animal_details.json")
 ANIMAL_NAMES_FILE = Path(config.CONFIG_PATH / "animal_names.json")
@@ -182,14 +182,20 @@ class RtpcReserve:
       species_ids.append(prop_data["species_id"])
     return species_ids
 
-def open_rtpc(filename: Path) -> RtpcNode:
-  with filename.open("rb") as f:
-    data = rtpc_from_binary(f)
+def open_rtpc(filename: Path, lazy: bool = False) -> RtpcNode:
+  data = rtpc_from_buffer(filename.read_bytes(), lazy=lazy)
   root = data.root_node
   return root
 
+def get_global_animal(name: str) -> RtpcAnimal:
+  '''One species from `global_animal_types.blo` by name (eg "red_deer"), only that species' nodes are decoded'''
+  root = open_rtpc(config.GLOBAL_ANIMAL_TYPES, lazy=True)
+  animal_node = root.child_table[0].find_child(h_prop_name, name.encode("utf-8"))
+  return RtpcAnimal(animal_node) if animal_node is not None else None
+
 def get_global_animals() -> list[RtpcAnimal]:
-  root = open_rtpc(config.GLOBAL_ANIMAL_TYPES)
+  # lazy, the clue and spawn tag tables are never decoded
+  root = open_rtpc(config.GLOBAL_ANIMAL_TYPES, lazy=True)
   animal_data = root.child_table[0].child_table
   rtpc_animals = []
   for animal_node in animal_data:
@@ -203,11 +209,10 @@ def get_global_animals() -> list[RtpcAnimal]:
 
 def export_animal_hashes_to_json() -> None:
   rtpc_animals = get_global_animals()
-  animal_name_hashes = {}
-  name_hashes = {}
-  for a in rtpc_animals:
-    animal_name_hashes[hash32_func(a.full_name)] = a.full_name
-    name_hashes[hash32_func(a.name)] = a.name
+  full_names = [a.full_name for a in rtpc_animals]
+  names = [a.name for a in rtpc_animals]
+  animal_name_hashes = dict(zip(hash32_many(full_names), full_names))
+  name_hashes = dict(zip(hash32_many(names), names))
   animal_name_hashes = {str(k): v for k, v in sorted(animal_name_hashes.items())}
   name_hashes = {str(k): v for k, v in sorted(name_hashes.items())}
   hash_map = {"animal_name": animal_name_hashes, "name": name_hashes}
@@ -862,7 +867,7 @@ def export_reserve_animals_stats(reserve_key: str, species_key: str = None) -> c
   loaded_reserve = LoadedReserve(reserve_key, parse=True)
   species_keys = [species_key] if species_key else config.get_reserve_species(reserve_key)
   for species_key in species_keys:
-    species_description_full = populations.describe_animals(reserve_key, species_key, loaded_reserve.parsed_adf.adf, precision=4)
+    species_description_full = populations.describe_animals(reserve_key, species_key, loaded_reserve.parsed_adf.adf, precision=4).rows()
     filename = f"{reserve_key}-{species_key}.csv"
     headers = ["gender", "weight", "score"]
     extract_fn=lambda row: [row[2], row[3], row[4]]
@@ -0,0 +1,210 @@
+"""
+Index of known names by their 32 bit hash, to show names in place of hashes in the ADF and RTPC dumps.
+
+The index is built from `KNOWN_NAMES`, every string in the JSON config, in the RTPC files of the config folder
+  (global_animal_types.blo, reserve_*.bin) and in any ADF or RTPC files given to `build`.
+It is a sorted binary file that is memory-mapped and binary searched, so looking a name up hashes nothing.
+
+  python -m apc.hash_names build [files...]   # files: population files, ADF or RTPC files
+  python -m apc.hash_names lookup 0x1473b179
+"""
+
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+import argparse
+import bisect
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from deca import hashes
+from deca.ff_adf import Adf
+from deca.ff_rtpc import RtpcNode, k_type_str, rtpc_from_buffer
+from deca.file import ArchiveFile
+
+MAGIC = b"APCH"
+INDEX_VERSION = 1
+INDEX_FILE = "hash_names.bin"
+# magic, version, entry count, strings size
+# followed by the sorted u32 hashes, u32 string offsets (one more than the entries) and the utf-8 strings
+HEADER = struct.Struct("<4sIII")
+# RTPC property names, the files only have their hashes
+KNOWN_NAMES = [
+  "_class", "_class_hash", "_object_id", "name", "gender", "index", "probability", "diffuse_texture",
+  "world", "script", "border", "label_key", "note", "spline", "spawn_tags", "model_skeleton", "skeleton",
+  "need_type", "start_time", "[Item]  Item ID", "[ref] apex identifier",
+]
+
+class HashIndexError(Exception):
+  pass
+
+class HashIndex:
+  '''Names sorted by hash. Names sharing a hash are all kept, `lookup` returns the first'''
+  def __init__(self, hashes: memoryview, offsets: memoryview, strings: memoryview, source: Path = None) -> None:
+    self.hashes = hashes
+    self.offsets = offsets
+    self.strings = strings
+    self.source = source
+
+  def __len__(self) -> int:
+    return len(self.hashes)
+
+  def _first(self, hash32: int) -> int | None:
+    if not 0 <= hash32 <= 0xffffffff:
+      return None
+    i = bisect.bisect_left(self.hashes, hash32)
+    return i if i < len(self.hashes) and self.hashes[i] == hash32 else None
+
+  def _string(self, i: int) -> str:
+    return bytes(self.strings[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+  def lookup(self, hash32: int, default: str = None) -> str | None:
+    i = self._first(hash32)
+    return default if i is None else self._string(i)
+
+  def lookup_all(self, hash32: int) -> list[str]:
+    i = self._first(hash32)
+    if i is None:
+      return []
+    end = bisect.bisect_right(self.hashes, hash32)
+    return [self._string(j) for j in range(i, end)]
+
+def write(strings: Iterable[str | bytes], destination: Path) -> int:
+  '''Hash the strings and write the index, returns the number of names'''
+  names = {s.encode("utf-8") if isinstance(s, str) else bytes(s) for s in strings}
+  names.discard(b"")
+  entries = sorted(zip(hashes.hash32_many(names), names))
+  offsets = np.zeros(len(entries) + 1, dtype="<u4")
+  np.cumsum([len(name) for _, name in entries], out=offsets[1:])
+  blob = b"".join(name for _, name in entries)
+  with destination.open("wb") as f:
+    f.write(HEADER.pack(MAGIC, INDEX_VERSION, len(entries), len(blob)))
+    f.write(np.array([hash32 for hash32, _ in entries], dtype="<u4").tobytes())
+    f.write(offsets.tobytes())
+    f.write(blob)
+  logger.info(f"Wrote hash index {destination} ({len(entries)} names)")
+  return len(entries)
+
+def read(filename: Path) -> HashIndex:
+  '''Map the index file, raises `HashIndexError` unless it was written by this version'''
+  with open(filename, "rb") as f:
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  if len(buffer) < HEADER.size:
+    raise HashIndexError(f"{filename} is truncated")
+  magic, version, count, strings_size = HEADER.unpack_from(buffer, 0)
+  if magic != MAGIC or version != INDEX_VERSION:
+    raise HashIndexError(f"{filename} is not a version {INDEX_VERSION} hash index")
+  strings_offset = HEADER.size + 4 * (2 * count + 1)
+  if len(buffer) < strings_offset + strings_size:
+    raise HashIndexError(f"{filename} is truncated")
+  # u32 views of the mapped tables, bisect on them is much quicker than np.searchsorted for one hash.
+  # cast("I") reads native byte order and the tables are written "<u4", big-endian machines get swapped copies
+  view = memoryview(buffer)
+  index_hashes = view[HEADER.size:HEADER.size + 4 * count].cast("I")
+  offsets = view[HEADER.size + 4 * count:strings_offset].cast("I")
+  if sys.byteorder != "little":
+    index_hashes = memoryview(np.frombuffer(index_hashes, dtype="<u4").astype(np.uint32))
+    offsets = memoryview(np.frombuffer(offsets, dtype="<u4").astype(np.uint32))
+  return HashIndex(index_hashes, offsets, view[strings_offset:strings_offset + strings_size], filename)
+
+def _json_strings(value) -> Iterable[str]:
+  if isinstance(value, dict):
+    for key, item in value.items():
+      yield key
+      yield from _json_strings(item)
+  elif isinstance(value, list):
+    for item in value:
+      yield from _json_strings(item)
+  elif isinstance(value, str):
+    yield value
+
+def _rtpc_strings(root: RtpcNode) -> Iterable[bytes]:
+  stack = [root]
+  while stack:
+    node = stack.pop()
+    for prop in node.prop_table:
+      if prop.type == k_type_str:
+        yield prop.data
+    stack.extend(node.child_table)
+
+def _adf_strings(adf: Adf) -> Iterable[bytes]:
+  yield from adf.found_strings
+  yield from (name for _, name in adf.table_name)
+  yield from (string_hash.value for string_hash in adf.map_stringhash.values())
+  yield from (type_def.name for type_def in adf.map_typedef.values())
+
+def file_strings(filename: Path) -> Iterable[bytes]:
+  '''The strings of an RTPC or ADF file, anything else is read as a compressed population file'''
+  data = filename.read_bytes()
+  if data[:4] == b"RTPC":
+    return _rtpc_strings(rtpc_from_buffer(data).root_node)
+  if data[:4] == b" FDA":
+    parsed = Adf()
+    with ArchiveFile(open(filename, "rb")) as f:
+      parsed.deserialize(f)
+    return _adf_strings(parsed)
+  from apc import adf
+  return _adf_strings(adf.load_adf(filename).adf)
+
+def collect(config_path: Path, config_files: dict[str, str], files: list[Path] = ()) -> set[bytes]:
+  strings = {name.encode("utf-8") for name in KNOWN_NAMES}
+  for name in config_files.values():
+    with open(config_path / name, encoding="utf-8") as f:
+      strings.update(s.encode("utf-8") for s in _json_strings(json.load(f)))
+  for filename in [*config_path.glob("*.blo"), *config_path.glob("reserve_*.bin"), *files]:
+    try:
+      strings.update(file_strings(filename))
+    except Exception as ex:
+      logger.error(f"Skipping {filename}: {ex}")
+  return strings
+
+def build(config_path: Path, config_files: dict[str, str], files: list[Path] = ()) -> Path:
+  filename = config_path / INDEX_FILE
+  write(collect(config_path, config_files, files), filename)
+  return filename
+
+_index = None
+
+def load(config_path: Path) -> HashIndex | None:
+  '''Map the index in `config_path` once and have the deca dumps show its names, None when it has not been built'''
+  global _index
+  if _index is None:
+    try:
+      _index = read(config_path / INDEX_FILE)
+    except FileNotFoundError:
+      logger.debug("No hash index, run `python -m apc.hash_names build` to show names in dumps")
+      return None
+    except (HashIndexError, ValueError) as ex:
+      logger.info(f"Ignoring hash index: {ex}")
+      return None
+    hashes.hash_name_lookup = _index.lookup
+  return _index
+
+def main() -> None:
+  from apc import config
+  parser = argparse.ArgumentParser(prog="python -m apc.hash_names", description="Build or query the index of names by hash")
+  commands = parser.add_subparsers(dest="command", required=True)
+  build_parser = commands.add_parser("build", help="index the config and the given files")
+  build_parser.add_argument("files", nargs="*", type=Path, help="more population, ADF or RTPC files to take names from")
+  lookup_parser = commands.add_parser("lookup", help="the names of hashes")
+  lookup_parser.add_argument("hashes", nargs="+", help="hashes, decimal or 0x hex")
+  args = parser.parse_args()
+  if args.command == "build":
+    print(f"Wrote {build(config.CONFIG_PATH, config.CONFIG_FILES, args.files)}")
+    return
+  index = load(config.CONFIG_PATH)
+  if index is None:
+    raise SystemExit(f"No hash index in {config.CONFIG_PATH}, run build first")
+  for value in args.hashes:
+    hash32 = int(value, 0)
+    print(f"0x{hash32:08x}  {', '.join(index.lookup_all(hash32)) or '?'}")
+
+if __name__ == "__main__":
+  main()
@@ -8,6 +8,11 @@ setup_logging()
 In other files (include 'level="DEBUG"' for testing):
 from apc.logging_config import get_logger
 logger = get_logger(__name__)
+
+In hot loops, pass arguments instead of an f-string so nothing is formatted unless the record is emitted,
+and guard debug calls whose arguments are costly to build:
+if debug_enabled(logger):
+    logger.debug("Animal bytes: %s", animal.to_bytes())
 """
 
 import logging
@@ -49,3 +54,11 @@ def get_logger(
     if not root.hasHandlers():
         setup_logging(level or "INFO")
     return logging.getLogger(name)
+
+
+def debug_enabled(logger: logging.Logger) -> bool:
+    """
+    Whether `logger` emits debug records. `Logger.isEnabledFor` caches the answer until the levels change,
+    so this is cheap enough to check for every animal.
+    """
+    return logger.isEnabledFor(logging.DEBUG)
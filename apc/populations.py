@@ -2,19 +2,18 @@ from apc.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-import random
 import time
 from typing import Callable
 
-import FreeSimpleGUI as sg
 import numpy as np
 
-from apc import adf, adf_profile, config, fur_seed
+from apc import adf, adf_profile, config, fur_seed, profiling, thresholds
 from apc.adf import AdfAnimal, LoadedReserve
 from apc.config import (get_level_name, get_reserve,
                         get_reserve_name, get_species_name,
                         valid_species_for_reserve)
-from apc.utils import update_float, update_uint, format_key
+from apc.progress import Progress
+from apc.utils import update_float, update_uint, update_values, format_key
 from deca.ff_adf import Adf, AdfValue
 
 
@@ -39,123 +38,232 @@ def _get_populations(reserve_adf: Adf) -> list[AdfValue]:
   return populations
   # return [p for p in populations if len(p.value["Groups"].value) > 0]
 
-def _find_animal_level(weight: float, levels: list) -> int:
-  if levels == []:
-    return 0
-  level = 1
-  weight = round(weight, 2) if weight > 10 else round(weight, 3)
-  for value_i, value in enumerate(levels):
-    low_bound, high_bound = value
-    high_bound = round(high_bound, 2) if high_bound > 10 else round(high_bound, 3)
-    if (weight <= high_bound and weight > low_bound) or weight > high_bound:
-      level = value_i + 1
-  return level
+def _find_animal_level(species_key: str, weight: float) -> int:
+  return thresholds.find_level(species_key, weight)
 
 def _is_great_one(animal: AdfAnimal) -> bool:
   return animal.great_one
 
 def _is_diamond(animal: AdfAnimal) -> bool:
-  known_species = config.valid_species(animal.species_key)
-  diamond_config = config.ANIMALS[animal.species_key]["trophy"]["diamond"]
-  diamond_score = diamond_config["score_low"] if known_species else config.HIGH_NUMBER
-  diamond_gender = config.get_diamond_gender(animal.species_key)
-  return animal.score >= diamond_score and (animal.gender == diamond_gender or diamond_gender == "both")
-
-def find_animals(species_key: str, modded = False, good = False, top: bool = False, progress_bar: sg.ProgressBar = None) -> list:
-  animals = []
+  return thresholds.is_diamond(animal.species_key, animal.gender, animal.score)
+
+class AnimalRows:
+  '''
+  Columns describing the animals of one species on one or more reserves, the result of `describe_animals`.
+  Sorting and top-k selection work on the columns; display rows are only built by `rows` for the rows shown,
+    and an `AdfAnimal` only by `animal` for a selected row.
+  '''
+  COLUMNS = ("reserve", "gender", "weight", "score", "great_one", "seed", "level", "trophy")
+
+  def __init__(self, species_key: str, reserve_keys: list[str], columns: dict[str, np.ndarray], animals: np.ndarray, precision: int = 2, fur_names: np.ndarray = None) -> None:
+    self.species_key = species_key
+    self.reserve_keys = reserve_keys
+    self.columns = columns
+    self.animals = animals
+    self.precision = precision
+    # filled in as rows are shown, the fur is the slowest value to work out
+    self.fur_names = np.full(len(animals), None, dtype=object) if fur_names is None else fur_names
+
+  @classmethod
+  def empty(cls, species_key: str, precision: int = 2) -> "AnimalRows":
+    dtypes = {"reserve": np.int16, "gender": np.uint8, "weight": np.float64, "score": np.float64, "great_one": bool, "seed": np.uint32, "level": np.int8, "trophy": np.int8}
+    return cls(species_key, [], {name: np.empty(0, dtype=dtypes[name]) for name in cls.COLUMNS}, np.empty(0, dtype=object), precision)
+
+  @classmethod
+  def from_table(cls, reserve_key: str, species_key: str, table: adf.AnimalTable, population_i: int, precision: int = 2) -> "AnimalRows":
+    population = table.population_slice(population_i)
+    rows = np.arange(population.start, population.stop)
+    weights = table.weights(rows)
+    scores = table.scores(rows)
+    great_ones = table.great_ones(rows)
+    columns = {
+      "reserve": np.zeros(len(rows), dtype=np.int16),
+      "gender": table.genders(rows),
+      "weight": weights,
+      "score": scores,
+      "great_one": great_ones,
+      "seed": table.seeds(rows),
+      "level": thresholds.classify_levels(species_key, weights, great_ones),
+      "trophy": thresholds.classify_trophies(species_key, scores, great_ones),
+    }
+    animals = np.empty(len(rows), dtype=object)
+    animals[:] = table.animals[population]
+    return cls(species_key, [reserve_key], columns, animals, precision)
+
+  @classmethod
+  def concat(cls, species_key: str, parts: list["AnimalRows"], precision: int = 2) -> "AnimalRows":
+    parts = [part for part in parts if len(part)]
+    if not parts:
+      return cls.empty(species_key, precision)
+    reserve_keys = list(dict.fromkeys(reserve_key for part in parts for reserve_key in part.reserve_keys))
+    reserve_codes = {reserve_key: i for i, reserve_key in enumerate(reserve_keys)}
+    columns = {name: np.concatenate([part.columns[name] for part in parts]) for name in cls.COLUMNS}
+    # re-number each part's reserves into the combined reserve list
+    columns["reserve"] = np.concatenate([
+      np.array([reserve_codes[reserve_key] for reserve_key in part.reserve_keys], dtype=np.int16)[part.columns["reserve"]]
+      for part in parts
+    ])
+    animals = np.concatenate([part.animals for part in parts])
+    return cls(species_key, reserve_keys, columns, animals, precision, np.concatenate([part.fur_names for part in parts]))
+
+  def __len__(self) -> int:
+    return len(self.animals)
+
+  def take(self, indexes: np.ndarray) -> "AnimalRows":
+    columns = {name: column[indexes] for name, column in self.columns.items()}
+    return AnimalRows(self.species_key, self.reserve_keys, columns, self.animals[indexes], self.precision, self.fur_names[indexes])
+
+  def good(self) -> "AnimalRows":
+    '''Only the Diamonds and Great Ones'''
+    diamonds = thresholds.classify_diamonds(self.species_key, self.columns["gender"], self.columns["score"])
+    return self.take(np.flatnonzero(diamonds | self.columns["great_one"]))
+
+  def top(self, k: int = 10) -> "AnimalRows":
+    '''The `k` highest scores, highest first'''
+    scores = self.columns["score"]
+    if len(scores) > k:
+      return self.take(np.argpartition(-scores, k - 1)[:k]).sort("score")
+    return self.sort("score")
+
+  def order(self, column: str, reverse: bool = True) -> np.ndarray:
+    '''Row indexes sorted by `column`, reserve, gender and fur sort by the names shown. Ties keep their order like `list.sort`'''
+    if not len(self):
+      return np.arange(0)
+    if column == "reserve":
+      keys = np.array([get_reserve_name(reserve_key) for reserve_key in self.reserve_keys])[self.columns["reserve"]]
+    elif column == "gender":
+      keys = np.where(self.columns["gender"] == thresholds.MALE, config.MALE, config.FEMALE)
+    elif column == "fur":
+      keys = self.furs().astype(str)
+    else:
+      keys = self.columns[column]
+    _, ranks = np.unique(keys, return_inverse=True)
+    return np.argsort(-ranks if reverse else ranks, kind="stable")
+
+  def sort(self, column: str, reverse: bool = True) -> "AnimalRows":
+    '''A copy sorted by `column`, see `order`'''
+    if not len(self):
+      return self
+    return self.take(self.order(column, reverse))
+
+  def reserve_key(self, i: int) -> str:
+    return self.reserve_keys[self.columns["reserve"][i]]
+
+  def gender(self, i: int) -> str:
+    return "male" if self.columns["gender"][i] == thresholds.MALE else "female"
+
+  def fur_name(self, i: int) -> str:
+    if (fur_name := self.fur_names[i]) is None:
+      seed = int(self.columns["seed"][i])
+      great_one = bool(self.columns["great_one"][i])
+      if fur_seed.get_fur_for_seed(seed, self.species_key, self.gender(i), great_one):
+        fur_name = fur_seed.get_fur_name_for_seed(seed, self.species_key, self.gender(i), great_one=great_one)
+      else:
+        fur_name = "unknown"
+      self.fur_names[i] = fur_name
+    return fur_name
+
+  def furs(self) -> np.ndarray:
+    '''The fur name of every row, working out the ones not shown yet'''
+    for i, fur_name in enumerate(self.fur_names):
+      if fur_name is None:
+        self.fur_name(i)
+    return self.fur_names
+
+  def row(self, i: int) -> list:
+    level = int(self.columns["level"][i])
+    return [
+      get_reserve_name(self.reserve_key(i)),
+      f"{level} : {get_level_name(config.Levels(level))}",
+      config.MALE if self.gender(i) == "male" else config.FEMALE,
+      round(float(self.columns["weight"][i]), self.precision),
+      round(float(self.columns["score"][i]), self.precision),
+      self.fur_name(i),
+      thresholds.trophy_name(int(self.columns["trophy"][i])),
+    ]
+
+  def rows(self, start: int = 0, stop: int = None) -> list[list]:
+    return [self.row(i) for i in range(*slice(start, stop).indices(len(self)))]
+
+  def rows_at(self, indexes: np.ndarray) -> list[list]:
+    return [self.row(i) for i in np.asarray(indexes).tolist()]
+
+  def animal(self, i: int) -> AdfAnimal:
+    return AdfAnimal(self.animals[i], self.species_key, self.reserve_key(i))
+
+def find_animals(species_key: str, modded = False, good = False, top: bool = False, progress: Progress = None) -> AnimalRows:
+  found = []
   reserve_keys = config.reserve_keys()
-  progress_per_reserve = 90/len(reserve_keys)
+  if progress is not None:
+    progress.start(len(reserve_keys))
   for i, reserve_key in enumerate(reserve_keys):
     if valid_species_for_reserve(species_key, reserve_key):
       try:
         reserve_details = adf.load_reserve(reserve_key, modded)
-        reserve_animals = describe_animals(reserve_key, species_key, reserve_details.adf, good=good)
-        animals.extend(reserve_animals)
+        table = adf.AnimalTable(reserve_details.adf, reserve_details.decompressed.data)
+        found.append(describe_animals(reserve_key, species_key, reserve_details.adf, good=good, table=table))
       except adf.FileNotFound as ex:
         save_path = config.MOD_DIR_PATH if modded else config.get_save_path()
         logger.error(f"{config.FILE_NOT_FOUND}: {save_path / config.get_population_file_name(reserve_key)}")
-    if progress_bar:
-      progress_bar.update((i+1)*progress_per_reserve)
-  animals = sorted(animals, key = lambda x : x[4], reverse=True)
-  return animals[:10] if top else animals
+    if progress is not None:
+      progress.update(i + 1)
+  animals = AnimalRows.concat(species_key, found)
+  return animals.top() if top else animals.sort("score")
 
-def describe_animals(reserve_key: str, species_key: str, reserve_adf: Adf, good = False, top: bool = False, precision: int = 2) -> list[list[list]]:
-  populations = _get_populations(reserve_adf)
-  population = populations[get_reserve(reserve_key)["species"].index(species_key)]
-  groups = population.value["Groups"].value
-  rows = []
+@profiling.timed("describe_animals")
+def describe_animals(reserve_key: str, species_key: str, reserve_adf: Adf, good = False, top: bool = False, precision: int = 2, table: adf.AnimalTable = None) -> AnimalRows:
+  '''
+  The animals of one species sorted by score. Pass the reserve's `table`, e.g. `LoadedReserve.animal_table`, to reuse it.
+  '''
+  population_i = get_reserve(reserve_key)["species"].index(species_key)
+  groups = _get_populations(reserve_adf)[population_i].value["Groups"].value
 
-  logger.debug(f"Processing {format_key(species_key)} animals...")
+  logger.debug("Processing %s animals...", format_key(species_key))
   species_config = config.get_species(species_key)
   if (
     species_config is None  # trying to parse an unknown animal - new map? use hacks2.parse_reserve_species()
     or not groups  # some maps have placeholder blank groups for animals that were removed during development
   ):
     logger.info("No groups found for %s", species_key)
-    return []
+    return AnimalRows.empty(species_key, precision)
   diamond_config = species_config["trophy"]["diamond"]
   diamond_weight = diamond_config["weight_low"]
   diamond_score = diamond_config["score_low"]
-  logger.debug(f"Species: {species_key}   Diamond Weight: {diamond_weight}   Diamond Score: {diamond_score}")
-
-  for group in groups:
-    animals = group.value["Animals"].value
-    rows.extend(describe_animal_group(reserve_key, species_key, animals, good=good, top=top, precision=precision))
-  rows.sort(key=lambda x: x[4], reverse=True)
-  return rows[:10] if top else rows
-
-def describe_animal_group(reserve_key: str, species_key: str, animals: list[AdfValue], good: bool = False, top: bool = False, precision: int = 2) -> list[list]:
-  animal_data = []
-
-  species_config = config.get_species(species_key)
-  animal_levels = species_config.get("level", [])
-
-  for animal in animals:
-    adf_animal = AdfAnimal(animal, species_key, reserve_key)
-    is_diamond = _is_diamond(adf_animal)
-    is_great_one = _is_great_one(adf_animal)
-
-    if ((good and (is_diamond or is_great_one)) or not good):
-      level = _find_animal_level(adf_animal.weight, animal_levels) if not is_great_one else 10
-      level_name = get_level_name(config.Levels(level))
-      animal_data.append([
-        get_reserve_name(reserve_key),
-        f"{level} : {level_name}",
-        config.MALE if adf_animal.gender == "male" else config.FEMALE,
-        round(adf_animal.weight, precision),
-        round(adf_animal.score, precision),
-        adf_animal.fur_name,
-        adf_animal.trophy,
-        adf_animal
-      ])
-  return animal_data
-
-def describe_reserve(reserve_key: str, reserve_adf: Adf, include_species = True) -> tuple[list[list], dict]:
-    populations = _get_populations(reserve_adf)
+  logger.debug("Species: %s   Diamond Weight: %s   Diamond Score: %s", species_key, diamond_weight, diamond_score)
+
+  table = adf.AnimalTable(reserve_adf) if table is None else table
+  animals = AnimalRows.from_table(reserve_key, species_key, table, population_i, precision)
+  if good:
+    animals = animals.good()
+  return animals.top() if top else animals.sort("score")
+
+def _high_value(values: np.ndarray) -> float:
+  high = values.max() if values.size else 0
+  return round(float(high), 2) if high > 0 else 0
+
+@profiling.timed("describe_reserve")
+def describe_reserve(reserve_key: str, reserve_adf: Adf, include_species = True, reserve_data: bytearray = None) -> tuple[list[list], dict]:
+    '''
+    Summarize every population on the reserve in one pass over the animal columns.
+    Pass the decompressed `reserve_data` to read the values straight from the file bytes.
+    '''
+    table = adf.AnimalTable(reserve_adf, reserve_data)
     reserve_species = config.get_reserve(reserve_key)["species"]
-    logger.debug(f"processing {len(populations)} species...")
+    logger.debug(f"processing {len(table.population_groups)} species...")
+    genders = table.genders()
+    weights = table.weights()
+    scores = table.scores()
+    great_ones = table.great_ones()
 
     rows = []
-    total_cnt = 0
     species_groups = {}
 
-    for population_i, population in enumerate(populations):
-      groups = population.value["Groups"].value
-      animal_cnt = 0
-      population_high_weight = 0
-      population_high_score = 0
-      female_cnt = 0
-      male_cnt = 0
-      great_one_cnt = 0
-      diamond_cnt = 0
-      female_groups = []
-      male_groups = []
-
+    for population_i, group_cnt in enumerate(table.population_groups):
       species_key = config.RESERVES[reserve_key]["species"][population_i] if include_species else str(population_i)
       species_config = config.get_species(species_key)
       if (
         species_config is None  # trying to parse an unknown animal - new map? use hacks2.parse_reserve_species()
-        or not groups  # some maps have placeholder blank groups for animals that were removed during development
+        or not group_cnt  # some maps have placeholder blank groups for animals that were removed during development
       ):
         logger.info("No groups found for %s", species_key)
         continue
@@ -165,71 +273,49 @@ def describe_reserve(reserve_key: str, reserve_adf: Adf, include_species = True)
       species_name = f"{species_max_level}. {config.get_reserve_species_name(species_key, reserve_key)}"
 
       if diamond_score != config.HIGH_NUMBER:
-        logger.debug(f"Species: {species_name}, Diamond Weight: {diamond_weight}, Diamond Score: {diamond_score}")
-
-      for group_i, group in enumerate(groups):
-        animals = group.value["Animals"].value
-        group_animal_cnt = len(animals)
-        animal_cnt += group_animal_cnt
-        total_cnt += group_animal_cnt
-        group_male_cnt = 0
-        group_female_cnt = 0
-
-        for animal_i, animal in enumerate(animals):
-          animal = AdfAnimal(animal, species_key, reserve_key)
-
-          if animal.gender == "male":
-            male_cnt += 1
-            group_male_cnt += 1
-            if animal.score > population_high_score:
-                population_high_score = animal.score
-          else:
-            female_cnt += 1
-            group_female_cnt += 1
-
-          if animal.weight > population_high_weight:
-              population_high_weight = animal.weight
-
-          if animal.great_one:
-            great_one_cnt += 1
-          elif _is_diamond(animal):
-            diamond_cnt += 1
-        if group_male_cnt > 0:
-          male_groups.append(group_i)
-        if group_female_cnt > 0:
-          female_groups.append(group_i)
-
-      species_groups[reserve_species[population_i]] = { "male": male_groups, "female": female_groups }
+        logger.debug("Species: %s, Diamond Weight: %s, Diamond Score: %s", species_name, diamond_weight, diamond_score)
+
+      population = table.population_slice(population_i)
+      population_groups = table.groups[population]
+      population_scores = scores[population]
+      population_great_ones = great_ones[population]
+      males = genders[population] == thresholds.MALE
+      females = ~males
+      diamonds = ~population_great_ones & thresholds.classify_diamonds(species_key, genders[population], population_scores)
+
+      species_groups[reserve_species[population_i]] = {
+        "male": np.unique(population_groups[males]).tolist(),
+        "female": np.unique(population_groups[females]).tolist(),
+      }
 
       rows.append([
         species_key,
         species_max_level,
         species_name,
-        animal_cnt,
-        male_cnt,
-        female_cnt,
-        round(population_high_weight, 2),
-        round(population_high_score, 2),
-        diamond_cnt,
-        great_one_cnt
+        int(males.size),
+        int(males.sum()),
+        int(females.sum()),
+        _high_value(weights[population]),
+        _high_value(population_scores[males]),
+        int(diamonds.sum()),
+        int(population_great_ones.sum())
       ])
 
     return (sorted(rows, key = lambda x: x[1]), species_groups)
 
-def _get_eligible_animals(groups: list[AdfValue], species_key: str, reserve_key: str, gender: str, include_diamonds: bool = False, include_great_ones: bool = False) -> list[AdfAnimal]:
-  eligible_animals: list[AdfAnimal] = []
-  for group_i, group in enumerate(groups):
-    animals = group.value["Animals"].value
-    for animal_i, animal in enumerate(animals):
-      animal = AdfAnimal(animal, species_key, reserve_key=reserve_key)
-      if _is_great_one(animal) and not include_great_ones:
-        continue
-      if _is_diamond(animal) and not include_diamonds:
-        continue
-      if animal.gender == gender or gender == "both":
-        eligible_animals.append(animal)
-  logger.info(f"Found {len(eligible_animals)} eligible animals")
-  return eligible_animals
+def _get_eligible_animals(loaded_reserve: LoadedReserve, species_key: str, gender: str, include_diamonds: bool = False, include_great_ones: bool = False) -> np.ndarray:
+  '''
+  Rows of the reserve's animal index matching the gender, diamond and Great One filters.
+  Use `_choose_animals` to sample from them.
+  '''
+  eligible_rows = loaded_reserve.animal_index.eligible(species_key, gender, include_diamonds=include_diamonds, include_great_ones=include_great_ones)
+  logger.info("Found %d eligible animals", len(eligible_rows))
+  return eligible_rows
+
+def _choose_animals(loaded_reserve: LoadedReserve, species_key: str, eligible_rows: np.ndarray, k: int = None, rng: np.random.Generator = None) -> tuple[np.ndarray, list[AdfAnimal]]:
+  animal_index = loaded_reserve.animal_index
+  chosen_rows = eligible_rows if k is None else animal_index.sample(eligible_rows, k, rng)
+  return chosen_rows, animal_index.animals(chosen_rows, species_key)
 
 def _get_eligible_groups(groups: list[AdfValue], minimum_animals: int = 1) -> list[AdfAnimal]:
   eligible_groups: list[AdfValue] = []
@@ -237,62 +323,129 @@ def _get_eligible_groups(groups: list[AdfValue], minimum_animals: int = 1) -> li
     animals = group.value["Animals"].value
     if len(animals) >= minimum_animals:
       eligible_groups.append(group)
-  logger.debug(f"Found {len(eligible_groups)} eligible groups")
+  logger.debug("Found %d eligible groups", len(eligible_groups))
   return eligible_groups
 
-def _update_animal(data: bytearray, animal: AdfAnimal, great_one: bool, gender: str, weight: float, score: float, visual_seed: int) -> None:
-  update_uint(data, animal.gender_offset, 1 if gender == "male" else 2)
-  update_float(data, animal.weight_offset, weight)
-  update_float(data, animal.score_offset, score)
-  update_uint(data, animal.great_one_offset, 1 if great_one else 0)
-  update_uint(data, animal.visual_seed_offset, visual_seed)
-
-def _create_great_one(animal: AdfAnimal, species_config: dict, data: bytearray, fur_key: str = None, kwargs: dict = {}) -> None:
-  gender_config = species_config["gender"][f"great_one_{animal.gender}"]
-  new_weight, new_score = config.generate_weight_and_score(gender_config)
-  visual_seed = fur_seed.find_fur_seed(animal.species_key, animal.gender, great_one=True, fur_key=fur_key)
-  update_uint(data, animal.visual_seed_offset, visual_seed)
-  update_float(data, animal.weight_offset, new_weight)
-  update_float(data, animal.score_offset, new_score)
-  update_uint(data, animal.great_one_offset, 1)
-  update_uint(data, animal.gender_offset, 1 if animal.gender == "male" else 2)
-
-def _create_diamond(animal: AdfAnimal, species_config: dict, data: bytearray, fur_key: str = None, kwargs: dict = {}) -> None:
+class AnimalEdits:
+  '''
+  Field writes collected by the `_create_*` strategies and applied to the reserve data in one `flush`.
+  Gender, Great One and seed are written as 4-byte integers like `update_uint`; weight and score as 32-bit floats.
+  The parsed ADF values are updated too so animals read later in an edit session see the new values.
+  '''
+  def __init__(self) -> None:
+    self.uints: dict[int, int] = {}
+    self.floats: dict[int, float] = {}
+    self.values: list[tuple[AdfValue, int | float]] = []
+
+  def __len__(self) -> int:
+    return len(self.uints) + len(self.floats)
+
+  def set(self, animal: AdfAnimal, gender: str = None, weight: float = None, score: float = None, great_one: bool = None, visual_seed: int = None) -> None:
+    fields = animal.adf.value
+    if gender is not None:
+      self.uints[animal.gender_offset] = 1 if gender == "male" else 2
+      self.values.append((fields["Gender"], 1 if gender == "male" else 2))
+    if weight is not None:
+      self.floats[animal.weight_offset] = weight
+      self.values.append((fields["Weight"], float(np.float32(weight))))
+    if score is not None:
+      self.floats[animal.score_offset] = score
+      self.values.append((fields["Score"], float(np.float32(score))))
+    if great_one is not None:
+      self.uints[animal.great_one_offset] = 1 if great_one else 0
+      self.values.append((adf._great_one_value(fields), 1 if great_one else 0))
+      if "IsScripted" in fields:
+        self.values.append((fields["IsScripted"], 0))  # cleared by the 4-byte Great One write
+    if visual_seed is not None:
+      self.uints[animal.visual_seed_offset] = visual_seed
+      self.values.append((fields["VisualVariationSeed"], visual_seed))
+
+  def flush(self, data: bytearray) -> None:
+    logger.debug("Writing %d animal fields", len(self))
+    update_values(data, list(self.uints.keys()), list(self.uints.values()), np.uint32)
+    update_values(data, list(self.floats.keys()), list(self.floats.values()), np.float32)
+    for adf_value, value in self.values:
+      adf_value.value = value
+    self.uints.clear()
+    self.floats.clear()
+    self.values.clear()
+
+def _update_animal(edits: AnimalEdits, animal: AdfAnimal, great_one: bool, gender: str, weight: float, score: float, visual_seed: int) -> None:
+  edits.set(animal, gender=gender, weight=weight, score=score, great_one=great_one, visual_seed=visual_seed)
+
+def _generate_values(animals: list[AdfAnimal], gender_configs: dict[str, dict], percentiles: np.ndarray = None, fuzz: bool = True, rng: np.random.Generator = None) -> tuple[np.ndarray, np.ndarray]:
+  '''Weights and scores for every animal, generated in one batch per gender config'''
+  weights = np.zeros(len(animals))
+  scores = np.zeros(len(animals))
+  genders = np.array([animal.gender for animal in animals])
+  for gender, gender_config in gender_configs.items():
+    selected = np.flatnonzero(genders == gender) if gender != "both" else np.arange(len(animals))
+    if selected.size:
+      selected_percentiles = percentiles[selected] if percentiles is not None else None
+      weights[selected], scores[selected] = config.generate_weights_and_scores(gender_config, selected.size, percentiles=selected_percentiles, fuzz=fuzz, rng=rng)
+  return weights, scores
+
+def _weight_percentiles(animals: list[AdfAnimal], species_config: dict) -> np.ndarray:
+  weights = np.array([animal.weight for animal in animals])
+  gender_configs = [species_config["gender"][animal.gender] for animal in animals]
+  weight_lows = np.array([gender_config["weight_low"] for gender_config in gender_configs])
+  weight_highs = np.array([gender_config["weight_high"] for gender_config in gender_configs])
+  return (weights - weight_lows) / (weight_highs - weight_lows)
+
+def _create_great_one(animals: list[AdfAnimal], species_config: dict, edits: AnimalEdits, fur_keys: list[str] = None, kwargs: dict = {}, on_animal: Callable = None, rng: np.random.Generator = None) -> None:
+  # sorted so a seeded run draws the genders in the same order whatever the string hashes
+  gender_configs = {gender: species_config["gender"][f"great_one_{gender}"] for gender in sorted({animal.gender for animal in animals})}
+  new_weights, new_scores = _generate_values(animals, gender_configs, rng=rng)
+  for animal_i, animal in enumerate(animals):
+    fur_key = fur_keys[animal_i] if fur_keys else None
+    visual_seed = fur_seed.find_fur_seed(animal.species_key, animal.gender, great_one=True, fur_key=fur_key, rng=rng)
+    edits.set(animal, gender=animal.gender, weight=new_weights[animal_i], score=new_scores[animal_i], great_one=True, visual_seed=visual_seed)
+    if on_animal is not None:
+      on_animal(animal_i + 1)
+
+def _create_diamond(animals: list[AdfAnimal], species_config: dict, edits: AnimalEdits, fur_keys: list[str] = None, kwargs: dict = {}, on_animal: Callable = None, rng: np.random.Generator = None) -> None:
   safe_diamonds_config = config.get_safe_diamond_values(species_config)
-  new_weight, new_score = config.generate_weight_and_score(safe_diamonds_config)
-  if fur_key:
-    visual_seed = fur_seed.find_fur_seed(animal.species_key, animal.gender, fur_key=fur_key)
-    update_uint(data, animal.visual_seed_offset, visual_seed)
-  update_float(data, animal.weight_offset, new_weight)
-  update_float(data, animal.score_offset, new_score)
-  update_uint(data, animal.great_one_offset, 0)
-  update_uint(data, animal.gender_offset, 1 if animal.gender == "male" else 2)
-
-def _create_fur(animal: AdfAnimal, _species_config: dict, data: bytearray, fur_key: str = None, kwargs: dict = {}) -> None:
+  new_weights, new_scores = _generate_values(animals, {"both": safe_diamonds_config}, rng=rng)
+  for animal_i, animal in enumerate(animals):
+    fur_key = fur_keys[animal_i] if fur_keys else None
+    visual_seed = fur_seed.find_fur_seed(animal.species_key, animal.gender, fur_key=fur_key, rng=rng) if fur_key else None
+    edits.set(animal, gender=animal.gender, weight=new_weights[animal_i], score=new_scores[animal_i], great_one=False, visual_seed=visual_seed)
+    if on_animal is not None:
+      on_animal(animal_i + 1)
+
+def _create_fur(animals: list[AdfAnimal], _species_config: dict, edits: AnimalEdits, fur_keys: list[str] = None, kwargs: dict = {}, on_animal: Callable = None, rng: np.random.Generator = None) -> None:
   rares = kwargs.get("rares", False)
-  if fur_key is None and rares and not animal.great_one:
-      rare_fur_keys = config.get_rare_furs(animal.species_key, animal.gender)
-      fur_key = random.choice(rare_fur_keys)
-  visual_seed = fur_seed.find_fur_seed(animal.species_key, animal.gender, great_one=animal.great_one, fur_key=fur_key)
-  update_uint(data, animal.visual_seed_offset, visual_seed)
-
-def _create_male(animal: AdfAnimal, species_config: dict, data: bytearray, kwargs: dict = {}) -> None:
-  old_gender_config = species_config["gender"][animal.gender]
-  weight_percentile = (animal.weight - old_gender_config["weight_low"]) / (old_gender_config["weight_high"] - old_gender_config["weight_low"])
-  male_config = species_config["gender"]["male"]
-  new_weight, new_score = config.generate_weight_and_score(male_config, percentile=weight_percentile, fuzz=False)
-  update_float(data, animal.weight_offset, new_weight)
-  update_float(data, animal.score_offset, new_score)
-  update_uint(data, animal.gender_offset, 1)
-
-def _create_female(animal: AdfAnimal, species_config: dict, data: bytearray, kwargs: dict = {}) -> None:
-  old_gender_config = species_config["gender"][animal.gender]
-  weight_percentile = (animal.weight - old_gender_config["weight_low"]) / (old_gender_config["weight_high"] - old_gender_config["weight_low"])
-  female_config = species_config["gender"]["female"]
-  new_weight, new_score = config.generate_weight_and_score(female_config, percentile=weight_percentile, fuzz=False)
-  update_float(data, animal.weight_offset, new_weight)
-  update_float(data, animal.score_offset, new_score)
-  update_uint(data, animal.gender_offset, 2)
+  for animal_i, animal in enumerate(animals):
+    fur_key = fur_keys[animal_i] if fur_keys else None
+    if fur_key is None and rares and not animal.great_one:
+        rare_fur_keys = config.get_rare_furs(animal.species_key, animal.gender)
+        fur_key = rare_fur_keys[config.random_generator(rng).integers(len(rare_fur_keys))]
+    visual_seed = fur_seed.find_fur_seed(animal.species_key, animal.gender, great_one=animal.great_one, fur_key=fur_key, rng=rng)
+    edits.set(animal, visual_seed=visual_seed)
+    if on_animal is not None:
+      on_animal(animal_i + 1)
+
+def _create_male(animals: list[AdfAnimal], species_config: dict, edits: AnimalEdits, kwargs: dict = {}, on_animal: Callable = None, rng: np.random.Generator = None) -> None:
+  weight_percentiles = _weight_percentiles(animals, species_config)
+  new_weights, new_scores = _generate_values(animals, {"both": species_config["gender"]["male"]}, percentiles=weight_percentiles, fuzz=False, rng=rng)
+  for animal_i, animal in enumerate(animals):
+    edits.set(animal, gender="male", weight=new_weights[animal_i], score=new_scores[animal_i])
+    if on_animal is not None:
+      on_animal(animal_i + 1)
+
+def _create_female(animals: list[AdfAnimal], species_config: dict, edits: AnimalEdits, kwargs: dict = {}, on_animal: Callable = None, rng: np.random.Generator = None) -> None:
+  weight_percentiles = _weight_percentiles(animals, species_config)
+  new_weights, new_scores = _generate_values(animals, {"both": species_config["gender"]["female"]}, percentiles=weight_percentiles, fuzz=False, rng=rng)
+  for animal_i, animal in enumerate(animals):
+    edits.set(animal, gender="female", weight=new_weights[animal_i], score=new_scores[animal_i])
+    if on_animal is not None:
+      on_animal(animal_i + 1)
+
+def _animal_progress(progress: Progress, message: str, total: int) -> Callable:
+  if progress is None:
+    return None
+  progress.start(total, message)
+  return progress.update
 
 def get_callable_message(cb: callable) -> str:
   callable_names = {
@@ -304,32 +457,30 @@ def get_callable_message(cb: callable) -> str:
   }
   return callable_names.get(cb.__name__)
 
-def _process_all(species_key: str, species_config: dict, groups: list, loaded_reserve: LoadedReserve, cb: Callable, kwargs: dict = {}, gender: str = None, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+def _process_all(species_key: str, species_config: dict, loaded_reserve: LoadedReserve, cb: Callable, kwargs: dict = {}, gender: str = None, progress: Progress = None, rng: np.random.Generator = None) -> None:
   if gender is None:
     raise ValueError(f"No gender provided to _process_all: {species_key} @ {loaded_reserve.reserve_key} >> {cb} >> {kwargs}")
-  animals = _get_eligible_animals(groups, species_key, loaded_reserve.reserve_key, gender)
-  if len(animals) == 0:
+  eligible_rows = _get_eligible_animals(loaded_reserve, species_key, gender)
+  if len(eligible_rows) == 0:
     raise NoAnimalsException(f"There are not enough {get_species_name(species_key)} to process")
-  if progress_bar is not None:
-    progress_bar.update(0, max=len(animals))
-  count = 0
-  for animal in animals:
-    count += 1
-    if progress_bar is not None:
-      progress_bar.update(count)
-    if message_box is not None:
-      message_box.update(f"{get_callable_message(cb)} ({config.get_species_name(species_key)}): {count}/{len(animals)}")
-    cb(animal, species_config, loaded_reserve, kwargs=kwargs)
-
-def _great_one_all(species_key: str, groups: list, loaded_reserve: LoadedReserve, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+  chosen_rows, animals = _choose_animals(loaded_reserve, species_key, eligible_rows, rng=rng)
+  edits = AnimalEdits()
+  on_animal = _animal_progress(progress, f"{get_callable_message(cb)} ({config.get_species_name(species_key)})", len(animals))
+  cb(animals, species_config, edits, kwargs=kwargs, on_animal=on_animal, rng=rng)
+  edits.flush(loaded_reserve.parsed_adf.decompressed.data)
+  loaded_reserve.animal_index.refresh(chosen_rows)
+
+@profiling.timed()
+def _great_one_all(species_key: str, loaded_reserve: LoadedReserve, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
   great_one_gender = config.get_great_one_gender(species_key)
-  _process_all(species_key, species_config, groups, loaded_reserve, _create_great_one, { "include_diamonds": True} , gender=great_one_gender, progress_bar=progress_bar, message_box=message_box)
+  _process_all(species_key, species_config, loaded_reserve, _create_great_one, { "include_diamonds": True} , gender=great_one_gender, progress=progress, rng=rng)
 
-def _diamond_all(species_key: str, groups: list, loaded_reserve: LoadedReserve, rares: bool = False, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+@profiling.timed()
+def _diamond_all(species_key: str, loaded_reserve: LoadedReserve, rares: bool = False, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
   diamond_gender = config.get_diamond_gender(species_key)
-  _process_all(species_key, species_config, groups, loaded_reserve, _create_diamond, { "rares": rares }, gender=diamond_gender, progress_bar=progress_bar, message_box=message_box)
+  _process_all(species_key, species_config, loaded_reserve, _create_diamond, { "rares": rares }, gender=diamond_gender, progress=progress, rng=rng)
 
 def diamond_test_seed(species_key: str, groups: list, data: bytearray, seed: int, gender: int = 1) -> None:
   eligible_animals = []
@@ -444,62 +595,49 @@ def score_test_seed(species_key: str, groups: list, data: bytearray, seed: int,
     seed += 1
   return seed
 
-def _process_furs(species_key, species_config: dict, furs: list[str], groups: list, loaded_reserve: LoadedReserve, cb: Callable, gender: str = "male", progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
-  eligible_animals = _get_eligible_animals(groups, species_key, loaded_reserve.reserve_key, gender)
-  if len(eligible_animals) == 0:
+def _process_furs(species_key, species_config: dict, furs: list[str], loaded_reserve: LoadedReserve, cb: Callable, gender: str = "male", progress: Progress = None, rng: np.random.Generator = None) -> None:
+  eligible_rows = _get_eligible_animals(loaded_reserve, species_key, gender)
+  if len(eligible_rows) == 0:
     raise NoAnimalsException(f"There are not enough {get_species_name(species_key)} to process")
-  chosen_animals = random.sample(eligible_animals, k = len(furs))
-  total_count = len(chosen_animals)
-  if progress_bar is not None:
-    progress_bar.update(0, max=total_count)
-  for animal_i, animal in enumerate(chosen_animals):
-    if progress_bar is not None:
-      progress_bar.update(animal_i + 1)
-    if message_box is not None:
-      message_box.update(f"{get_callable_message(cb)} ({config.get_species_name(species_key)}): {animal_i + 1}/{len(chosen_animals)}")
-    cb(animal, species_config, loaded_reserve, fur = furs[animal_i])
-
-def _great_one_furs(species_key: str, groups: list, loaded_reserve: LoadedReserve, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+  chosen_rows, chosen_animals = _choose_animals(loaded_reserve, species_key, eligible_rows, k = len(furs), rng=rng)
+  edits = AnimalEdits()
+  on_animal = _animal_progress(progress, f"{get_callable_message(cb)} ({config.get_species_name(species_key)})", len(chosen_animals))
+  cb(chosen_animals, species_config, edits, fur_keys=furs, on_animal=on_animal, rng=rng)
+  edits.flush(loaded_reserve.parsed_adf.decompressed.data)
+  loaded_reserve.animal_index.refresh(chosen_rows)
+
+@profiling.timed()
+def _great_one_furs(species_key: str, loaded_reserve: LoadedReserve, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
   great_one_gender = config.get_great_one_gender(species_key)
   great_one_furs= config.get_species_furs(species_key, great_one_gender, great_one=True)
-  _process_furs(species_key, species_config, great_one_furs, groups, loaded_reserve, _create_great_one, gender=great_one_gender, progress_bar=progress_bar, message_box=message_box)
+  _process_furs(species_key, species_config, great_one_furs, loaded_reserve, _create_great_one, gender=great_one_gender, progress=progress, rng=rng)
 
-def _diamond_furs(species_key: str, groups: list, loaded_reserve: LoadedReserve, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+@profiling.timed()
+def _diamond_furs(species_key: str, loaded_reserve: LoadedReserve, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
   diamond_gender = config.get_diamond_gender(species_key)
   diamond_furs = config.get_species_furs(species_key, diamond_gender, great_one=False)
-  _process_furs(species_key, species_config, diamond_furs, groups, loaded_reserve, _create_diamond, gender=diamond_gender, progress_bar=progress_bar, message_box=message_box)
+  _process_furs(species_key, species_config, diamond_furs, loaded_reserve, _create_diamond, gender=diamond_gender, progress=progress, rng=rng)
+
+def _pick_furs(fur_keys: list[str], n: int, rng: np.random.Generator) -> list[str]:
+  return [fur_keys[i] for i in rng.integers(len(fur_keys), size=n)] if n else []
 
-def _update_with_furs(loaded_reserve: LoadedReserve, species_key: str, groups: list, male_fur_keys: list[str], female_fur_keys: list[str], male_fur_cnt: int, female_fur_cnt: int, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+def _update_with_furs(loaded_reserve: LoadedReserve, species_key: str, male_fur_keys: list[str], female_fur_keys: list[str], male_fur_cnt: int, female_fur_cnt: int, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
-  male_animals = _get_eligible_animals(groups, species_key, loaded_reserve.reserve_key, "male", include_diamonds=True)
-  male_animals = random.sample(male_animals, k = male_fur_cnt)
-  female_animals = _get_eligible_animals(groups, species_key, loaded_reserve.reserve_key, "female", include_diamonds=True)
-  female_animals = random.sample(female_animals, k = female_fur_cnt)
+  male_rows = _get_eligible_animals(loaded_reserve, species_key, "male", include_diamonds=True)
+  _, male_animals = _choose_animals(loaded_reserve, species_key, male_rows, k = male_fur_cnt, rng=rng)
+  female_rows = _get_eligible_animals(loaded_reserve, species_key, "female", include_diamonds=True)
+  _, female_animals = _choose_animals(loaded_reserve, species_key, female_rows, k = female_fur_cnt, rng=rng)
   total_count = male_fur_cnt+female_fur_cnt
-  if progress_bar is not None:
-    progress_bar.update(0, max=total_count)
-  count = 0
-  reserve_data = loaded_reserve.parsed_adf.decompressed.data
-  for animal in male_animals:
-    count += 1
-    if progress_bar is not None:
-      progress_bar.update(count)
-    if message_box is not None:
-      message_box.update(f"{config.UPDATE_ANIMALS}: {count}/{total_count}")
-    fur_key = random.choice(male_fur_keys)
-    _create_fur(animal, species_config, reserve_data, fur_key)
-  for animal in female_animals:
-    count += 1
-    if progress_bar is not None:
-      progress_bar.update(count)
-    if message_box is not None:
-      message_box.update(f"{config.UPDATE_ANIMALS}: {count}/{total_count}")
-    fur_key = random.choice(female_fur_keys)
-    _create_fur(animal, species_config, reserve_data, fur_key)
-
-def _process_some(species_key: str, species_config: dict, groups: list, loaded_reserve: LoadedReserve, modifier: int, percentage: bool, cb: Callable, kwargs: dict = {}, gender: str = None, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+  edits = AnimalEdits()
+  animals = male_animals + female_animals
+  fur_keys = _pick_furs(male_fur_keys, len(male_animals), rng) + _pick_furs(female_fur_keys, len(female_animals), rng)
+  on_animal = _animal_progress(progress, config.UPDATE_ANIMALS, total_count)
+  _create_fur(animals, species_config, edits, fur_keys=fur_keys, on_animal=on_animal, rng=rng)
+  edits.flush(loaded_reserve.parsed_adf.decompressed.data)
+
+def _process_some(species_key: str, species_config: dict, loaded_reserve: LoadedReserve, modifier: int, percentage: bool, cb: Callable, kwargs: dict = {}, gender: str = None, progress: Progress = None, rng: np.random.Generator = None) -> None:
   if gender is None:
     raise ValueError(f"No gender provided to _process_some: {species_key} @ {loaded_reserve.reserve_key} >> {cb} >> MOD:{modifier}   %:{percentage} >> {kwargs}")
   callable_name = cb.__name__
@@ -512,78 +650,76 @@ def _process_some(species_key: str, species_config: dict, groups: list, loaded_r
     kwargs.get("include_great_ones", False)
     or (party and callable_name == "_great_one_some")
   )
-  eligible_animals = _get_eligible_animals(groups, species_key, loaded_reserve.reserve_key, gender, include_diamonds=include_diamonds, include_great_ones=include_great_ones)
-  logger.info(f"There are {len(eligible_animals)} eligible animals")
-  animal_cnt = round((modifier / 100) * len(eligible_animals)) if percentage else modifier
-  if party and animal_cnt > len(eligible_animals):
-    animal_cnt = len(eligible_animals)  # just convert all eligible animals for a party
-  if (len(eligible_animals) == 0 or len(eligible_animals) < animal_cnt) and not party:
+  eligible_rows = _get_eligible_animals(loaded_reserve, species_key, gender, include_diamonds=include_diamonds, include_great_ones=include_great_ones)
+  logger.info("There are %d eligible animals", len(eligible_rows))
+  animal_cnt = round((modifier / 100) * len(eligible_rows)) if percentage else modifier
+  if party and animal_cnt > len(eligible_rows):
+    animal_cnt = len(eligible_rows)  # just convert all eligible animals for a party
+  if (len(eligible_rows) == 0 or len(eligible_rows) < animal_cnt) and not party:
     raise NoAnimalsException(f"There are not enough {get_species_name(species_key)} to process")
-  if progress_bar is not None:
-    progress_bar.update(0, max=animal_cnt)
-  count = 0
-  chosen_animals = random.sample(eligible_animals, k = animal_cnt)
-  logger.debug(f"{callable_name} >> {animal_cnt} x {species_key}")
-  for animal in chosen_animals:
-    count += 1
-    if progress_bar is not None:
-      progress_bar.update(count)
-    if message_box is not None:
-      message_box.update(f"{get_callable_message(cb)} ({config.get_species_name(species_key)}): {count}/{animal_cnt}")
-    cb(animal, species_config, loaded_reserve.parsed_adf.decompressed.data, kwargs=kwargs)
-
-def _great_one_some(species_key: str, groups: list, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, party: bool = False, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+  chosen_rows, chosen_animals = _choose_animals(loaded_reserve, species_key, eligible_rows, k = animal_cnt, rng=rng)
+  logger.debug("%s >> %d x %s", callable_name, animal_cnt, species_key)
+  edits = AnimalEdits()
+  on_animal = _animal_progress(progress, f"{get_callable_message(cb)} ({config.get_species_name(species_key)})", animal_cnt)
+  cb(chosen_animals, species_config, edits, kwargs=kwargs, on_animal=on_animal, rng=rng)
+  edits.flush(loaded_reserve.parsed_adf.decompressed.data)
+  loaded_reserve.animal_index.refresh(chosen_rows)
+
+@profiling.timed()
+def _great_one_some(species_key: str, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, party: bool = False, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
   great_one_gender = config.get_great_one_gender(species_key)
-  _process_some(species_key, species_config, groups, loaded_reserve, modifier, percentage, _create_great_one, { "party": party, "include_diamonds": True }, gender=great_one_gender, progress_bar=progress_bar, message_box=message_box)
+  _process_some(species_key, species_config, loaded_reserve, modifier, percentage, _create_great_one, { "party": party, "include_diamonds": True }, gender=great_one_gender, progress=progress, rng=rng)
 
-def _diamond_some(species_key: str, groups: list, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, rares: bool = False, party: bool = False, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+@profiling.timed()
+def _diamond_some(species_key: str, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, rares: bool = False, party: bool = False, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
   diamond_gender = config.get_diamond_gender(species_key)
-  _process_some(species_key, species_config, groups, loaded_reserve, modifier, percentage, _create_diamond, { "party": party, "rares": rares }, gender=diamond_gender, progress_bar=progress_bar, message_box=message_box)
+  _process_some(species_key, species_config, loaded_reserve, modifier, percentage, _create_diamond, { "party": party, "rares": rares }, gender=diamond_gender, progress=progress, rng=rng)
 
-def _furs_some(species_key: str, groups: list, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, rares: bool = False, party: bool = False, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None)-> None:
+@profiling.timed()
+def _furs_some(species_key: str, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, rares: bool = False, party: bool = False, progress: Progress = None, rng: np.random.Generator = None)-> None:
   species_config = config.get_species(species_key)
-  _process_some(species_key, species_config, groups, loaded_reserve, modifier, percentage, _create_fur, { "party": party, "rares": rares, "include_diamonds": True }, gender="both", progress_bar=progress_bar, message_box=message_box)
+  _process_some(species_key, species_config, loaded_reserve, modifier, percentage, _create_fur, { "party": party, "rares": rares, "include_diamonds": True }, gender="both", progress=progress, rng=rng)
 
-def _male_some(species_key: str, groups: list, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, party: bool = False, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+@profiling.timed()
+def _male_some(species_key: str, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, party: bool = False, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
-  _process_some(species_key, species_config, groups, loaded_reserve, modifier, percentage, _create_male, { "party": party }, gender="female", progress_bar=progress_bar, message_box=message_box)
+  _process_some(species_key, species_config, loaded_reserve, modifier, percentage, _create_male, { "party": party }, gender="female", progress=progress, rng=rng)
 
-def _female_some(species_key: str, groups: list, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, party: bool = False, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
+@profiling.timed()
+def _female_some(species_key: str, loaded_reserve: LoadedReserve, modifier: int = None, percentage: bool = False, party: bool = False, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_config = config.get_species(species_key)
-  _process_some(species_key, species_config, groups, loaded_reserve, modifier, percentage, _create_female, { "party": party }, gender="male", progress_bar=progress_bar, message_box=message_box)
+  _process_some(species_key, species_config, loaded_reserve, modifier, percentage, _create_female, { "party": party }, gender="male", progress=progress, rng=rng)
 
-def _add_animals(loaded_reserve: LoadedReserve, species_key: str, animal_count: int, gender: str, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> int:
+def _add_animals(loaded_reserve: LoadedReserve, species_key: str, animal_count: int, gender: str, progress: Progress = None, rng: np.random.Generator = None) -> int:
   '''
   Loops through non-empty groups and duplicate the first animal in each group
   Animal stats are re-rolled after duplication to ensure uniqueness
   '''
   groups = _get_species_groups(loaded_reserve.reserve_key, loaded_reserve.parsed_adf.adf, species_key)
   eligible_groups = _get_eligible_groups(groups, 1)
-  if progress_bar is not None:
-    progress_bar.update(0, max=animal_count)
+  if progress is not None:
+    progress.start(animal_count, f"{config.ADD_ANIMALS} ({config.MALE if gender == "male" else config.FEMALE} {config.get_species_name(species_key)})")
   added_count = 0
   skipped_groups = []
   while added_count < animal_count and len(eligible_groups) > len(skipped_groups):
     group_index = added_count % len(eligible_groups)
     selected_group = eligible_groups[group_index]
     if len(selected_group.value["Animals"].value) >= 30:
-      logger.info(f"skipping group {group_index}")
+      logger.info("skipping group %d", group_index)
       skipped_groups.append(group_index)
       continue
     added_count += 1
-    if progress_bar is not None:
-      progress_bar.update(added_count)
-    if message_box is not None:
-      message_box.update(f"{config.ADD_ANIMALS}: {added_count}/{animal_count} {config.MALE if gender == "male" else config.FEMALE} {config.get_species_name(species_key)}")
-    adf.add_animal_to_group(loaded_reserve, selected_group, species_key, gender)
+    if progress is not None:
+      progress.update(added_count)
+    adf.add_animal_to_group(loaded_reserve, selected_group, species_key, gender, rng=rng)
   return added_count
 
-def _remove_animals(loaded_reserve: LoadedReserve, species_key: str, animal_count: int, gender: str, loop_data: dict = {}, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> int:
+def _remove_animals(loaded_reserve: LoadedReserve, species_key: str, animal_count: int, gender: str, loop_data: dict = {}, progress: Progress = None) -> int:
   '''
   Loops through groups with at least 2 animals and removes the first animal in each group
-  Currently need to save and re-parse the ADF after each loop due to an issue with
+  Currently need to re-parse the ADF after each loop due to an issue with
     incorrect offsets when attempting to remove multiple animals from a group
   '''
   removed_count = loop_data.get("removed_count", 0)
@@ -592,138 +728,151 @@ def _remove_animals(loaded_reserve: LoadedReserve, species_key: str, animal_coun
   eligible_groups = _get_eligible_groups(groups, 2)
   if len(eligible_groups) == 0:
     raise NoAnimalsException(f"{config.REMOVE_ANIMALS_ERROR}: {config.TOO_FEW_GROUP_ANIMALS}")
-  if progress_bar is not None:
-    progress_bar.update(removed_count, max=progress_max)
+  if progress is not None and not loop_data:
+    progress.start(progress_max, f"{config.REMOVE_ANIMALS} ({config.MALE if gender == "male" else config.FEMALE} {config.get_species_name(species_key)})")
   loop_count = -1
   skipped_groups = []
   while removed_count < progress_max and len(eligible_groups) > len(skipped_groups):
     loop_count += 1
-    logger.debug(f"loop: {loop_count}   removed: {removed_count}   remaining groups: {len(eligible_groups) - len(skipped_groups)}")
+    logger.debug("loop: %d   removed: %d   remaining groups: %d", loop_count, removed_count, len(eligible_groups) - len(skipped_groups))
     group_index = loop_count % len(eligible_groups)
     if group_index == 0 and loop_count > 0:  # back at the beginning of the list
-      loaded_reserve.save()
+      loaded_reserve.reparse()
       loop_data = {
         "removed_count": removed_count,
         "progress_max": progress_max,
       }
-      removed_count = _remove_animals(loaded_reserve, species_key, animal_count, gender, loop_data=loop_data, progress_bar=progress_bar, message_box=message_box)
+      removed_count = _remove_animals(loaded_reserve, species_key, animal_count, gender, loop_data=loop_data, progress=progress)
       return removed_count
     if group_index in skipped_groups:
       continue
     selected_group = eligible_groups[group_index]
     if len(selected_group.value["Animals"].value) <= 1:  # Don't remove the last animal from a group
-      logger.info(f"skipping group {group_index}")
+      logger.info("skipping group %d", group_index)
       skipped_groups.append(group_index)
       continue
     if adf.remove_animal_from_group(loaded_reserve, selected_group, species_key, gender):
       removed_count += 1
-      if progress_bar is not None:
-        progress_bar.update(removed_count)
-      if message_box is not None:
-        message_box.update(f'{config.REMOVE_ANIMALS}: {removed_count}/{animal_count} {config.MALE if gender == "male" else config.FEMALE} {config.get_species_name(species_key)}')
+      if progress is not None:
+        progress.update(removed_count)
     else:
       # couldn't find a valid animal to delete
       skipped_groups.append(group_index)
       continue
   return removed_count
 
-def mod_furs(loaded_reserve: LoadedReserve, species_key: str, male_fur_keys: list[str], female_fur_keys: list[str], male_fur_cnt: int, female_fur_cnt: int, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> None:
-  groups = _get_species_groups(loaded_reserve.reserve_key, loaded_reserve.parsed_adf.adf, species_key)
+def fur_count(loaded_reserve: LoadedReserve, species_key: str, gender: str, modifier: int, percentage: bool = False) -> int:
+  '''The number of `gender` animals `mod_furs` changes for a count or percentage, at most the eligible animals'''
+  eligible_cnt = len(_get_eligible_animals(loaded_reserve, species_key, gender, include_diamonds=True))
+  animal_cnt = round((modifier / 100) * eligible_cnt) if percentage else modifier
+  if animal_cnt > eligible_cnt:
+    logger.info("Only %d %s %s can get new furs", eligible_cnt, gender, species_key)
+    animal_cnt = eligible_cnt
+  return animal_cnt
+
+@profiling.timed("mod_furs")
+def mod_furs(loaded_reserve: LoadedReserve, species_key: str, male_fur_keys: list[str], female_fur_keys: list[str], male_fur_cnt: int, female_fur_cnt: int, progress: Progress = None, rng: np.random.Generator = None) -> None:
   species_name = config.get_species_name(species_key)
-  _update_with_furs(loaded_reserve, species_key, groups, male_fur_keys, female_fur_keys, male_fur_cnt, female_fur_cnt, progress_bar=progress_bar, message_box=message_box)
+  _update_with_furs(loaded_reserve, species_key, male_fur_keys, female_fur_keys, male_fur_cnt, female_fur_cnt, progress=progress, rng=config.random_generator(rng))
   logger.info(f"[green]All {species_name} furs have been updated![/green]")
   loaded_reserve.save()
 
-def mod_diamonds(loaded_reserve: LoadedReserve, species_key: str, diamond_cnt: int, male_fur_keys: list[str], female_fur_keys: list[str], progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> list:
-  species_population =_get_species_population(loaded_reserve.reserve_key, loaded_reserve.parsed_adf.adf, species_key)
-  groups: AdfValue = species_population.value["Groups"].value
+@profiling.timed("mod_diamonds")
+def mod_diamonds(loaded_reserve: LoadedReserve, species_key: str, diamond_cnt: int, male_fur_keys: list[str], female_fur_keys: list[str], progress: Progress = None, rng: np.random.Generator = None) -> list:
+  rng = config.random_generator(rng)
   species_name = config.get_species_name(species_key)
-  reserve_data = loaded_reserve.parsed_adf.decompressed.data
   diamond_gender = config.get_diamond_gender(species_key)
-  animals = _get_eligible_animals(groups, species_key, loaded_reserve.reserve_key, diamond_gender)
-  animals = random.sample(animals, k=diamond_cnt)
-  if progress_bar is not None:
-    progress_bar.update(0, max=len(animals))
-  count = 0
+  eligible_rows = _get_eligible_animals(loaded_reserve, species_key, diamond_gender)
+  chosen_rows, animals = _choose_animals(loaded_reserve, species_key, eligible_rows, k=diamond_cnt, rng=rng)
+  edits = AnimalEdits()
 
   species_config = config.get_species(species_key)
+  if not male_fur_keys:
+    male_fur_keys = config.get_furs(species_key, "male")
+  if not female_fur_keys:
+    female_fur_keys = config.get_furs(species_key, "female")
+  fur_keys = []
   for animal in animals:
-    count += 1
-    if progress_bar is not None:
-      progress_bar.update(count)
-    if message_box is not None:
-      message_box.update(f"{get_callable_message(_create_diamond)} ({config.get_species_name(species_key)}): {count}/{len(animals)}")
-    if not male_fur_keys:
-      male_fur_keys = config.get_furs(species_key, "male")
-    if not female_fur_keys:
-      female_fur_keys = config.get_furs(species_key, "female")
     if diamond_gender == "both":
-      diamond_gender = random.choice(["male", "female"])
-    if diamond_gender == "male":
-      animal.gender = "male"
-      _create_diamond(animal, species_config, reserve_data, fur_key=random.choice(male_fur_keys))
-    elif diamond_gender == "female":
-      animal.gender = "female"
-      _create_diamond(animal, species_config, reserve_data, fur_key=random.choice(female_fur_keys))
+      diamond_gender = ("male", "female")[rng.integers(2)]
+    animal.gender = diamond_gender
+    gender_fur_keys = male_fur_keys if diamond_gender == "male" else female_fur_keys
+    fur_keys.append(gender_fur_keys[rng.integers(len(gender_fur_keys))])
+  on_animal = _animal_progress(progress, f"{get_callable_message(_create_diamond)} ({config.get_species_name(species_key)})", len(animals))
+  _create_diamond(animals, species_config, edits, fur_keys=fur_keys, on_animal=on_animal, rng=rng)
+  edits.flush(loaded_reserve.parsed_adf.decompressed.data)
+  loaded_reserve.animal_index.refresh(chosen_rows)
 
   logger.info(f"[green]All {diamond_cnt} {species_name} diamonds have been added![/green]")
   loaded_reserve.save()
 
+@profiling.timed("mod_animal")
 def mod_animal(loaded_reserve: LoadedReserve, animal: AdfAnimal, great_one: bool, gender: str, weight: float, score: float, fur_key_or_seed: str | int = None) -> list:
   # an integer is passed if we are keeping an existing VisualVariationSeed
   if isinstance(fur_key_or_seed, int):
     visual_seed = fur_key_or_seed
   else:
     visual_seed = fur_seed.find_fur_seed(animal.species_key, gender, great_one, fur_key=fur_key_or_seed)
-  _update_animal(loaded_reserve.parsed_adf.decompressed.data, animal, great_one, gender, weight, score, visual_seed)
+  edits = AnimalEdits()
+  _update_animal(edits, animal, great_one, gender, weight, score, visual_seed)
+  edits.flush(loaded_reserve.parsed_adf.decompressed.data)
+  loaded_reserve.refresh_animals([animal.gender_offset])
   logger.info(f"[green]Animal has been updated![/green]")
 
-def mod_animal_cnt(loaded_reserve: LoadedReserve, species_key: str, animal_cnt: int, gender: str, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None) -> list:
+@profiling.timed("mod_animal_cnt")
+def mod_animal_cnt(loaded_reserve: LoadedReserve, species_key: str, animal_cnt: int, gender: str, progress: Progress = None, rng: np.random.Generator = None) -> list:
   species_name = config.get_species_name(species_key)
   logger.debug(f"Modding animal count: {species_key} + {animal_cnt} {gender}")
   if animal_cnt > 0:
-    result = _add_animals(loaded_reserve, species_key, animal_cnt, gender, progress_bar=progress_bar, message_box=message_box)
+    result = _add_animals(loaded_reserve, species_key, animal_cnt, gender, progress=progress, rng=config.random_generator(rng))
     if result < animal_cnt:
-      message_box.update(f"{config.ADD_ANIMALS_ERROR}: {config.TOO_MANY_GROUP_ANIMALS}")
-      time.sleep(2)
+      logger.warning(f"{config.ADD_ANIMALS_ERROR}: {config.TOO_MANY_GROUP_ANIMALS}")
+      if progress is not None:
+        progress.message(f"{config.ADD_ANIMALS_ERROR}: {config.TOO_MANY_GROUP_ANIMALS}")
+        time.sleep(2)
   elif animal_cnt < 0:
-    result = _remove_animals(loaded_reserve, species_key, abs(animal_cnt), gender, progress_bar=progress_bar, message_box=message_box)
+    result = _remove_animals(loaded_reserve, species_key, abs(animal_cnt), gender, progress=progress)
     if result < abs(animal_cnt):
-      message_box.update(f"{config.REMOVE_ANIMALS_ERROR}: {config.TOO_FEW_GROUP_ANIMALS}")
-      time.sleep(2)
+      logger.warning(f"{config.REMOVE_ANIMALS_ERROR}: {config.TOO_FEW_GROUP_ANIMALS}")
+      if progress is not None:
+        progress.message(f"{config.REMOVE_ANIMALS_ERROR}: {config.TOO_FEW_GROUP_ANIMALS}")
+        time.sleep(2)
+  if loaded_reserve.in_session:
+    loaded_reserve.reparse()  # animal offsets have moved, later edits in the session need a fresh parse
   loaded_reserve.save()
   logger.info(f"[green]All {abs(animal_cnt)} {gender} {species_name} animals have been {'added' if animal_cnt > 0 else 'removed'}![/green]")
 
-def mod(loaded_reserve: LoadedReserve, species_key: str, strategy: str, modifier: int = None, percentage: bool = False, rares: bool = False, party: bool = False, progress_bar: sg.ProgressBar = None, message_box: sg.Text = None):
-  groups = _get_species_groups(loaded_reserve.reserve_key, loaded_reserve.parsed_adf.adf, species_key)
+@profiling.timed()
+def mod(loaded_reserve: LoadedReserve, species_key: str, strategy: str, modifier: int = None, percentage: bool = False, rares: bool = False, party: bool = False, progress: Progress = None, rng: np.random.Generator = None):
+  rng = config.random_generator(rng)
   species_name = config.get_species_name(species_key)
 
   if (strategy == config.Strategy.great_one_all):
-    _great_one_all(species_key, groups, loaded_reserve, progress_bar=progress_bar, message_box=message_box)
+    _great_one_all(species_key, loaded_reserve, progress=progress, rng=rng)
     logger.info(f"[green]All {species_name} are now Great Ones![/green]")
   elif (strategy == config.Strategy.great_one_furs):
-    _great_one_furs(species_key, groups, loaded_reserve, progress_bar=progress_bar, message_box=message_box)
+    _great_one_furs(species_key, loaded_reserve, progress=progress, rng=rng)
     logger.info(f"[green]All {species_name} Great One furs have been added![/green]")
   elif (strategy == config.Strategy.great_one_some):
-    _great_one_some(species_key, groups, loaded_reserve, modifier, percentage, party=party, progress_bar=progress_bar, message_box=message_box)
+    _great_one_some(species_key, loaded_reserve, modifier, percentage, party=party, progress=progress, rng=rng)
     logger.info(f"[green]All {modifier}{'%' if percentage else ''} {species_name} are now Great Ones![/green]")
   elif (strategy == config.Strategy.diamond_all):
-    _diamond_all(species_key, groups, loaded_reserve, rares, progress_bar=progress_bar, message_box=message_box)
+    _diamond_all(species_key, loaded_reserve, rares, progress=progress, rng=rng)
     logger.info(f"[green]All {species_name} are now Diamonds![/green]")
   elif (strategy == config.Strategy.diamond_furs):
-    _diamond_furs(species_key, groups, loaded_reserve, progress_bar=progress_bar, message_box=message_box)
+    _diamond_furs(species_key, loaded_reserve, progress=progress, rng=rng)
     logger.info(f"[green]All {species_name} are now Diamonds![/green]")
   elif (strategy == config.Strategy.diamond_some):
-    _diamond_some(species_key, groups, loaded_reserve, modifier, percentage, rares, party=party, progress_bar=progress_bar, message_box=message_box)
+    _diamond_some(species_key, loaded_reserve, modifier, percentage, rares, party=party, progress=progress, rng=rng)
     logger.info(f"[green]All {modifier}{'%' if percentage else ''} {species_name} are now Diamonds![/green]")
   elif (strategy == config.Strategy.males):
-    _male_some(species_key, groups, loaded_reserve, modifier, percentage, party=party, progress_bar=progress_bar, message_box=message_box)
+    _male_some(species_key, loaded_reserve, modifier, percentage, party=party, progress=progress, rng=rng)
     logger.info(f"[green]All {modifier}{'%' if percentage else ''} {species_name} are now males![/green]")
   elif (strategy == config.Strategy.females):
-    _female_some(species_key, groups, loaded_reserve, modifier, percentage, party=party, progress_bar=progress_bar, message_box=message_box)
+    _female_some(species_key, loaded_reserve, modifier, percentage, party=party, progress=progress, rng=rng)
     logger.info(f"[green]All {modifier}{'%' if percentage else ''} {species_name} are now females![/green]")
   elif (strategy == config.Strategy.furs_some):
-    _furs_some(species_key, groups, loaded_reserve, modifier, percentage, rares, progress_bar=progress_bar, message_box=message_box)
+    _furs_some(species_key, loaded_reserve, modifier, percentage, rares, progress=progress, rng=rng)
     logger.info(f"[green]All {modifier}{'%' if percentage else ''} {species_name} are now {'rare' if rares else 'random'} furs![/green]")
   else:
     logger.error(f"Unknown strategy: {strategy}")
@@ -0,0 +1,159 @@
+"""
+Timing spans around the slow paths: loading, describing, modding and saving a reserve.
+
+Set the APC_PROFILE environment variable before starting apc or apcgui:
+  APC_PROFILE=spans          time the spans, the report of where the time went is logged on exit
+  APC_PROFILE=cprofile       also run cProfile, stats are written to apc_profile.prof and the top calls logged
+  APC_PROFILE=pyinstrument   also run pyinstrument (when installed) and log its call tree
+
+cProfile sees every thread, pyinstrument only the thread that started it, so work on other threads runs inside `capture`:
+
+  with profiling.capture("party"):
+    ...
+
+Without it `span` hands back a shared no-op context manager and `timed` returns the function unchanged,
+  so the instrumented code pays nothing.
+
+  with profiling.span("describe_animals"):
+    ...
+
+  @profiling.timed("find_fur_seed")
+  def find_fur_seed(...):
+"""
+
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+import atexit
+import contextlib
+import functools
+import io
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+MODE = os.environ.get("APC_PROFILE", "").strip().lower()
+ENABLED = MODE in ("1", "spans", "cprofile", "pyinstrument")
+PROFILE_FILE = Path().cwd() / "apc_profile.prof"
+
+_NO_SPAN = contextlib.nullcontext()
+_lock = threading.Lock()
+_stats: dict[str, list] = {}  # name: [calls, total seconds, longest seconds]
+_profiler = None
+_profiler_thread = None
+
+class Span:
+  def __init__(self, name: str) -> None:
+    self.name = name
+    self.start = 0.0
+
+  def __enter__(self) -> "Span":
+    self.start = time.perf_counter()
+    return self
+
+  def __exit__(self, *_) -> None:
+    record(self.name, time.perf_counter() - self.start)
+
+def record(name: str, seconds: float) -> None:
+  with _lock:
+    if (stat := _stats.get(name)) is None:
+      _stats[name] = [1, seconds, seconds]
+    else:
+      stat[0] += 1
+      stat[1] += seconds
+      stat[2] = max(stat[2], seconds)
+
+def span(name: str) -> Span | contextlib.nullcontext:
+  return Span(name) if ENABLED else _NO_SPAN
+
+def timed(name: str = None) -> Callable:
+  '''Decorator timing every call as a span, a no-op unless profiling is enabled'''
+  def decorate(function: Callable) -> Callable:
+    if not ENABLED:
+      return function
+    span_name = name or function.__qualname__
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+      with Span(span_name):
+        return function(*args, **kwargs)
+    return wrapper
+  return decorate
+
+def stats() -> dict[str, dict]:
+  with _lock:
+    return {name: {"calls": calls, "total": total, "longest": longest} for name, (calls, total, longest) in _stats.items()}
+
+def reset() -> None:
+  with _lock:
+    _stats.clear()
+
+def report() -> str:
+  '''The spans by total time, nested spans count towards their parent as well'''
+  lines = [f"{'span':40} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+  for name, stat in sorted(stats().items(), key=lambda item: item[1]["total"], reverse=True):
+    lines.append(f"{name:40} {stat['calls']:7} {stat['total'] * 1000:10.1f} {stat['total'] / stat['calls'] * 1000:9.2f} {stat['longest'] * 1000:9.2f}")
+  return "\n".join(lines)
+
+class ThreadCapture:
+  '''A pyinstrument profiler for the calling thread, its call tree is logged when the block exits'''
+  def __init__(self, name: str) -> None:
+    self.name = name
+    self.profiler = type(_profiler)()
+
+  def __enter__(self) -> "ThreadCapture":
+    self.profiler.start()
+    return self
+
+  def __exit__(self, *_) -> None:
+    self.profiler.stop()
+    logger.info(f"pyinstrument {self.name}:\n{self.profiler.output_text(unicode=True)}", extra={"markup": False})
+
+def capture(name: str = None) -> ThreadCapture | contextlib.nullcontext:
+  '''
+  Profile the calling thread for the block when pyinstrument is running on another thread.
+  cProfile hooks `sys.monitoring`, which covers every thread and allows no second profiler, so it needs no capture.
+  '''
+  if not hasattr(_profiler, "output_text") or threading.get_ident() == _profiler_thread:
+    return _NO_SPAN
+  return ThreadCapture(name or threading.current_thread().name)
+
+def _start_capture() -> None:
+  global _profiler, _profiler_thread
+  _profiler_thread = threading.get_ident()
+  if MODE == "pyinstrument":
+    try:
+      from pyinstrument import Profiler
+      _profiler = Profiler()
+      _profiler.start()
+      return
+    except ImportError:
+      logger.warning("pyinstrument is not installed, using cProfile")
+  import cProfile
+  _profiler = cProfile.Profile()
+  _profiler.enable()
+
+def _stop_capture() -> str:
+  if MODE == "pyinstrument" and hasattr(_profiler, "output_text"):
+    _profiler.stop()
+    return _profiler.output_text(unicode=True)
+  import pstats
+  _profiler.disable()
+  _profiler.dump_stats(PROFILE_FILE)
+  out = io.StringIO()
+  pstats.Stats(_profiler, stream=out).sort_stats("cumulative").print_stats(30)
+  return f"cProfile stats saved to {PROFILE_FILE}\n{out.getvalue()}"
+
+def _at_exit() -> None:
+  if _profiler is not None:
+    logger.info(_stop_capture(), extra={"markup": False})
+  if _stats:
+    logger.info(f"Profiling spans:\n{report()}", extra={"markup": False})
+
+if ENABLED:
+  if MODE in ("cprofile", "pyinstrument"):
+    _start_capture()
+  atexit.register(_at_exit)
+  logger.info(f"Profiling enabled: {MODE}")
@@ -0,0 +1,50 @@
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+import time
+from typing import Callable
+
+class Progress:
+  '''
+  Progress of a long running task reported through `on_progress(percent)` and `on_message(message)` callbacks.
+  Updates are throttled to at most `rate` a second and one every `step` percent, the first and last update always come through.
+  Calling `update` between reports only costs a comparison so it can be called for every animal.
+  '''
+  def __init__(self, on_progress: Callable[[float], None] = None, on_message: Callable[[str], None] = None, rate: float = 20, step: float = 1) -> None:
+    self.on_progress = on_progress
+    self.on_message = on_message
+    self.interval = 1 / rate if rate else 0
+    self.step = step
+    self.total = 0
+    self.label = None
+    self._next = 0
+    self._last_report = 0.0
+
+  def start(self, total: int, label: str = None) -> None:
+    '''Start a task of `total` steps, each report adds a "`label`: count/total" message when a label is given'''
+    self.total = total
+    self.label = label
+    self._next = 0
+    self._last_report = 0.0
+    self.update(0)
+
+  def update(self, count: int) -> None:
+    if count < self._next and count < self.total:
+      return
+    now = time.monotonic()
+    if 0 < count < self.total and now - self._last_report < self.interval:
+      return
+    self._last_report = now
+    self._next = count + max(self.total * self.step / 100, 1)
+    self.report(count)
+
+  def report(self, count: int) -> None:
+    if self.on_progress is not None:
+      self.on_progress(count * 100 / self.total if self.total else 100)
+    if self.label is not None and self.on_message is not None:
+      self.on_message(f"{self.label}: {count}/{self.total}")
+
+  def message(self, message: str) -> None:
+    if self.on_message is not None:
+      self.on_message(message)
@@ -0,0 +1,130 @@
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from apc import config
+
+if TYPE_CHECKING:
+  # config_cache imports TROPHY_TIERS from here
+  from apc.config_cache import ConfigCache
+
+TROPHY_TIERS = ["bronze", "silver", "gold", "diamond"]
+# trophy codes returned by `classify_trophies`, indexes into TROPHY_NAMES
+NO_TROPHY = 0
+DIAMOND_TROPHY = 4
+GREAT_ONE_TROPHY = 5
+UNKNOWN_TROPHY = 6
+TROPHY_NAMES = ["NONE", "BRONZE", "SILVER", "GOLD", "DIAMOND", "GREATONE", "UNKNOWN"]
+MALE = 1
+FEMALE = 2
+
+_thresholds: dict[str, 'SpeciesThresholds'] = None
+
+def _round_weight(weights: np.ndarray) -> np.ndarray:
+  return np.where(weights > 10, np.round(weights, 2), np.round(weights, 3))
+
+class SpeciesThresholds:
+  '''
+  Level bounds, trophy score bounds and diamond rules for one species compiled into NumPy arrays.
+  Trophy tiers in the species config are ascending and do not overlap, so both lookups are a `np.searchsorted`.
+  Built from the typed tables of `config.compiled_config()`.
+  '''
+  def __init__(self, species_key: str, compiled: "ConfigCache") -> None:
+    self.species_key = species_key
+    levels = compiled.levels(species_key).tolist()
+    self.level_count = len(levels)
+    # an animal reaches level i+1 when its weight is above the lower of the two bounds, the last level reached wins
+    level_bounds = np.array([min(low, round(high, 2) if high > 10 else round(high, 3)) for low, high in levels], dtype=np.float64)
+    self.level_bounds = np.minimum.accumulate(level_bounds[::-1])[::-1]
+    # rows of weight_low, weight_high, score_low, score_high, NaN for the tiers the species does not have
+    trophy_bounds = compiled.trophy_bounds(species_key)
+    tiers = np.flatnonzero(~np.isnan(trophy_bounds[:, 2]))
+    self.trophy_codes = (tiers + 1).astype(np.int8)
+    self.trophy_lows = trophy_bounds[tiers, 2].copy()
+    self.trophy_highs = trophy_bounds[tiers, 3].copy()
+    diamond_score = trophy_bounds[TROPHY_TIERS.index("diamond"), 2]
+    self.diamond_score = config.HIGH_NUMBER if np.isnan(diamond_score) else float(diamond_score)
+    self.diamond_gender = config.get_diamond_gender(species_key)
+
+  def levels(self, weights: np.ndarray, great_ones: np.ndarray = None) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
+    if not self.level_count:
+      levels = np.zeros(weights.shape, dtype=np.int8)
+    else:
+      levels = np.maximum(np.searchsorted(self.level_bounds, _round_weight(weights), side="left"), 1).astype(np.int8)
+    if great_ones is not None:
+      levels[np.asarray(great_ones, dtype=bool)] = 10
+    return levels
+
+  def trophies(self, scores: np.ndarray, great_ones: np.ndarray = None) -> np.ndarray:
+    scores = np.asarray(scores, dtype=np.float64)
+    trophies = np.full(scores.shape, NO_TROPHY, dtype=np.int8)
+    if self.trophy_codes.size:
+      tier = np.searchsorted(self.trophy_lows, scores, side="right") - 1
+      in_tier = (tier >= 0) & (scores <= self.trophy_highs[tier])
+      trophies[in_tier] = self.trophy_codes[tier[in_tier]]
+    if great_ones is not None:
+      trophies[np.asarray(great_ones, dtype=bool)] = GREAT_ONE_TROPHY
+    return trophies
+
+  def diamonds(self, genders: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    '''`genders` uses the file encoding: 1 for males and 2 for females'''
+    genders = np.asarray(genders)
+    scores = np.asarray(scores, dtype=np.float64)
+    if self.diamond_gender == "both":
+      gender_ok = np.ones(genders.shape, dtype=bool)
+    elif self.diamond_gender == "male":
+      gender_ok = genders == MALE
+    elif self.diamond_gender == "female":
+      gender_ok = genders != MALE
+    else:
+      gender_ok = np.zeros(genders.shape, dtype=bool)
+    return gender_ok & (scores >= self.diamond_score)
+
+def _compile() -> dict[str, SpeciesThresholds]:
+  global _thresholds
+  compiled = config.compiled_config()
+  _thresholds = {species_key: SpeciesThresholds(species_key, compiled) for species_key in compiled.species_keys}
+  logger.debug(f"Compiled thresholds for {len(_thresholds)} species")
+  return _thresholds
+
+def get_thresholds(species_key: str) -> SpeciesThresholds | None:
+  thresholds = _thresholds if _thresholds is not None else _compile()
+  return thresholds.get(species_key)
+
+def gender_code(gender: str) -> int:
+  return MALE if gender == "male" else FEMALE
+
+def classify_levels(species_key: str, weights: np.ndarray, great_ones: np.ndarray = None) -> np.ndarray:
+  if (thresholds := get_thresholds(species_key)) is None:
+    return np.zeros(np.shape(weights), dtype=np.int8)
+  return thresholds.levels(weights, great_ones)
+
+def classify_trophies(species_key: str, scores: np.ndarray, great_ones: np.ndarray = None) -> np.ndarray:
+  if (thresholds := get_thresholds(species_key)) is None:
+    trophies = np.full(np.shape(scores), UNKNOWN_TROPHY, dtype=np.int8)
+    if great_ones is not None:
+      trophies[np.asarray(great_ones, dtype=bool)] = GREAT_ONE_TROPHY
+    return trophies
+  return thresholds.trophies(scores, great_ones)
+
+def classify_diamonds(species_key: str, genders: np.ndarray, scores: np.ndarray) -> np.ndarray:
+  if (thresholds := get_thresholds(species_key)) is None:
+    return np.zeros(np.shape(scores), dtype=bool)
+  return thresholds.diamonds(genders, scores)
+
+def trophy_name(trophy: int) -> str:
+  return getattr(config, TROPHY_NAMES[trophy])
+
+def find_level(species_key: str, weight: float) -> int:
+  return int(classify_levels(species_key, np.array([weight]))[0])
+
+def find_trophy(species_key: str, score: float, great_one: bool = False) -> str:
+  return trophy_name(classify_trophies(species_key, np.array([score]), np.array([great_one]))[0])
+
+def is_diamond(species_key: str, gender: str, score: float) -> bool:
+  return bool(classify_diamonds(species_key, np.array([gender_code(gender)]), np.array([score]))[0])
@@ -6,6 +6,7 @@ import random
 import re
 import struct
 
+import numpy as np
 from rich.table import Table
 
 
@@ -42,6 +43,20 @@ def update_float(data_bytes: bytearray, offset: int, new_value: float) -> None:
     for i in range(0, 4):
         data_bytes[offset + i] = hex_float[i]
 
+def update_values(data_bytes: bytearray, offsets: list[int], new_values: list, dtype: np.dtype) -> None:
+    '''
+    Write many values of the same type with one NumPy assignment.
+    The values are cast to `dtype` and scattered byte by byte so offsets do not need to be aligned.
+    '''
+    dtype = np.dtype(dtype).newbyteorder("<")
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if offsets.size == 0:
+        return
+    value_bytes = np.ascontiguousarray(np.asarray(new_values).astype(dtype)).view(np.uint8).reshape(-1, dtype.itemsize)
+    view = np.frombuffer(data_bytes, dtype=np.uint8)
+    view[offsets[:, None] + np.arange(dtype.itemsize)] = value_bytes
+    del view  # release the export so the bytearray can still be resized
+
 def format_key(key: str) -> str:
   key = [s.capitalize() for s in re.split("_|-", key)]
   return " ".join(key)
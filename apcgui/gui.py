@@ -14,10 +14,12 @@ import FreeSimpleGUI as sg
 import requests
 from packaging.version import Version as package_version
 
-from apc import adf, config, populations, utils
+from apc import adf, config, populations, thresholds
 from apc.config import BACKUP_DIR_PATH, MOD_DIR_PATH, Strategy
 from apc.logging_config import get_logger
 from apcgui import logo
+from apcgui.jobs import Job, JobRunner
+from apcgui.tables import AnimalTableModel
 
 logger = get_logger(__name__)
 __version__ = version("apc-revived")
@@ -27,6 +29,7 @@ MEDIUM_FONT = "_ 13"
 BUTTON_FONT = "_ 13"
 SMALL_FONT = "_ 11"
 window = None
+jobs: JobRunner = None
 MESSAGE_DELAY = 0.5
 VIEW_MODDED = f"({config.VIEWING_MODDED})"
 VIEW_MOD_LOADED = f"({config.VIEWING_LOADED_MOD})"
@@ -34,6 +37,14 @@ VIEW_MOD_LOADED = f"({config.VIEWING_LOADED_MOD})"
 RESERVE_COLUMNS = None
 SPECIES_COLUMNS = None
 
+# events that only change the view and are still handled while a job is running
+IDLE_EVENTS = (
+  "gender_section_symbol", "gender_section_title",
+  "trophy_section_symbol", "trophy_section_title",
+  "fur_male_section_symbol", "fur_male_section_title",
+  "fur_female_section_symbol", "fur_female_section_title",
+)
+
 symbol_closed = "►"
 symbol_open = "▼"
 
@@ -158,7 +169,7 @@ def _show_popup_message(message: str, delay: bool = True) -> str:
     time.sleep(MESSAGE_DELAY)
 
 def _show_export_popup(reserve: str, file: Path) -> str:
-  default_path = config.EXPORTS_PATH / file
+  default_path = config.ensure_dir(config.EXPORTS_PATH) / file
   layout = [
     [sg.T(f"{config.EXPORT_MSG}:", font=DEFAULT_FONT, p=(0,10))],
     [sg.FileSaveAs(f"{config.EXPORT_AS}...", initial_folder=config.EXPORTS_PATH, font=DEFAULT_FONT, target="export_path", k="export_btn", enable_events=True, change_submits=True), sg.T(default_path, k="export_path")],
@@ -183,7 +194,7 @@ def _show_export_popup(reserve: str, file: Path) -> str:
 def _show_import_popup(reserve: str, file: str) -> str:
   layout = [
     [sg.T(f"{config.IMPORT_MSG}:", font=DEFAULT_FONT, p=(0,10))],
-    [sg.FileBrowse(config.SELECT_FILE, initial_folder=config.EXPORTS_PATH, font=DEFAULT_FONT, target="import_path", k="import_btn"), sg.T(file, k="import_path")],
+    [sg.FileBrowse(config.SELECT_FILE, initial_folder=config.ensure_dir(config.EXPORTS_PATH), font=DEFAULT_FONT, target="import_path", k="import_btn"), sg.T(file, k="import_path")],
     [sg.Push(), sg.Button(config.CANCEL, k="cancel", font=DEFAULT_FONT), sg.Button(config.IMPORT, k="import", font=DEFAULT_FONT)]
   ]
   window = sg.Window(f"{config.IMPORT_MOD}: {reserve}", layout, modal=True, icon=logo.value)
@@ -251,7 +262,8 @@ def _disable_great_one_parties(window: sg.Window, reserve_key: str) -> None:
   window["great_one_party"].update(disabled=(not great_one_species))
   window["great_one_party_percent"].update(value=0)
 
-def _load_reserve_description(window: sg.Window, values: dict, reserve_key: str, force_reload: bool = True) -> adf.LoadedReserve:
+def _load_reserve_description(window: sg.Window, values: dict, reserve_key: str, force_reload: bool = True, then: Callable[[adf.LoadedReserve], None] = None) -> None:
+  '''Load the reserve on a worker thread and show it, `then` is called with the loaded reserve on the GUI thread'''
   _progress(0)
   is_modded = values["load_modded"]
   window["modded_reserves"].update(is_modded)
@@ -267,13 +279,17 @@ def _load_reserve_description(window: sg.Window, values: dict, reserve_key: str,
     or loaded_reserve.modded != is_modded
     or force_reload
   )
-  if should_load:
-    try:
-      loaded_reserve = _load_reserve(window, reserve_key, is_modded=is_modded, show_progress=True)
-    except Exception as ex:
-      _show_error(ex, delay=False)
+  if not should_load:
+    if then is not None:
+      then(loaded_reserve)
+    return
+
+  def loaded(job: Job) -> None:
+    loaded_reserve = job.result
+    if job.error is not None:
+      if isinstance(job.error, adf.FileNotFound):
+        _show_file_not_found(reserve_key, job.error)
       _reset_reserve_description(window)
-      loaded_reserve = None
     if loaded_reserve is not None:
       _disable_great_one_parties(window, reserve_key)
       window["diamond_party"].update(disabled=False)
@@ -290,46 +306,71 @@ def _load_reserve_description(window: sg.Window, values: dict, reserve_key: str,
       _show_message(f"{config.ANIMALS_LOADED}{f' ({config.MODDED})' if loaded_reserve.modded else ''}: {reserve_key}")
       _show_message("", delay=False)
       _progress(0)
-    else:
-      _reset_reserve_description(window)
-  window["reserve"].metadata = loaded_reserve
+    window["reserve"].metadata = loaded_reserve
+    if loaded_reserve is not None and then is not None:
+      then(loaded_reserve)
 
-def _load_reserve(window: sg.Window, reserve_key: str, is_modded: bool = False, show_progress: bool = False) -> adf.LoadedReserve:
-  if show_progress:
-    _progress(0)
-    _clear_message()
-  try:
-    loaded_reserve = adf.LoadedReserve(reserve_key, is_modded)
-    modded_text = f" ({config.MODDED})" if is_modded else ""
-    if show_progress:
-      _show_message(f"{config.LOADING_ANIMALS}{modded_text}: {loaded_reserve.reserve_key}  [{loaded_reserve.filename}]")
-      _progress(50)
-    loaded_reserve.parse()
-    if show_progress:
-      _progress(75)
-  except adf.FileNotFound as ex:
-    if str(ex).startswith(config.FILE_NOT_FOUND):
-      error_message = f"{config.FILE_NOT_FOUND}: {config.get_population_file_name(reserve_key)}"
-    else:
-      error_message = ex
-    _show_error(ex, delay=False)
-    _show_popup_message(error_message)
-    return None
-  loaded_reserve.population_description, loaded_reserve.species_groups = populations.describe_reserve(reserve_key, loaded_reserve.parsed_adf.adf)
+  _clear_message()
+  _start_job(f"load {reserve_key}", lambda job: _read_reserve(reserve_key, is_modded, job=job), loaded)
+
+def _read_reserve(reserve_key: str, is_modded: bool = False, job: Job = None) -> adf.LoadedReserve:
+  '''Parse and describe the reserve without touching the window, safe to run on a worker thread'''
+  loaded_reserve = adf.LoadedReserve(reserve_key, is_modded)
+  modded_text = f" ({config.MODDED})" if is_modded else ""
+  if job is not None:
+    job.message(f"{config.LOADING_ANIMALS}{modded_text}: {loaded_reserve.reserve_key}  [{loaded_reserve.filename}]")
+    job.progress(50)
+  loaded_reserve.parse()
+  if job is not None:
+    job.progress(75)
+  _describe_reserve(loaded_reserve)
   # loaded_reserve.describe_reserve()
   all_species_counts = _parse_all_species_counts(loaded_reserve)
   total_animals = sum([count["total"] for count in all_species_counts.values()])
   logger.debug(f"{reserve_key} total animals: {total_animals}")
   logger.debug(f"{reserve_key} total size: {loaded_reserve.parsed_adf.decompressed.org_size}")
-  if show_progress:
-    _progress(90)
+  if job is not None:
+    job.progress(90)
   return loaded_reserve
 
+def _show_file_not_found(reserve_key: str, ex: adf.FileNotFound) -> None:
+  if str(ex).startswith(config.FILE_NOT_FOUND):
+    error_message = f"{config.FILE_NOT_FOUND}: {config.get_population_file_name(reserve_key)}"
+  else:
+    error_message = ex
+  _show_error(ex, delay=False)
+  _show_popup_message(error_message)
+
+def _load_reserve(window: sg.Window, reserve_key: str, is_modded: bool = False) -> adf.LoadedReserve:
+  try:
+    return _read_reserve(reserve_key, is_modded)
+  except adf.FileNotFound as ex:
+    _show_file_not_found(reserve_key, ex)
+    return None
+
+def _describe_reserve(loaded_reserve: adf.LoadedReserve) -> None:
+  '''Describe the reserve from its in-memory data, modding already saved and re-parsed it so there is nothing to reload'''
+  loaded_reserve.population_description, loaded_reserve.species_groups = populations.describe_reserve(loaded_reserve.reserve_key, loaded_reserve.parsed_adf.adf, reserve_data=loaded_reserve.parsed_adf.decompressed.data)
+
+def _show_modded_reserve(window: sg.Window, loaded_reserve: adf.LoadedReserve, message: str) -> None:
+  window["reserve"].metadata = loaded_reserve
+  window["reserve_description"].update(_highlight_values(_format_reserve_description(loaded_reserve.population_description)))
+  window["modded_label"].update(VIEW_MODDED)
+  _progress(100)
+  _show_message(message)
+  _progress(0)
+  window["load_modded"].update(value=True)
+  window["modded_reserves"].update(value=True)
+  window["show_animals"].update(disabled=True)
+  window["update_animals"].update(disabled=True)
+  window["fur_update_animals"].update(disabled = True)
+
 def _show_species_description(window: sg.Window, reserve_key: str, species_key: str, is_modded: bool, is_top: bool) -> None:
   is_loaded_mod = _is_reserve_mod_loaded(reserve_key, window)
   window["reserve_description"].update(visible=False)
   window["modding"].update(visible=False)
   window["species_description"].update(visible=True)
+  window["species_pager"].update(visible=True)
   window["show_reserve"].update(visible=True)
   window["exploring"].update(visible=True)
   window["exploring"].metadata = (-1, True)
@@ -344,6 +385,7 @@ def _show_reserve_description(window: sg.Window, values: dict, reserve_key: str)
     window["reserve_description"].update(visible=True)
     window["modding"].update(visible=True)
     window["species_description"].update(visible=False)
+    window["species_pager"].update(visible=False)
     window["show_reserve"].update(visible=False)
     window["exploring"].update(visible=False)
     window["exploring"].metadata = (-1, True)
@@ -369,6 +411,7 @@ def _show_reserve_description(window: sg.Window, values: dict, reserve_key: str)
 
 def _show_mod_list(window: sg.Window) -> None:
   window["reserve_description"].update(visible=False)
+  window["species_pager"].update(visible=False)
   window["mod_list"].update(visible=True)
   window["show_reserve"].update(visible=True)
   window["mod_tab"].update(disabled=True)
@@ -473,56 +516,82 @@ def _clear_furs(window: sg.Window) -> None:
   window["diamond_furs"].update(values=[])
   window["diamond_gender"].update("")
 
-def _mod_furs(window: sg.Window, male_fur_keys: list[str], female_fur_keys: list[str], male_fur_cnt: int, female_fur_cnt: int):
-  loaded_reserve: adf.LoadedReserve = window["reserve"].metadata
-  species_key = window["species_name"].metadata
-  logger.debug(f'Modding Furs: {loaded_reserve.reserve_key} - {species_key} - "furs" - {male_fur_keys} - {male_fur_cnt} - {female_fur_keys} - {female_fur_cnt}')
-  _progress(25)
-  try:
-    populations.mod_furs(loaded_reserve, species_key, male_fur_keys, female_fur_keys, male_fur_cnt, female_fur_cnt, progress_bar=window["progress"], message_box=window["message_box"])
-    _progress(50)
-    loaded_reserve = _load_reserve(window, loaded_reserve.reserve_key, is_modded=True, show_progress=False)
-  except Exception as ex:
-    _show_error(ex)
-    return
-  _progress(75)
-  window["reserve"].metadata = loaded_reserve
-  window["reserve_description"].update(select_rows = [])
-  window["load_modded"].update(True)
-  window["modded_label"].update(VIEW_MODDED)
-  window["fur_update_animals"].update(disabled = True)
-  window["show_animals"].update(disabled=True)
-  window["update_animals"].update(disabled=True)
-  window["modded_reserves"].update(True)
-  _progress(100)
-  _show_message(f"{config.get_species_name(species_key)} (Update Furs) {config.SAVED}: \"{MOD_DIR_PATH / loaded_reserve.filename}\"")
+def _start_job(name: str, work: Callable[[Job], object], on_done: Callable[[Job], None] = None, cancellable: bool = False) -> bool:
+  '''Run `work` on a worker thread, `on_done` is called on the GUI thread whether the job finished, failed or was cancelled'''
+  global jobs
+  if jobs.busy:
+    _show_message(config.STILL_WORKING)
+    return False
   _progress(0)
-  _reset_furs(window)
-  _clear_furs(window)
 
-def _mod_diamonds(window: sg.Window, species_key: str, diamond_cnt: int, male_fur_keys: list[str], female_fur_keys: list[str]) -> None:
+  def done(job: Job) -> None:
+    if on_done is not None:
+      on_done(job)
+    if job.error is not None:
+      _progress(0)
+      _show_message(f"{config.ERROR}: {job.error}")
+    elif job.cancelled:
+      _progress(0)
+      _show_message(config.CANCELLED)
+
+  jobs.start(name, work, done, cancellable=cancellable)
+  return True
+
+def _report_error(job: Job, ex: Exception) -> None:
+  logger.error("ERROR", exc_info=True)
+  job.message(f"{config.ERROR}: {ex}")
+
+def _run_mods(window: sg.Window, name: str, mods: Callable[[Job, adf.LoadedReserve], None], label: str, then: Callable[[Job], None] = None, cancellable: bool = False) -> None:
+  '''
+  Apply `mods` to the loaded reserve on a worker thread inside one edit session.
+  The reserve is saved and described once at the end, also when the job is cancelled part way through.
+  '''
   loaded_reserve: adf.LoadedReserve = window["reserve"].metadata
+  saved = False
+
+  def work(job: Job) -> None:
+    nonlocal saved
+    loaded_reserve.begin()
+    try:
+      mods(job, loaded_reserve)
+    finally:
+      saved = loaded_reserve.commit()
+      if saved:
+        _describe_reserve(loaded_reserve)
+
+  def done(job: Job) -> None:
+    if saved:
+      _show_modded_reserve(window, loaded_reserve, f"{label} {config.SAVED}: \"{MOD_DIR_PATH / loaded_reserve.filename}\"")
+    if then is not None:
+      then(job)
+
+  _start_job(name, work, done, cancellable=cancellable)
+
+def _mod_furs(job: Job, loaded_reserve: adf.LoadedReserve, species_key: str, male_fur_keys: list[str], female_fur_keys: list[str], male_fur_cnt: int, female_fur_cnt: int) -> None:
+  logger.debug(f'Modding Furs: {loaded_reserve.reserve_key} - {species_key} - "furs" - {male_fur_keys} - {male_fur_cnt} - {female_fur_keys} - {female_fur_cnt}')
+  job.progress(25)
+  populations.mod_furs(loaded_reserve, species_key, male_fur_keys, female_fur_keys, male_fur_cnt, female_fur_cnt, progress=job.reporter)
+
+def _update_furs(window: sg.Window, male_fur_keys: list[str], female_fur_keys: list[str], male_fur_cnt: int, female_fur_cnt: int) -> None:
   species_key = window["species_name"].metadata
+
+  def furs_updated(job: Job) -> None:
+    window["reserve_description"].update(select_rows = [])
+    _reset_furs(window)
+    _clear_furs(window)
+
+  _run_mods(
+    window,
+    f"furs {species_key}",
+    lambda job, loaded_reserve: _mod_furs(job, loaded_reserve, species_key, male_fur_keys, female_fur_keys, male_fur_cnt, female_fur_cnt),
+    f"{config.get_species_name(species_key)} (Update Furs)",
+    then=furs_updated,
+  )
+
+def _mod_diamonds(job: Job, loaded_reserve: adf.LoadedReserve, species_key: str, diamond_cnt: int, male_fur_keys: list[str], female_fur_keys: list[str]) -> None:
   logger.info(f'Modding Diamonds: {loaded_reserve.reserve_key} - {species_key} "diamonds" - {diamond_cnt} - {male_fur_keys} - {female_fur_keys}')
-  _progress(25)
-  try:
-    populations.mod_diamonds(loaded_reserve, species_key, diamond_cnt, male_fur_keys, female_fur_keys, progress_bar=window["progress"], message_box=window["message_box"])
-    _progress(50)
-    loaded_reserve = _load_reserve(window, loaded_reserve.reserve_key, is_modded=True, show_progress=False)
-  except Exception as ex:
-    _show_error(ex)
-    return
-  _progress(75)
-  window["reserve"].metadata = loaded_reserve
-  window["reserve_description"].update(_highlight_values(_format_reserve_description(loaded_reserve.population_description)))
-  window["modded_label"].update(VIEW_MODDED)
-  _progress(100)
-  _show_message(f"{config.get_species_name(species_key)} (Diamonds) {config.SAVED}: \"{MOD_DIR_PATH / loaded_reserve.filename}\"")
-  _progress(0)
-  window["show_animals"].update(disabled=True)
-  window["update_animals"].update(disabled=True)
-  window["modded_reserves"].update(True)
-  window["fur_update_animals"].update(disabled = True)
+  job.progress(25)
+  populations.mod_diamonds(loaded_reserve, species_key, diamond_cnt, male_fur_keys, female_fur_keys, progress=job.reporter)
 
 def _mod_animals(window: sg.Window, values: dict, species_key: str, animal_details: AnimalDetails, adf_animals: list[adf.AdfAnimal]) -> None:
   selected_reserve_keys = list({a.reserve_key for a in adf_animals})
@@ -550,14 +619,14 @@ def _mod_animals(window: sg.Window, values: dict, species_key: str, animal_detai
   loaded_reserve: adf.LoadedReserve = window["reserve"].metadata
   if loaded_reserve.reserve_key in selected_reserve_keys:
     try:
-      window["reserve"].metadata = _load_reserve(window, loaded_reserve.reserve_key, is_modded=True, show_progress=False)
+      window["reserve"].metadata = _load_reserve(window, loaded_reserve.reserve_key, is_modded=True)
     except Exception as ex:
       _show_error(ex)
 
 def _mod_reserve_animals(window: sg.Window, values: dict, reserve_key: str, species_key: str, animal_details: AnimalDetails, adf_animals: list[adf.AdfAnimal], count: int, total: int) -> int:
   progress_per_animal = 100/total
   is_modded = _viewing_modded(window)
-  if (loaded_reserve := _load_reserve(window, reserve_key, is_modded=is_modded, show_progress=False)):
+  if (loaded_reserve := _load_reserve(window, reserve_key, is_modded=is_modded)):
     for adf_animal in adf_animals:
       try:
         weight = animal_details.weight if values["animal_weight_checkbox"] else adf_animal.weight
@@ -577,57 +646,62 @@ def _mod_reserve_animals(window: sg.Window, values: dict, reserve_key: str, spec
   _show_message(f'{config.get_species_name(species_key)} ({config.UPDATE_ANIMALS}) {config.SAVED}: "{MOD_DIR_PATH / loaded_reserve.filename}"')
   return count
 
-def _mod(window: sg.Window, species_key: str, strategy: Strategy, modifier: int, rares: bool = False, percentage: bool = False, party: bool = False) -> None:
-  loaded_reserve: adf.LoadedReserve = window["reserve"].metadata
+def _mod(job: Job, loaded_reserve: adf.LoadedReserve, species_key: str, strategy: Strategy, modifier: int, rares: bool = False, percentage: bool = False, party: bool = False) -> None:
   logger.debug((loaded_reserve.reserve_key, species_key, strategy.value, modifier, rares))
-  # _progress(25)
-  try:
-    populations.mod(loaded_reserve, species_key, strategy.value, rares=rares, modifier=modifier, percentage=percentage, party=party, progress_bar=window["progress"], message_box=window["message_box"])
-    # _progress(50)
-    loaded_reserve = _load_reserve(window, loaded_reserve.reserve_key, is_modded=True, show_progress=True)
-  except Exception as ex:
-    _show_error(ex)
-    return
-  # _progress(75)
-  window["reserve"].metadata = loaded_reserve
-  window["reserve_description"].update(_highlight_values(_format_reserve_description(loaded_reserve.population_description)))
-  window["modded_label"].update(VIEW_MODDED)
-  _progress(100)
-  _show_message(f"{config.get_species_name(species_key)} ({utils.format_key(strategy)}) {config.SAVED}: \"{MOD_DIR_PATH / loaded_reserve.filename}\"")
-  _progress(0)
-  window["load_modded"].update(value=True)
-  window["modded_reserves"].update(value=True)
-  window["show_animals"].update(disabled=True)
-  window["update_animals"].update(disabled=True)
-  window["modded_reserves"].update(True)
-  window["fur_update_animals"].update(disabled = True)
+  populations.mod(loaded_reserve, species_key, strategy.value, rares=rares, modifier=modifier, percentage=percentage, party=party, progress=job.reporter)
 
-def _mod_animal_count(window: sg.Window, species_key: str, animal_count: int, gender: str) -> None:
-  loaded_reserve: adf.LoadedReserve = window["reserve"].metadata
+def _mod_animal_count(job: Job, loaded_reserve: adf.LoadedReserve, species_key: str, animal_count: int, gender: str) -> None:
   logger.debug(f"{'Adding' if animal_count > 0 else 'Removing'} {abs(animal_count)} {gender} {species_key} {'to' if animal_count > 0 else 'from'} {loaded_reserve.reserve_key}")
-  _show_message(f"{'Adding' if animal_count > 0 else 'Removing'} {abs(animal_count)} {config.MALE if gender == "male" else config.FEMALE} {config.get_species_name(species_key)} {'to' if animal_count > 0 else 'from'} {loaded_reserve.reserve_key}")
-  _progress(0)
-  populations.mod_animal_cnt(loaded_reserve, species_key, animal_count, gender, progress_bar=window["progress"], message_box=window["message_box"])
-  loaded_reserve = _load_reserve(window, loaded_reserve.reserve_key, is_modded=True, show_progress=True)
-  # except Exception as ex:
-    # _show_error(ex)
-    # return
-  window["reserve"].metadata = loaded_reserve
-  window["reserve_description"].update(_highlight_values(_format_reserve_description(loaded_reserve.population_description)))
-  window["modded_label"].update(VIEW_MODDED)
-  _progress(100)
-  _show_message(f"{config.get_species_name(species_key)} ({config.MALE if gender == "male" else config.FEMALE}) {config.SAVED}: \"{MOD_DIR_PATH / loaded_reserve.filename}\"")
-  _progress(0)
-  window["load_modded"].update(value=True)
-  window["modded_reserves"].update(value=True)
-  window["show_animals"].update(disabled=True)
-  window["update_animals"].update(disabled=True)
-  window["modded_reserves"].update(True)
-  window["fur_update_animals"].update(disabled = True)
+  job.message(f"{'Adding' if animal_count > 0 else 'Removing'} {abs(animal_count)} {config.MALE if gender == "male" else config.FEMALE} {config.get_species_name(species_key)} {'to' if animal_count > 0 else 'from'} {loaded_reserve.reserve_key}")
+  job.progress(0)
+  populations.mod_animal_cnt(loaded_reserve, species_key, animal_count, gender, progress=job.reporter)
 
-def _ensure_enough_party_gender(
+def _update_species(
   window: sg.Window,
   species_key: str,
+  species_counts: dict,
+  male_value: int,
+  female_value: int,
+  great_one_value: int,
+  diamond_value: int,
+  male_use_furs: list[str],
+  female_use_furs: list[str],
+  add_remove_animals: bool,
+) -> None:
+  great_one_enabled = _is_great_one_enabled(window, great_one_value)
+  diamond_enabled = _is_diamond_enabled(window, diamond_value)
+
+  def update(job: Job, loaded_reserve: adf.LoadedReserve) -> None:
+    if male_value != species_counts["male"]:
+      if add_remove_animals:
+        _mod_animal_count(job, loaded_reserve, species_key, male_value - species_counts["male"], "male")
+      elif male_value > species_counts["male"]:
+        logger.debug("modding males")
+        _mod(job, loaded_reserve, species_key, Strategy.males, male_value - species_counts["male"])
+    if female_value != species_counts["female"]:
+      if add_remove_animals:
+        _mod_animal_count(job, loaded_reserve, species_key, female_value - species_counts["female"], "female")
+      elif female_value > species_counts["female"]:
+        logger.debug("modding females")
+        _mod(job, loaded_reserve, species_key, Strategy.females, female_value - species_counts["female"])
+    if great_one_enabled:
+      logger.debug("modding great_one")
+      _mod(job, loaded_reserve, species_key, Strategy.great_one_some, great_one_value)
+    if diamond_enabled:
+      logger.debug("modding diamonds")
+      _mod_diamonds(job, loaded_reserve, species_key, diamond_value, male_use_furs, female_use_furs)
+
+  def updated(job: Job) -> None:
+    _disable_new_reserve(window)
+    _reset_mod(window)
+    _clear_furs(window)
+
+  _run_mods(window, f"update {species_key}", update, config.get_species_name(species_key), then=updated)
+
+def _ensure_enough_party_gender(
+  job: Job,
+  loaded_reserve: adf.LoadedReserve,
+  species_key: str,
   counts: dict,
   target_gender: str,
   party_key: str,
@@ -659,11 +733,11 @@ def _ensure_enough_party_gender(
       f"Not enough {target_gender} {species_key} to create {display_name}. "
       f"Converting {gender_deficit} {"females" if target_gender == "male" else "males"} to {target_gender}s"
     )
-    _show_message(f"{party_name}! {config.get_species_name(species_key)}: {gender_text} x {gender_deficit}", delay=False)
+    job.message(f"{party_name}! {config.get_species_name(species_key)}: {gender_text} x {gender_deficit}")
     try:
-      _mod(window, species_key, strategy_enum, gender_deficit, party=True)
+      _mod(job, loaded_reserve, species_key, strategy_enum, gender_deficit, party=True)
     except populations.NoAnimalsException as ex:
-      _show_error(ex)
+      _report_error(job, ex)
 
 def _run_party(
   window: sg.Window,
@@ -684,26 +758,34 @@ def _run_party(
   mod_percent = int(values[f"{party_key}_party_percent"])
   if mod_percent <= 0:
     return
-  for species_data in loaded_reserve.population_description:
-    species_counts = _parse_species_counts(window, values, species_data=species_data)
-    species_key = species_counts["species_key"]
-    if (gender := gender_func(species_key)) is None:
-      continue
-    goal_count = int(species_counts["total"] * mod_percent / 100)
-    current_count = species_counts[party_key]
-    animals_to_mod = goal_count - current_count
-    if animals_to_mod <= 0:
-      _show_message(f"{party_name}! {config.get_species_name(species_key)}: {more_display_name} x 0")
-      continue
-    _ensure_enough_party_gender(window, species_key, species_counts, gender, party_key, party_name, display_name, animals_to_mod)
-    logger.info(f"Converting {animals_to_mod} {gender} {species_key} to {display_name}s")
-    _show_message(f"{party_name}! {config.get_species_name(species_key)}: {more_display_name} x {animals_to_mod}", delay=False)
-    try:
-      _mod(window, species_key, strategy_enum, animals_to_mod, party=True)
-    except populations.NoAnimalsException as ex:
-      _show_error(ex)
-  _show_message(f"{mod_percent}% {complete_suffix}")
-  _disable_new_reserve(window)
+
+  def party(job: Job, loaded_reserve: adf.LoadedReserve) -> None:
+    for species_data in loaded_reserve.population_description:
+      job.check()
+      species_counts = _parse_species_counts(window, values, species_data=species_data)
+      species_key = species_counts["species_key"]
+      if (gender := gender_func(species_key)) is None:
+        continue
+      goal_count = int(species_counts["total"] * mod_percent / 100)
+      current_count = species_counts[party_key]
+      animals_to_mod = goal_count - current_count
+      if animals_to_mod <= 0:
+        job.message(f"{party_name}! {config.get_species_name(species_key)}: {more_display_name} x 0")
+        continue
+      _ensure_enough_party_gender(job, loaded_reserve, species_key, species_counts, gender, party_key, party_name, display_name, animals_to_mod)
+      logger.info(f"Converting {animals_to_mod} {gender} {species_key} to {display_name}s")
+      job.message(f"{party_name}! {config.get_species_name(species_key)}: {more_display_name} x {animals_to_mod}")
+      try:
+        _mod(job, loaded_reserve, species_key, strategy_enum, animals_to_mod, party=True)
+      except populations.NoAnimalsException as ex:
+        _report_error(job, ex)
+
+  def party_over(job: Job) -> None:
+    if job.completed:
+      _show_message(f"{mod_percent}% {complete_suffix}")
+    _disable_new_reserve(window)
+
+  _run_mods(window, f"{party_key} party", party, party_name, then=party_over, cancellable=True)
 
 def _run_fur_party(window: sg.Window, values: dict, *, percent_key: str, party_label: str, complete_suffix: str, rare: bool = False) -> None:
   loaded_reserve: adf.LoadedReserve = window["reserve"].metadata
@@ -713,20 +795,29 @@ def _run_fur_party(window: sg.Window, values: dict, *, percent_key: str, party_l
   mod_percent = int(values[percent_key])
   if mod_percent <= 0:
     return
-  for species_data in loaded_reserve.population_description:
-    counts = _parse_species_counts(window, values, species_data=species_data)
-    species_key = counts["species_key"]
-    animals_to_mod = int((counts["total"] - counts["great_one"]) * mod_percent / 100)
-    if animals_to_mod <= 0:
-      _show_message(f"{party_label}! {config.get_species_name(species_key)} x 0")
-      continue
-    _show_message(f"{party_label}! {config.GENERATE_FUR_SEEDS}: {config.get_species_name(species_key)} x {animals_to_mod}", delay=False)
-    _mod(window, species_key, Strategy.furs_some, animals_to_mod, rares=rare)
-  _show_message(f"{mod_percent}% {complete_suffix}")
+
+  def party(job: Job, loaded_reserve: adf.LoadedReserve) -> None:
+    for species_data in loaded_reserve.population_description:
+      job.check()
+      counts = _parse_species_counts(window, values, species_data=species_data)
+      species_key = counts["species_key"]
+      animals_to_mod = int((counts["total"] - counts["great_one"]) * mod_percent / 100)
+      if animals_to_mod <= 0:
+        job.message(f"{party_label}! {config.get_species_name(species_key)} x 0")
+        continue
+      job.message(f"{party_label}! {config.GENERATE_FUR_SEEDS}: {config.get_species_name(species_key)} x {animals_to_mod}")
+      _mod(job, loaded_reserve, species_key, Strategy.furs_some, animals_to_mod, rares=rare)
+
+  def party_over(job: Job) -> None:
+    if job.completed:
+      _show_message(f"{mod_percent}% {complete_suffix}")
+
+  _run_mods(window, percent_key, party, party_label, then=party_over, cancellable=True)
 
 def _list_mods(window: sg.Window) -> list[list[str]]:
   if not MOD_DIR_PATH.exists():
-    return _show_warning(f"{MOD_DIR_PATH} {config.DOES_NOT_EXIST}.")
+    # created with the first mod
+    return []
 
   file_format = re.compile(r"^.*animal_population_\d+$")
   items = os.scandir(MOD_DIR_PATH)
@@ -759,7 +850,7 @@ def _load_mod(window: sg.Window, filename: Path) -> None:
     if not _backup_exists(filename):
       game_file = config.get_save_path() / filename.name
       if game_file.exists():
-        backup_path = _copy_file(game_file, BACKUP_DIR_PATH)
+        backup_path = _copy_file(game_file, config.ensure_dir(BACKUP_DIR_PATH))
         if not backup_path:
           _show_warning(f"{config.FAILED_TO_BACKUP} {game_file}")
           return
@@ -944,36 +1035,60 @@ def _update_mod_animal_counts(window: sg.Window, values: dict, species_counts: d
   if changing in (None, "new_male_value", "new_female_value"):
     window["gender_value"].update(value=0, range=(-male_pool, female_pool))
 
+SPECIES_DESCRIPTION_SORT = {0: "reserve", 1: "weight", 2: "gender", 3: "weight", 4: "score", 5: "fur", 6: "score"}
+
 def _sort_species_description(window, col):
-  species_description = window["species_description"].Values
-  adf_animals: list[adf.AdfAnimal] = window["species_description"].metadata
+  model: AnimalTableModel = window["species_description"].metadata
   prev_col, reverse = window["exploring"].metadata
   reverse = not reverse if prev_col == col else True
-  if col == 0:
-    logger.debug("Sorting by RESERVE")
-    species_description.sort(key=lambda x: x[0], reverse=reverse)
-    adf_animals.sort(key=lambda x: config.get_reserve_name(x.reserve_key), reverse=reverse)
-  if col in (1,3):
-    logger.debug("Sorting by WEIGHT")
-    species_description.sort(key=lambda x: x[3], reverse=reverse)
-    adf_animals.sort(key=lambda x: x.weight, reverse=reverse)
-  if col in (4,6):
-    logger.debug("Sorting by SCORE")
-    species_description.sort(key=lambda x: x[4], reverse=reverse)
-    adf_animals.sort(key=lambda x: x.score, reverse=reverse)
-  if col == 2:
-    logger.debug("Sorting by GENDER")
-    species_description.sort(key=lambda x: x[2], reverse=reverse)
-    adf_animals.sort(key=lambda x: x.gender, reverse=reverse)
-  if col == 5:
-    logger.debug("Sorting by FUR")
-    species_description.sort(key=lambda x: x[5], reverse=reverse)
-    adf_animals.sort(key=lambda x: x.fur_name, reverse=reverse)
-  window["species_description"].update(species_description)
-  window["species_description"].metadata = adf_animals
+  if model is None or (column := SPECIES_DESCRIPTION_SORT.get(col)) is None:
+    return
+  logger.debug(f"Sorting by {column.upper()}")
+  model.sort(column, reverse=reverse)
+  _show_species_page(window)
   window["exploring"].metadata = (col, reverse)
   window.refresh()
 
+def _show_species_page(window: sg.Window, page: int = None) -> None:
+  model: AnimalTableModel = window["species_description"].metadata
+  if model is None:
+    return
+  if page is not None:
+    model.go_to(page)
+  start, stop = model.page_range()
+  window["species_description"].update(model.page_rows())
+  window["species_page_info"].update(f"{start + 1 if stop else 0}-{stop} / {len(model)}")
+  window["species_page_prev"].update(disabled=model.page == 0)
+  window["species_page_next"].update(disabled=model.page >= model.page_count - 1)
+  _clear_animal_details(window)
+  _disable_animal_details(window, True)
+
+def _species_filter_values(species_key: str) -> tuple[list[str], list[str], list[str]]:
+  trophies = [thresholds.trophy_name(trophy) for trophy in range(len(thresholds.TROPHY_NAMES))]
+  profile = config.get_species_profile(species_key)
+  fur_keys = {fur_key for furs in profile.furs.values() for fur_key in furs} if profile else set()
+  furs = sorted({config.get_fur_name(fur_key) for fur_key in fur_keys})
+  return [config.ALL, config.MALE, config.FEMALE], [config.ALL, *trophies], [config.ALL, *furs, "unknown"]
+
+def _reset_species_filters(window: sg.Window, species_key: str) -> None:
+  genders, trophies, furs = _species_filter_values(species_key)
+  window["species_filter_gender"].update(value=config.ALL, values=genders)
+  window["species_filter_trophy"].update(value=config.ALL, values=trophies)
+  window["species_filter_fur"].update(value=config.ALL, values=furs)
+
+def _filter_species_description(window: sg.Window, values: dict) -> None:
+  model: AnimalTableModel = window["species_description"].metadata
+  if model is None:
+    return
+  gender = values["species_filter_gender"]
+  model.filter("gender", None if gender == config.ALL else "male" if gender == config.MALE else "female")
+  trophy = values["species_filter_trophy"]
+  trophies = window["species_filter_trophy"].Values
+  model.filter("trophy", None if trophy == config.ALL or trophy not in trophies else trophies.index(trophy) - 1)
+  fur = values["species_filter_fur"]
+  model.filter("fur", None if fur == config.ALL else fur)
+  _show_species_page(window)
+
 def _parse_animal_row(animal_description: list, species_key: str) -> AnimalDetails:
   animal_gender = animal_description[2]
   animal_weight = animal_description[3]
@@ -1029,7 +1144,7 @@ def _show_animals(
   window: sg.Window,
   values: dict,
   modded: bool = False
-) -> tuple[list[list], list[adf.AdfAnimal]]:
+) -> None:
   _progress(0)
   loaded_reserve: adf.LoadedReserve
   if not (loaded_reserve := window["reserve"].metadata):
@@ -1040,24 +1155,33 @@ def _show_animals(
     return
   is_modded = values["modded_reserves"] or modded
   is_top = values["top_scores"]
-  window["modded_label"].update(visible=False)
-  # _progress(50)
-  if values["all_reserves"]:
+  good = values["good_ones"]
+  all_reserves = values["all_reserves"]
+  if all_reserves:
     modded_text = f" ({config.MODDED})" if is_modded else ""
     _show_message(f"{config.LOADING_ANIMALS}{modded_text}: {config.get_species_name(species_key)} @ {config.LOOK_ALL_RESERVES}")
-    species_description_full = populations.find_animals(species_key, modded=is_modded, good=values["good_ones"], top=is_top, progress_bar=window["progress"])
-  else:
-    species_description_full = populations.describe_animals(loaded_reserve.reserve_key, species_key, loaded_reserve.parsed_adf.adf, good=values["good_ones"], top=is_top, precision=4)
-  _progress(90)
-  species_description = [x[0:-1] for x in species_description_full]
-  window["species_description"].update(species_description)
-  adf_animals = [x[-1] for x in species_description_full]
-  window["species_description"].metadata = adf_animals
-  _progress(100)
-  _show_species_description(window, loaded_reserve.reserve_key, species_key, is_modded, is_top)
-  _show_message(f"{config.ANIMALS_LOADED}{f' ({config.MODDED})' if loaded_reserve.modded else ''}: {config.get_species_name(species_key)}")
-  # _show_message("", delay=False)
-  _progress(0)
+
+  def find(job: Job) -> list:
+    if all_reserves:
+      return populations.find_animals(species_key, modded=is_modded, good=good, top=is_top, progress=job.reporter)
+    return populations.describe_animals(loaded_reserve.reserve_key, species_key, loaded_reserve.parsed_adf.adf, good=good, top=is_top, precision=4, table=loaded_reserve.animal_table)
+
+  def found(job: Job) -> None:
+    if not job.completed:
+      return
+    animal_rows: populations.AnimalRows = job.result
+    window["modded_label"].update(visible=False)
+    _progress(90)
+    window["species_description"].metadata = AnimalTableModel(animal_rows)
+    _reset_species_filters(window, species_key)
+    _show_species_page(window)
+    _progress(100)
+    _show_species_description(window, loaded_reserve.reserve_key, species_key, is_modded, is_top)
+    _show_message(f"{config.ANIMALS_LOADED}{f' ({config.MODDED})' if loaded_reserve.modded else ''}: {config.get_species_name(species_key)}")
+    # _show_message("", delay=False)
+    _progress(0)
+
+  _start_job(f"animals {species_key}", find, found, cancellable=all_reserves)
 
 def _parse_all_species_counts(loaded_reserve: adf.LoadedReserve) -> dict[str, dict]:
   all_species_counts = {}
@@ -1193,6 +1317,20 @@ def main_window(my_window: sg.Window = None) -> sg.Window:
               enable_click_events=True,
             )
           ],
+          [
+            sg.pin(sg.Column([[
+              sg.Button("<", k="species_page_prev", font=SMALL_FONT, disabled=True, p=((0,5),(0,0))),
+              sg.Text("", k="species_page_info", font=SMALL_FONT, p=((0,5),(0,0))),
+              sg.Button(">", k="species_page_next", font=SMALL_FONT, disabled=True, p=((0,10),(0,0))),
+              sg.Push(),
+              sg.Text(f"{config.GENDER}:", font=SMALL_FONT, p=((5,0),(0,0))),
+              sg.Combo([config.ALL], config.ALL, k="species_filter_gender", font=SMALL_FONT, s=8, readonly=True, enable_events=True),
+              sg.Text(f"{config.TROPHY_RATING}:", font=SMALL_FONT, p=((5,0),(0,0))),
+              sg.Combo([config.ALL], config.ALL, k="species_filter_trophy", font=SMALL_FONT, s=10, readonly=True, enable_events=True),
+              sg.Text(f"{config.FUR}:", font=SMALL_FONT, p=((5,0),(0,0))),
+              sg.Combo([config.ALL], config.ALL, k="species_filter_fur", font=SMALL_FONT, s=14, readonly=True, enable_events=True),
+            ]], k="species_pager", visible=False, expand_x=True, p=((0,0),(5,0))), expand_x=True),
+          ],
         ], vertical_alignment="top", expand_x=True, expand_y=True),
         sg.Column([
           [sg.Text("", key="species_name", text_color="orange", justification="right", expand_x=True, p=((5,5),(0,0)))],
@@ -1306,7 +1444,8 @@ def main_window(my_window: sg.Window = None) -> sg.Window:
         ], vertical_alignment="top")
       ],
       [
-        sg.ProgressBar(100, orientation='h', expand_x=True, s=(10,20), p=(10,5), key='progress')
+        sg.ProgressBar(100, orientation='h', expand_x=True, s=(10,20), p=(10,5), key='progress'),
+        sg.Button(config.CANCEL, k="cancel_job", disabled=True, font=SMALL_FONT, p=((0,10),5))
       ],
       [
         sg.T("", text_color="orange", k="message_box", p=(5,5))
@@ -1323,6 +1462,8 @@ def main() -> None:
   sg.theme("DarkAmber")
   global window
   window = main_window()
+  global jobs
+  jobs = JobRunner(window)
   loaded_reserve = None
   _check_for_update()
 
@@ -1333,12 +1474,22 @@ def main() -> None:
         break
 
       try:
+        if jobs.handle(event, values):
+          continue
+        if event == "cancel_job":
+          jobs.cancel()
+          continue
+        if jobs.busy and event not in IDLE_EVENTS:
+          _show_message(config.STILL_WORKING)
+          continue
         reserve_name = values.get("reserve_name")
         if event == "reserve_name" and reserve_name:
-          _load_reserve_description(window, values, config.get_reserve_key_from_name(reserve_name))
-          if window["reserve"].metadata is None:
-            continue
-          _show_reserve_description(window, values, window["reserve"].metadata.reserve_key)
+          _load_reserve_description(
+            window,
+            values,
+            config.get_reserve_key_from_name(reserve_name),
+            then=lambda loaded_reserve: _show_reserve_description(window, values, loaded_reserve.reserve_key),
+          )
         elif isinstance(event, tuple):
           row, col = event[2]
           loaded_reserve: adf.LoadedReserve = window["reserve"].metadata
@@ -1395,8 +1546,12 @@ def main() -> None:
           if not (loaded_reserve := window["reserve"].metadata):
             _show_message(config.SELECT_A_RESERVE)
             continue
-          _load_reserve_description(window, values, loaded_reserve.reserve_key)
-          _show_reserve_description(window, values, loaded_reserve.reserve_key)
+          _load_reserve_description(
+            window,
+            values,
+            loaded_reserve.reserve_key,
+            then=lambda loaded_reserve: _show_reserve_description(window, values, loaded_reserve.reserve_key),
+          )
         elif event == "details_update_animals":
           if not (species_key := window["species_name"].metadata):
             _show_message(config.SELECT_AN_ANIMAL)
@@ -1404,7 +1559,8 @@ def main() -> None:
           selected_animal_rows = window["species_description"].SelectedRows
           if len(selected_animal_rows) > 0:
             logger.debug(f"MODDING {len(selected_animal_rows)} ANIMALS")
-            selected_adf_animals = [window["species_description"].metadata[i] for i in selected_animal_rows]
+            model: AnimalTableModel = window["species_description"].metadata
+            selected_adf_animals = [model.animal(i) for i in selected_animal_rows]
             selected_animal_details = _parse_animal_details(values, species_key)
             selected_reserves = list({a.reserve_key for a in selected_adf_animals})
             logger.debug(f"{len(selected_reserves)} RESERVES")
@@ -1451,31 +1607,18 @@ def main() -> None:
 
           if not (species_counts := _parse_species_counts(window, values)):
             continue
-          try:
-            if male_value != species_counts["male"]:
-              if values["add_remove_animals"]:
-                _mod_animal_count(window, species_key, male_value - species_counts["male"], "male")
-              elif male_value > species_counts["male"]:
-                logger.debug("modding males")
-                _mod(window, species_key, Strategy.males, male_value - species_counts["male"])
-            if female_value != species_counts["female"]:
-              if values["add_remove_animals"]:
-                _mod_animal_count(window, species_key, female_value - species_counts["female"], "female")
-              elif female_value > species_counts["female"]:
-                logger.debug("modding females")
-                _mod(window, species_key, Strategy.females, female_value - species_counts["female"])
-            if _is_great_one_enabled(window, great_one_value):
-              logger.debug("modding great_one")
-              _mod(window, species_key, Strategy.great_one_some, great_one_value)
-            if _is_diamond_enabled(window, diamond_value):
-              logger.debug("modding diamonds")
-              _mod_diamonds(window, species_key, diamond_value, male_use_furs, female_use_furs)
-          except populations.NoAnimalsException as ex:
-            _show_error(ex)
-
-          _disable_new_reserve(window)
-          _reset_mod(window)
-          _clear_furs(window)
+          _update_species(
+            window,
+            species_key,
+            species_counts,
+            male_value,
+            female_value,
+            great_one_value,
+            diamond_value,
+            male_use_furs,
+            female_use_furs,
+            values["add_remove_animals"],
+          )
         elif event == "fur_update_animals":
           male_all_furs = values["male_all_furs"]
           female_all_furs = values["female_all_furs"]
@@ -1490,7 +1633,13 @@ def main() -> None:
           male_changing = (male_all_furs or len(selected_male_furs) > 0) and male_fur_cnt > 0
           female_changing = (female_all_furs or len(selected_female_furs) > 0) and female_fur_cnt > 0
           if male_changing or female_changing:
-            _mod_furs(window, selected_male_furs, selected_female_furs, male_fur_cnt, female_fur_cnt)
+            _update_furs(window, selected_male_furs, selected_female_furs, male_fur_cnt, female_fur_cnt)
+        elif event == "species_page_prev" or event == "species_page_next":
+          model: AnimalTableModel = window["species_description"].metadata
+          if model is not None:
+            _show_species_page(window, model.page + (1 if event == "species_page_next" else -1))
+        elif event in ("species_filter_gender", "species_filter_trophy", "species_filter_fur"):
+          _filter_species_description(window, values)
         elif event == "fur_reset":
           _reset_furs(window)
         elif event == "animal_reset":
@@ -1586,6 +1735,7 @@ def main() -> None:
           elif key == "switch_language":
             config.update_language(value)
             window = main_window(window)
+            jobs.window = window
         elif event in ("gender_value", "great_one_value", "diamond_value", "new_female_value", "new_male_value", "add_remove_animals"):
           if event == "add_remove_animals":
             # FreeSimpleGUI does not change the slider appearance when disabled
@@ -1624,6 +1774,7 @@ def main() -> None:
       except Exception:
         _show_error_window(traceback.format_exc())
 
+  jobs.shutdown()
   window.close()
 
 if __name__ == "__main__":
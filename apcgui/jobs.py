@@ -0,0 +1,143 @@
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+import threading
+from typing import Callable
+
+import FreeSimpleGUI as sg
+
+from apc import profiling
+from apc.progress import Progress
+
+JOB_PROGRESS = "-JOB_PROGRESS-"
+JOB_MESSAGE = "-JOB_MESSAGE-"
+JOB_DONE = "-JOB_DONE-"
+
+class JobCancelled(Exception):
+  pass
+
+class JobProgress(Progress):
+  '''
+  `Progress` for work running on a job's thread: throttled reports are posted to the window as events,
+    and every update checks whether the job has been cancelled.
+  '''
+  def __init__(self, job: "Job", rate: float = 20, step: float = 1) -> None:
+    super().__init__(on_progress=job.progress, on_message=job.message, rate=rate, step=step)
+    self.job = job
+
+  def update(self, count: int) -> None:
+    self.job.check()
+    super().update(count)
+
+class Job:
+  '''
+  A long operation running on a worker thread.
+  `work` receives the job and reports through `progress`/`message`, or hands `reporter` to `populations`,
+    which raise `JobCancelled` once the job has been cancelled.
+  `on_done` is called back on the GUI thread when the job has finished, failed or been cancelled.
+  '''
+  def __init__(self, window: sg.Window, name: str, work: Callable[["Job"], object], on_done: Callable[["Job"], None] = None, cancellable: bool = False) -> None:
+    self.window = window
+    self.name = name
+    self.work = work
+    self.on_done = on_done
+    self.cancellable = cancellable
+    self.result = None
+    self.error = None
+    self.cancelled = False
+    self.reporter = JobProgress(self)
+    self._cancel = threading.Event()
+    self._thread = threading.Thread(target=self._run, name=f"apc-{name}", daemon=True)
+
+  @property
+  def completed(self) -> bool:
+    return self.error is None and not self.cancelled
+
+  def start(self) -> None:
+    logger.debug(f"Starting job: {self.name}")
+    self._thread.start()
+
+  def join(self) -> None:
+    self._thread.join()
+
+  def cancel(self) -> None:
+    if self.cancellable:
+      self._cancel.set()
+
+  def check(self) -> None:
+    if self._cancel.is_set():
+      raise JobCancelled(self.name)
+
+  def progress(self, value: float) -> None:
+    self.check()
+    self.window.write_event_value(JOB_PROGRESS, value)
+
+  def message(self, message: str) -> None:
+    self.check()
+    self.window.write_event_value(JOB_MESSAGE, message)
+
+  def _run(self) -> None:
+    try:
+      with profiling.capture(f"job {self.name}"):
+        self.result = self.work(self)
+    except JobCancelled:
+      logger.info(f"Job cancelled: {self.name}")
+      self.cancelled = True
+    except Exception as ex:
+      logger.error(f"Job failed: {self.name}", exc_info=True)
+      self.error = ex
+    try:
+      self.window.write_event_value(JOB_DONE, self)
+    except Exception:
+      logger.debug(f"Window closed before job finished: {self.name}")
+
+class JobRunner:
+  '''
+  Runs one `Job` at a time and applies the events it posts back to the window.
+  Call `handle` first for every event read from the window.
+  '''
+  def __init__(self, window: sg.Window, progress_key: str = "progress", message_key: str = "message_box", cancel_key: str = "cancel_job") -> None:
+    self.window = window
+    self.progress_key = progress_key
+    self.message_key = message_key
+    self.cancel_key = cancel_key
+    self.job: Job = None
+
+  @property
+  def busy(self) -> bool:
+    return self.job is not None
+
+  def start(self, name: str, work: Callable[[Job], object], on_done: Callable[[Job], None] = None, cancellable: bool = False) -> Job:
+    if self.busy:
+      return None
+    self.job = Job(self.window, name, work, on_done=on_done, cancellable=cancellable)
+    self.window[self.cancel_key].update(disabled=not cancellable)
+    self.job.start()
+    return self.job
+
+  def cancel(self) -> None:
+    if self.busy:
+      self.job.cancel()
+
+  def shutdown(self) -> None:
+    '''Cancel the running job and wait for it so a save in progress is not cut short'''
+    if self.busy:
+      self.job.cancel()
+      self.job.join()
+      self.job = None
+
+  def handle(self, event: str, values: dict) -> bool:
+    if event == JOB_PROGRESS:
+      self.window[self.progress_key].update(values[event], max=100)
+    elif event == JOB_MESSAGE:
+      self.window[self.message_key].update(values[event])
+    elif event == JOB_DONE:
+      job: Job = values[event]
+      self.job = None
+      self.window[self.cancel_key].update(disabled=True)
+      if job.on_done is not None:
+        job.on_done(job)
+    else:
+      return False
+    return True
@@ -0,0 +1,110 @@
+from apc.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+import numpy as np
+
+from apc import thresholds
+from apc.adf import AdfAnimal
+from apc.populations import AnimalRows
+
+class AnimalTableModel:
+  '''
+  A page at a time of `AnimalRows` for the species table.
+  Sort orders are kept per column and direction and filter masks per value, so sorting, filtering and paging
+    again only build the display rows of the page shown.
+  Rows on the page are numbered from 0, `index`/`animal` map them back to the `AnimalRows`.
+  '''
+  def __init__(self, animal_rows: AnimalRows, page_size: int = 200) -> None:
+    self.animal_rows = animal_rows
+    self.page_size = page_size
+    self.page = 0
+    self.column: str = None
+    self.reverse = True
+    self.filters: dict[str, object] = {}
+    self._orders: dict[tuple[str, bool], np.ndarray] = {}
+    self._masks: dict[tuple[str, object], np.ndarray] = {}
+    self._mask: np.ndarray = None
+    self._view: np.ndarray = None
+
+  def __len__(self) -> int:
+    return len(self.view)
+
+  @property
+  def view(self) -> np.ndarray:
+    '''Indexes of the rows that pass the filters, in sort order'''
+    if self._view is None:
+      order = self._order()
+      self._view = order if self._mask is None else order[self._mask[order]]
+    return self._view
+
+  @property
+  def page_count(self) -> int:
+    return max(1, -(-len(self) // self.page_size))
+
+  def _order(self) -> np.ndarray:
+    # rows come sorted by `describe_animals`, that order is kept until a column is picked
+    if self.column is None:
+      return np.arange(len(self.animal_rows))
+    key = (self.column, self.reverse)
+    if (order := self._orders.get(key)) is None:
+      order = self._orders[key] = self.animal_rows.order(self.column, self.reverse)
+    return order
+
+  def sort(self, column: str, reverse: bool = True) -> None:
+    self.column = column
+    self.reverse = reverse
+    self.page = 0
+    self._view = None
+
+  def _filter_mask(self, name: str, value: object) -> np.ndarray:
+    key = (name, value)
+    if (mask := self._masks.get(key)) is None:
+      columns = self.animal_rows.columns
+      if name == "gender":
+        mask = columns["gender"] == (thresholds.MALE if value == "male" else thresholds.FEMALE)
+      elif name == "trophy":
+        mask = columns["trophy"] == value
+      elif name == "fur":
+        mask = self.animal_rows.furs() == value
+      else:
+        raise ValueError(f"Unknown filter: {name}")
+      self._masks[key] = mask
+    return mask
+
+  def filter(self, name: str, value: object = None) -> None:
+    '''
+    Show only the rows where `name` ("gender", "trophy" or "fur") is `value`, or stop filtering on `name` when `value` is None.
+    Gender is "male" or "female", trophy a `thresholds` trophy code and fur a fur name as shown.
+    '''
+    if self.filters.get(name) == value:
+      return
+    narrowing = name not in self.filters
+    if value is None:
+      del self.filters[name]
+    else:
+      self.filters[name] = value
+    if narrowing and self._mask is not None:
+      self._mask = self._mask & self._filter_mask(name, value)
+    else:
+      masks = [self._filter_mask(name, value) for name, value in self.filters.items()]
+      self._mask = np.logical_and.reduce(masks) if masks else None
+    self.page = 0
+    self._view = None
+
+  def go_to(self, page: int) -> None:
+    self.page = min(max(page, 0), self.page_count - 1)
+
+  def page_range(self) -> tuple[int, int]:
+    start = self.page * self.page_size
+    return start, min(start + self.page_size, len(self))
+
+  def page_rows(self) -> list[list]:
+    start, stop = self.page_range()
+    return self.animal_rows.rows_at(self.view[start:stop])
+
+  def index(self, page_row: int) -> int:
+    return int(self.view[self.page * self.page_size + page_row])
+
+  def animal(self, page_row: int) -> AdfAnimal:
+    return self.animal_rows.animal(self.index(page_row))
@@ -6,13 +6,15 @@
 import io
 import os
 import enum
+import json
 import struct
+import numpy as np
 from typing import List, Dict
 from io import BytesIO
 from deca.errors import *
 from deca.file import ArchiveFile
 from deca.fast_file import *
-from deca.hashes import hash32_func
+from deca.hashes import hash32_func, hash_name
 # from deca.ff_types import FTYPE_ADF_BARE, FTYPE_ADF0, FTYPE_ADF5
 
 # https://github.com/tim42/gibbed-justcause3-tools-fork/blob/master/Gibbed.JustCause3.FileFormats/AdfFile.cs
@@ -388,133 +390,150 @@ class AdfValue:
         return s
 
 
-# def hash_lookup(vfs: VfsDatabase, hash_code, default=None, prefix=''):
-#     if isinstance(hash_code, int):
-#         ele = vfs.lookup_equipment_from_hash(hash_code)
-#         if ele is not None:
-#             display_name_hash = ele["DisplayNameHash"]
-#             display_name = vfs.hash_string_match(hash32=display_name_hash)
-#             if display_name:
-#                 display_name = display_name[0][1].decode('utf-8')
-#                 display_translated = vfs.lookup_translation_from_name(display_name)
-#                 if display_translated is None:
-#                     display_translated = display_name
-#             else:
-#                 display_translated = display_name_hash
-#             return f'{prefix}# {ele["EquipmentName"].decode("utf-8")} "{display_translated}"'
-#         else:
-#             hsm = vfs.hash_string_match(hash32=hash_code)
-#             if hsm:
-#                 display_name = hsm[0][1].decode('utf-8')
-#                 return f'{prefix}# {display_name}'
-
-#     return default
+def hash_lookup(hash_code, default=None, prefix=''):
+    name = hash_name(hash_code)
+    if name is not None:
+        return f'{prefix}# {name}'
+    return default
 
 
-def adf_format(v, type_map, indent=0):
-    if isinstance(v, AdfValue):
-        type_def = type_map.get(v.type_id, TypeDef())
+def _adf_value_info(v, type_map):
+    s = '{}(0x{:08X}), Data Offset: {}(0x{:08x})'.format(
+        adf_type_id_to_str(v.type_id, type_map), v.type_id, v.data_offset, v.data_offset)
+
+    if v.bit_offset is not None:
+        s = s + '[{}]'.format(v.bit_offset)
 
-        s = ''
-        s = s + '{}(0x{:08X}), Data Offset: {}(0x{:08x})'.format(
-            adf_type_id_to_str(v.type_id, type_map), v.type_id, v.data_offset, v.data_offset)
+    if v.data_offset != v.info_offset:
+        s = s + ', Info Offset: {}(0x{:08x})'.format(v.info_offset, v.info_offset)
 
-        if v.bit_offset is not None:
-            s = s + '[{}]'.format(v.bit_offset)
+    return s
 
-        if v.data_offset != v.info_offset:
-            s = s + ', Info Offset: {}(0x{:08x})'.format(v.info_offset, v.info_offset)
 
-        value_info = s
-        s = ''
+def _adf_hash_string(v, type_def):
+    if type_def.size == 4:
+        vp = '0x{:08x}'.format(v.value)
+        hash_string = v.hash_string
+        if hash_string is None:
+            name = hash_name(v.value)
+            if name is not None:
+                hash_string = 'DB:"{}"'.format(name)
+            else:
+                hash_string = 'Hash4:0x{:08x}'.format(v.value)
+    elif type_def.size == 6:
+        vp = '0x{:012x}'.format(v.value)
+        hash_string = v.hash_string
+        if hash_string is None:
+            hash_string = 'Hash6:0x{:012x}'.format(v.value)
+    elif type_def.size == 8:
+        vp = '0x{:016x}'.format(v.value)
+        hash_string = 'Hash8:0x{:016x}'.format(v.value)
+    else:
+        vp = v.value
+        hash_string = v.hash_string
+        if hash_string is None:
+            hash_string = 'OTHER HASH {}'.format(type_def.size)
+    return hash_string, vp
+
+
+def adf_format_lines(v, type_map, indent=0):
+    """
+    The lines of `adf_format` one at a time, so a large instance can be written out as it is formatted.
+    """
+    pad = '  ' * indent
+    if isinstance(v, AdfValue):
+        type_def = type_map.get(v.type_id, TypeDef())
+        value_info = _adf_value_info(v, type_map)
         if v.type_id == 0xdefe88ed:
-            s = s + '  ' * indent + '# {}\n'.format(value_info)
-            s = s + adf_format(v.value, type_map, indent)
-        elif type_def.metatype is None or type_def.metatype == MetaType.Primative:
-            s = s + '  ' * indent + '{}  # {}\n'.format(v.value, value_info)
+            yield pad + '# {}\n'.format(value_info)
+            yield from adf_format_lines(v.value, type_map, indent)
+        elif type_def.metatype is None or type_def.metatype in {
+                MetaType.Primative, MetaType.Pointer, MetaType.String, MetaType.Bitfield}:
+            yield pad + '{}  # {}\n'.format(v.value, value_info)
         elif type_def.metatype == MetaType.Structure:
-            s = s + '  ' * indent + '# ' + value_info + '\n'
-            s = s + '  ' * indent + '{\n'
+            yield pad + '# ' + value_info + '\n'
+            yield pad + '{\n'
             for k, iv in v.value.items():
-                s = s + '  ' * (indent + 1) + k + ':\n'
-                s = s + adf_format(iv, type_map, indent + 2)
+                yield pad + '  ' + k + ':\n'
+                yield from adf_format_lines(iv, type_map, indent + 2)
                 # add details for equipment hashes
-                # if isinstance(iv.value, int) and k in adf_hash_fields:
-                if not hasattr(iv, 'value'):
-                    pass
-                # elif isinstance(iv.value, int):
-                #     hs = hash_lookup(vfs, iv.value)
-                #     if hs:
-                #         s = s + '  ' * (indent + 2) + hs + '\n'
-
-            s = s + '  ' * indent + '}\n'
-        elif type_def.metatype == MetaType.Pointer:
-            s = s + '  ' * indent + '{}  # {}\n'.format(v.value, value_info)
+                if isinstance(iv, AdfValue) and iv.type_id == typedef_u32:
+                    hs = hash_lookup(iv.value)
+                    if hs:
+                        yield pad + '    ' + hs + '\n'
+            yield pad + '}\n'
         elif type_def.metatype in {MetaType.Array, MetaType.InlineArray}:
-            s = s + '  ' * indent + '# ' + value_info + '\n'
-            s = s + '  ' * indent + '[\n'
+            yield pad + '# ' + value_info + '\n'
+            yield pad + '[\n'
             for iv in v.value:
-                s = s + adf_format(iv, type_map, indent + 1)
-            s = s + '  ' * indent + ']\n'
-        elif type_def.metatype == MetaType.String:
-            s = s + '  ' * indent + '{}  # {}\n'.format(v.value, value_info)
-        elif type_def.metatype == MetaType.Bitfield:
-            s = s + '  ' * indent + '{}  # {}\n'.format(v.value, value_info)
+                yield from adf_format_lines(iv, type_map, indent + 1)
+            yield pad + ']\n'
         elif type_def.metatype == MetaType.Enumeration:
-            s = s + '  ' * indent + '{} ({})  # {}\n'.format(v.enum_string, v.value, value_info)
+            yield pad + '{} ({})  # {}\n'.format(v.enum_string, v.value, value_info)
         elif type_def.metatype == MetaType.StringHash:
-            if type_def.size == 4:
-                vp = '0x{:08x}'.format(v.value)
-                hash_string = v.hash_string
-                if hash_string is None:
-                    # name = vfs.hash_string_match(hash32=v.value)
-                    # if len(name):
-                    #     hash_string = 'DB:"{}"'.format(name[0][1].decode('utf-8'))
-                    # else:
-                    hash_string = 'Hash4:0x{:08x}'.format(v.value)
-            elif type_def.size == 6:
-                vp = '0x{:012x}'.format(v.value)
-                hash_string = v.hash_string
-                if hash_string is None:
-                    # name = vfs.hash_string_match(hash48=v.value & 0x0000FFFFFFFFFFFF)
-                    # if len(name):
-                    #     hash_string = 'DB:"{}"'.format(name[0][1].decode('utf-8'))
-                    # else:
-                    hash_string = 'Hash6:0x{:012x}'.format(v.value)
-            elif type_def.size == 8:
-                vp = '0x{:016x}'.format(v.value)
-                hash_string = v.hash_string
-                # if hash_string is None:
-                #     name48 = vfs.hash_string_match(hash48=v.value & 0x0000FFFFFFFFFFFF)
-                #     if len(name48):
-                #         hash_string = 'DB:H6:"{}"'.format(name48[0][1].decode('utf-8'))
-                #     else:
-                #         name64 = vfs.hash_string_match(hash48=v.value)
-                #         if len(name64):
-                #             hash_string = 'DB:H6:"{}"'.format(name64[0][1].decode('utf-8'))
-                #         else:
-                hash_string = 'Hash8:0x{:016x}'.format(v.value)
-            else:
-                vp = v.value
-                hash_string = v.hash_string
-                if hash_string is None:
-                    hash_string = 'OTHER HASH {}'.format(type_def.size)
-
-            s = s + '  ' * indent + '{} ({})  # {}\n'.format(hash_string, vp, value_info)
-
-        return s
+            hash_string, vp = _adf_hash_string(v, type_def)
+            yield pad + '{} ({})  # {}\n'.format(hash_string, vp, value_info)
     elif isinstance(v, list) and len(v) > 0 and isinstance(v[0], GdcArchiveEntry):
-        s = ''
-        s = s + '  ' * indent + '[\n'
+        yield pad + '[\n'
         for ent in v:
-            comment = None #hash_lookup(vfs, ent, default='', prefix='  ')
-            s = s + '  ' * (indent + 1) + f'{ent}{comment}\n'
-        s = s + '  ' * indent + ']\n'
-
-        return s
+            comment = hash_lookup(ent, default='', prefix='  ')
+            yield pad + '  ' + f'{ent}{comment}\n'
+        yield pad + ']\n'
     else:
-        comment = None #hash_lookup(vfs, v, default='', prefix='  ')
-        return '  ' * indent + f'{v}{comment}\n'
+        comment = hash_lookup(v, default='', prefix='  ')
+        yield pad + f'{v}{comment}\n'
+
+
+def adf_format(v, type_map, indent=0):
+    return ''.join(adf_format_lines(v, type_map, indent))
+
+
+def _json_value(v):
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, (bytes, bytearray)):
+        return bytes(v).decode('utf-8', errors='replace')
+    if isinstance(v, float) and v != v:
+        return None
+    if isinstance(v, (list, tuple, np.ndarray)):
+        return [_json_value(i) for i in v]
+    return v
+
+
+def adf_value_records(v, type_map, path=''):
+    """
+    One dict per leaf value under `v`, with the path to it (member names and array indexes joined by "/"),
+    its type and offset. Written one per line by `Adf.dump(f, jsonl=True)` so two dumps can be diffed line by line.
+    """
+    stack = [(path, v)]
+    while stack:
+        path, v = stack.pop()
+        if not isinstance(v, AdfValue):
+            if isinstance(v, list):
+                v = [str(ent) if isinstance(ent, GdcArchiveEntry) else ent for ent in v]
+            yield {'path': path, 'value': _json_value(v)}
+            continue
+        type_def = type_map.get(v.type_id, TypeDef())
+        if v.type_id == 0xdefe88ed:
+            stack.append((path, v.value))
+        elif type_def.metatype == MetaType.Structure:
+            stack.extend(reversed([(f'{path}/{k}', iv) for k, iv in v.value.items()]))
+        elif type_def.metatype in {MetaType.Array, MetaType.InlineArray} and isinstance(v.value, list):
+            stack.extend(reversed([(f'{path}/{i}', iv) for i, iv in enumerate(v.value)]))
+        else:
+            record = {
+                'path': path,
+                'type': adf_type_id_to_str(v.type_id, type_map),
+                'offset': v.data_offset,
+                'value': _json_value(v.value),
+            }
+            if v.bit_offset is not None:
+                record['bit_offset'] = v.bit_offset
+            if type_def.metatype == MetaType.Enumeration:
+                record['enum'] = _json_value(v.enum_string)
+            elif type_def.metatype == MetaType.StringHash:
+                record['hash_string'] = _adf_hash_string(v, type_def)[0]
+            yield record
 
 
 def adf_value_extract(v):
@@ -895,61 +914,103 @@ class Adf:
         self.table_instance_full_values = []
         self.table_instance_values = []
 
-    def dump_to_string(self):
-        sbuf = ''
-        sbuf = sbuf + '--------header\n'
-        sbuf = sbuf + '{}: {}\n'.format('version', self.version)
-        sbuf = sbuf + '{}: {}\n'.format('instance_count', self.instance_count)
-        sbuf = sbuf + '{}: {}\n'.format('instance_offset', self.instance_offset)
-        sbuf = sbuf + '{}: {}\n'.format('typedef_count', self.typedef_count)
-        sbuf = sbuf + '{}: {}\n'.format('typedef_offset', self.typedef_offset)
-        sbuf = sbuf + '{}: {}\n'.format('stringhash_count', self.stringhash_count)
-        sbuf = sbuf + '{}: {}\n'.format('stringhash_offset', self.stringhash_offset)
-        sbuf = sbuf + '{}: {}\n'.format('nametable_count', self.nametable_count)
-        sbuf = sbuf + '{}: {}\n'.format('nametable_offset', self.nametable_offset)
-        sbuf = sbuf + '{}: {}\n'.format('total_size', self.total_size)
+    def dump_lines(self):
+        """
+        The text dump a section or value at a time, see `dump`.
+        """
+        yield '--------header\n'
+        yield '{}: {}\n'.format('version', self.version)
+        yield '{}: {}\n'.format('instance_count', self.instance_count)
+        yield '{}: {}\n'.format('instance_offset', self.instance_offset)
+        yield '{}: {}\n'.format('typedef_count', self.typedef_count)
+        yield '{}: {}\n'.format('typedef_offset', self.typedef_offset)
+        yield '{}: {}\n'.format('stringhash_count', self.stringhash_count)
+        yield '{}: {}\n'.format('stringhash_offset', self.stringhash_offset)
+        yield '{}: {}\n'.format('nametable_count', self.nametable_count)
+        yield '{}: {}\n'.format('nametable_offset', self.nametable_offset)
+        yield '{}: {}\n'.format('total_size', self.total_size)
         for i in range(len(self.unknown)):
-            sbuf = sbuf + 'Unknown[{0}]: {1} 0x{1:08x}\n'.format(i, self.unknown[i])
+            yield 'Unknown[{0}]: {1} 0x{1:08x}\n'.format(i, self.unknown[i])
 
-        sbuf = sbuf + '\n--------comment\n'
-        sbuf = sbuf + self.comment.decode('utf-8')
+        yield '\n--------comment\n'
+        yield self.comment.decode('utf-8')
 
-        sbuf = sbuf + '\n\n--------name_table\n'
-        # sbuf = sbuf + '  NOT CURRENTLY SHOWN\n'
+        yield '\n\n--------name_table\n'
         for i in range(len(self.table_name)):
-            sbuf = sbuf + 'name_table\t{}\t{}\n'.format(i, self.table_name[i][1].decode('utf-8'))
+            yield 'name_table\t{}\t{}\n'.format(i, self.table_name[i][1].decode('utf-8'))
 
-        sbuf = sbuf + '\n--------string_hash\n'
-        # sbuf = sbuf + '  NOT CURRENTLY SHOWN\n'
+        yield '\n--------string_hash\n'
         v: StringHash
         for k, v in self.map_stringhash.items():
-            sbuf = sbuf + 'string_hash\t{:016x}\t{}\n'.format(k, v.value)
+            yield 'string_hash\t{:016x}\t{}\n'.format(k, v.value)
 
-        sbuf = sbuf + '\n--------typedefs\n'
-        # sbuf = sbuf + '  NOT CURRENTLY SHOWN\n'
+        yield '\n--------typedefs\n'
         vt: TypeDef
         for k, vt in self.map_typedef.items():
-            sbuf = sbuf + 'typedefs\t{:08x}\t{} @ {} (0x{:08x})\n'.format(
+            yield 'typedefs\t{:08x}\t{} @ {} (0x{:08x})\n'.format(
                 k, vt.name.decode('utf-8'), vt.META_position, vt.META_position)
-            sbuf = sbuf + dump_type(k, self.extended_map_typedef, 2)
+            yield dump_type(k, self.extended_map_typedef, 2)
 
-        sbuf = sbuf + '\n--------instances\n'
-        for info, v, fv in zip(self.table_instance, self.table_instance_values, self.table_instance_full_values):
+        yield '\n--------instances\n'
+        for info, fv in zip(self.table_instance, self.table_instance_full_values):
             end_str = '{:08x}-???'.format(info.offset)
             if info.size is not None:
                 end_str = '{:08x}-{:08x}'.format(info.offset, info.offset + info.size)
 
-            sbuf = sbuf + 'instances\t{:08x}\t{:08x}\t{}\t{}\t{}\t{}\n'.format(
+            yield 'instances\t{:08x}\t{:08x}\t{}\t{}\t{}\t{}\n'.format(
                 info.name_hash,
                 info.type_hash,
                 info.name.decode('utf-8'),
                 info.offset, info.size,
                 end_str)
 
-            # sbuf = sbuf + pformat(v, width=1024) + '\n'
-            sbuf = sbuf + adf_format(fv, self.extended_map_typedef) + '\n'
+            yield from adf_format_lines(fv, self.extended_map_typedef)
+            yield '\n'
+
+    def dump_records(self):
+        """
+        The dump as dicts for `dump(f, jsonl=True)`: the header, names, string hashes and typedefs,
+        then one record per instance and one per value in it (see `adf_value_records`).
+        """
+        yield {
+            'section': 'header',
+            'version': self.version,
+            'instance_count': self.instance_count,
+            'typedef_count': self.typedef_count,
+            'stringhash_count': self.stringhash_count,
+            'nametable_count': self.nametable_count,
+            'total_size': self.total_size,
+            'comment': _json_value(self.comment),
+        }
+        for i, (_, name) in enumerate(self.table_name):
+            yield {'section': 'name_table', 'index': i, 'name': _json_value(name)}
+        for k, v in self.map_stringhash.items():
+            yield {'section': 'string_hash', 'hash': k, 'value': _json_value(v.value)}
+        for k, vt in self.map_typedef.items():
+            yield {'section': 'typedefs', 'hash': k, 'name': _json_value(vt.name), 'metatype': vt.metatype, 'size': vt.size}
+        for info, fv in zip(self.table_instance, self.table_instance_full_values):
+            name = info.name.decode('utf-8')
+            yield {
+                'section': 'instances', 'name': name, 'name_hash': info.name_hash, 'type_hash': info.type_hash,
+                'offset': info.offset, 'size': info.size,
+            }
+            for record in adf_value_records(fv, self.extended_map_typedef, name):
+                yield {'section': 'values', **record}
+
+    def dump(self, f, jsonl=False):
+        """
+        Write the dump to the text stream `f` as it is formatted, or one JSON object per line with `jsonl`.
+        """
+        if jsonl:
+            encoder = json.JSONEncoder(ensure_ascii=False, default=_json_value)
+            for record in self.dump_records():
+                f.write(encoder.encode(record))
+                f.write('\n')
+        else:
+            f.writelines(self.dump_lines())
 
-        return sbuf
+    def dump_to_string(self):
+        return ''.join(self.dump_lines())
 
     def deserialize(self, fp, map_typedef=None, process_instances=True):
         if map_typedef is None:
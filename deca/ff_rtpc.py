@@ -5,7 +5,7 @@
 
 from deca.file import ArchiveFile
 from deca.fast_file_2 import *
-from deca.hashes import hash32_func
+from deca.hashes import hash32_func, hash_name
 import struct
 from enum import IntEnum
 from typing import List, Optional
@@ -111,7 +111,7 @@ class RtpcProperty:
         elif self.type == k_type_event:
             data = ['ev:0x{:012X}'.format(d) for d in data]
 
-        return '@0x{:08x}({: 8d}) 0x{:08x} 0x{:08x} 0x{:02x} {:6s} = @0x{:08x}({: 8d}) {} '.format(
+        s = '@0x{:08x}({: 8d}) 0x{:08x} 0x{:08x} 0x{:02x} {:6s} = @0x{:08x}({: 8d}) {} '.format(
             self.pos, self.pos,
             self.name_hash,
             self.data_raw,
@@ -119,6 +119,10 @@ class RtpcProperty:
             PropType_names[self.type],
             self.data_pos, self.data_pos,
             data)
+        name = hash_name(self.name_hash)
+        if name is not None:
+            s = s + ' # {}'.format(name)
+        return s
         # return '0x{:08x}: {} = {}'.format(self.name_hash, PropType.type_names[self.type], self.data,)
 
 
@@ -142,10 +146,41 @@ class RtpcNode:
             self.name_hash, self.prop_count, self.child_count, self.data_offset, self.data_offset)
 
     def repr_with_name(self):
-        name = f'0x{self.name_hash:08x}'
+        name = hash_name(self.name_hash, f'0x{self.name_hash:08x}')
         return 'n:{} pc:{} cc:{} @ {} {:08x}'.format(
             name, self.prop_count, self.child_count, self.data_offset, self.data_offset)
 
+    def find(self, *path):
+        """
+        The node reached by following `path` down from this one, each step a child's name hash
+        (or a name, which is hashed). None when a step has no such child.
+        """
+        node = self
+        for name in path:
+            if isinstance(name, str):
+                name = hash32_func(name)
+            node = node.child_map.get(name)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _prop_equals(node, prop_hash, value):
+        prop = node.prop_map.get(prop_hash)
+        return prop is not None and prop.data == value
+
+    def find_children(self, prop_hash, value):
+        """
+        The children whose property `prop_hash` holds `value`, only the children's own properties are read.
+        """
+        return [child for child in self.child_table if self._prop_equals(child, prop_hash, value)]
+
+    def find_child(self, prop_hash, value):
+        """
+        The first child whose property `prop_hash` holds `value`, None when no child has it.
+        """
+        return next((child for child in self.child_table if self._prop_equals(child, prop_hash, value)), None)
+
 
 class Rtpc:
     def __init__(self):
@@ -303,3 +338,176 @@ def rtpc_from_binary(f_raw, rtpc: Optional[Rtpc] = None):
     rtpc_node_from_binary(f, rtpc.root_node)
 
     return rtpc
+
+
+# Buffer based decoder: node and property headers are unpacked a table at a time straight from the buffer
+# and typed property payloads are only decoded when `data` is first read.
+
+k_node_header = struct.Struct('<IIHH')
+k_prop_header = struct.Struct('<IIB')
+k_offset_types = {
+    k_type_str, k_type_vec2, k_type_vec3, k_type_vec4, k_type_mat3x3, k_type_mat4x4,
+    k_type_array_u32, k_type_array_f32, k_type_array_u8, k_type_objid, k_type_event,
+}
+k_fixed_f32_counts = {k_type_vec2: 2, k_type_vec3: 3, k_type_vec4: 4, k_type_mat3x3: 9, k_type_mat4x4: 16}
+k_array_formats = {k_type_array_u32: 'I', k_type_array_f32: 'f', k_type_array_u8: 'B', k_type_event: 'Q'}
+
+
+def _decode_prop_data(buffer, prop_type, data_raw, prop_pos):
+    if prop_type == k_type_f32:
+        return struct.unpack_from('<f', buffer, prop_pos + 4)[0]
+    if prop_type == k_type_str:
+        end = buffer.find(b'\00', data_raw)
+        return bytes(buffer[data_raw:end if end >= 0 else len(buffer)])
+    if prop_type in k_fixed_f32_counts:
+        return list(struct.unpack_from('<{}f'.format(k_fixed_f32_counts[prop_type]), buffer, data_raw))
+    if prop_type in k_array_formats:
+        n = struct.unpack_from('<I', buffer, data_raw)[0]
+        return list(struct.unpack_from('<{}{}'.format(n, k_array_formats[prop_type]), buffer, data_raw + 4)) if n else []
+    if prop_type == k_type_objid:
+        return struct.unpack_from('<Q', buffer, data_raw)[0]
+    if prop_type in (k_type_none, k_type_u32, k_type_unk_15, k_type_unk_16):
+        return data_raw
+    raise Exception('NOT HANDLED {}'.format(prop_type))
+
+
+class RtpcLazyProperty(RtpcProperty):
+    """
+    An `RtpcProperty` whose `data` is decoded from the buffer on first access.
+    """
+    __slots__ = ('_buffer', '_decoded')
+
+    def __init__(self, buffer, pos, name_hash, data_raw, prop_type):
+        self.pos = pos
+        self.name_hash = name_hash
+        self.data_raw = data_raw
+        self.type = prop_type
+        self.data_pos = data_raw if prop_type in k_offset_types else pos + 4
+        self._buffer = buffer
+        self._decoded = False
+
+    @property
+    def data(self):
+        if not self._decoded:
+            RtpcProperty.data.__set__(self, _decode_prop_data(self._buffer, self.type, self.data_raw, self.pos))
+            self._decoded = True
+            self._buffer = None
+        return RtpcProperty.data.__get__(self)
+
+    @data.setter
+    def data(self, value):
+        RtpcProperty.data.__set__(self, value)
+        self._decoded = True
+        self._buffer = None
+
+
+def _buffer_prop_table(buffer, view, start, count):
+    end = start + count * k_prop_header.size
+    return [
+        RtpcLazyProperty(buffer, start + i * k_prop_header.size, name_hash, data_raw, prop_type)
+        for i, (name_hash, data_raw, prop_type) in enumerate(k_prop_header.iter_unpack(view[start:end]))
+    ]
+
+
+def _buffer_child_table_pos(data_offset, prop_count):
+    # children 4-byte aligned after the properties
+    end = data_offset + prop_count * k_prop_header.size
+    return end + (4 - (end % 4)) % 4
+
+
+def _lazy_slot(name, load, loaded):
+    slot = getattr(RtpcNode, name)
+
+    def get(self):
+        if not getattr(self, loaded):
+            getattr(self, load)()
+        return slot.__get__(self)
+
+    def set_(self, value):
+        if not getattr(self, loaded):
+            getattr(self, load)()
+        slot.__set__(self, value)
+
+    return property(get, set_)
+
+
+class RtpcLazyNode(RtpcNode):
+    """
+    An `RtpcNode` whose property table and children are decoded from the buffer on first access.
+    Following a path with `find` only decodes the nodes on it and the headers of their siblings.
+    """
+    __slots__ = ('_buffer', '_view', '_props_loaded', '_children_loaded')
+
+    def __init__(self, buffer, view, header_pos):
+        self.name_hash, self.data_offset, self.prop_count, self.child_count = k_node_header.unpack_from(view, header_pos)
+        self._buffer = buffer
+        self._view = view
+        self._props_loaded = False
+        self._children_loaded = False
+
+    def _load_props(self):
+        self._props_loaded = True
+        prop_table = _buffer_prop_table(self._buffer, self._view, self.data_offset, self.prop_count)
+        RtpcNode.prop_table.__set__(self, prop_table)
+        RtpcNode.prop_map.__set__(self, {prop.name_hash: prop for prop in prop_table})
+
+    def _load_children(self):
+        self._children_loaded = True
+        pos = _buffer_child_table_pos(self.data_offset, self.prop_count)
+        child_table = [
+            RtpcLazyNode(self._buffer, self._view, pos + i * k_node_header.size) for i in range(self.child_count)
+        ]
+        RtpcNode.child_table.__set__(self, child_table)
+        RtpcNode.child_map.__set__(self, {child.name_hash: child for child in child_table})
+
+    prop_table = _lazy_slot('prop_table', '_load_props', '_props_loaded')
+    prop_map = _lazy_slot('prop_map', '_load_props', '_props_loaded')
+    child_table = _lazy_slot('child_table', '_load_children', '_children_loaded')
+    child_map = _lazy_slot('child_map', '_load_children', '_children_loaded')
+
+
+def rtpc_from_buffer(buffer, rtpc: Optional[Rtpc] = None, lazy=False):
+    """
+    Decode an RTPC file already read into `buffer` (bytes or bytearray) into the same `RtpcNode`/`RtpcProperty`
+    tree as `rtpc_from_binary`. Nodes are walked with a stack instead of recursion.
+    With `lazy` the root is an `RtpcLazyNode` and nothing below it is decoded until it is accessed.
+    """
+    if rtpc is None:
+        rtpc = Rtpc()
+    if isinstance(buffer, memoryview):
+        buffer = buffer.tobytes()  # strings are found with `bytes.find`
+    view = memoryview(buffer)
+
+    rtpc.magic = bytes(view[0:4])
+    if rtpc.magic != b'RTPC':
+        raise Exception('Bad MAGIC {}'.format(rtpc.magic))
+    rtpc.version = struct.unpack_from('<I', view, 4)[0]
+
+    if lazy:
+        rtpc.root_node = RtpcLazyNode(buffer, view, 8)
+        return rtpc
+
+    rtpc.root_node = RtpcNode()
+    stack = [(rtpc.root_node, 8)]
+    while stack:
+        node, header_pos = stack.pop()
+        node.name_hash, node.data_offset, node.prop_count, node.child_count = k_node_header.unpack_from(view, header_pos)
+
+        prop_table = _buffer_prop_table(buffer, view, node.data_offset, node.prop_count)
+        node.prop_table = prop_table
+        node.prop_map = {prop.name_hash: prop for prop in prop_table}
+
+        pos = _buffer_child_table_pos(node.data_offset, node.prop_count)
+        node.child_table = [RtpcNode() for _ in range(node.child_count)]
+        for i, child in enumerate(node.child_table):
+            stack.append((child, pos + i * k_node_header.size))
+        node.child_map = {}
+
+    # maps are filled once every child has its name hash
+    stack = [rtpc.root_node]
+    while stack:
+        node = stack.pop()
+        node.child_map = {child.name_hash: child for child in node.child_table}
+        stack.extend(node.child_table)
+
+    return rtpc
@@ -3,6 +3,12 @@
 # Copyright (c) 2018–2019 Krzysztof Kamieniecki
 # Licensed under the MIT License. See LICENSE file for details.
 
+import functools
+import numbers
+import struct
+
+import numpy as np
+
 '''
 KK FOUND HERE: https://stackoverflow.com/questions/3279615/python-implementation-of-jenkins-hash
 '''
@@ -77,11 +83,130 @@ def hashlittle2(data, initval=0, initval2=0):
 
     return c, b
 
-def hash32_func_bytes(data, init_val=0):
-    c, b = hashlittle2(data, init_val, 0)
+# Faster paths, checked against `hashlittle2` above by scripts/bench_hashes.py.
+# The bytes are read as little-endian u32 words from a copy zero-padded to whole 12 byte blocks, zero padding
+# adds nothing to the last block, which is what the tail cases of `hashlittle2` do.
+M32 = 0xffffffff
+HASH_CACHE_SIZE = 4096
+_WORDS = {}  # word unpacker per number of 12 byte blocks
+
+
+def _hash32_scalar(data, init_val=0):
+    length = len(data)
+    a = b = c = (0xdeadbeef + length + init_val) & 0xffffffff
+    if length == 0:
+        return c
+    blocks = (length + 11) // 12
+    words = _WORDS.get(blocks)
+    if words is None:
+        words = _WORDS[blocks] = struct.Struct('<{}I'.format(blocks * 3))
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    words = words.unpack(data.ljust(blocks * 12, b'\x00'))
+    # the rotations are xor-ed in unmasked, their bits do not overlap and the low 32 bits come out the same
+    for i in range(0, (blocks - 1) * 3, 3):
+        a += words[i]
+        b += words[i + 1]
+        c = (c + words[i + 2]) & 0xffffffff
+        # mix
+        a = ((a - c) ^ (c << 4) ^ (c >> 28)) & 0xffffffff; c = (c + b) & 0xffffffff
+        b = ((b - a) ^ (a << 6) ^ (a >> 26)) & 0xffffffff; a = (a + c) & 0xffffffff
+        c = ((c - b) ^ (b << 8) ^ (b >> 24)) & 0xffffffff; b = (b + a) & 0xffffffff
+        a = ((a - c) ^ (c << 16) ^ (c >> 16)) & 0xffffffff; c = (c + b) & 0xffffffff
+        b = ((b - a) ^ (a << 19) ^ (a >> 13)) & 0xffffffff; a = (a + c) & 0xffffffff
+        c = ((c - b) ^ (b << 4) ^ (b >> 28)) & 0xffffffff; b = (b + a) & 0xffffffff
+    i = (blocks - 1) * 3
+    a = (a + words[i]) & 0xffffffff
+    b = (b + words[i + 1]) & 0xffffffff
+    c = (c + words[i + 2]) & 0xffffffff
+    # final
+    c = ((c ^ b) - ((b << 14) | (b >> 18))) & 0xffffffff
+    a = ((a ^ c) - ((c << 11) | (c >> 21))) & 0xffffffff
+    b = ((b ^ a) - ((a << 25) | (a >> 7))) & 0xffffffff
+    c = ((c ^ b) - ((b << 16) | (b >> 16))) & 0xffffffff
+    a = ((a ^ c) - ((c << 4) | (c >> 28))) & 0xffffffff
+    b = ((b ^ a) - ((a << 14) | (a >> 18))) & 0xffffffff
+    c = ((c ^ b) - ((b << 24) | (b >> 8))) & 0xffffffff
     return c
 
-def hash32_func(data, init_val=0):
+
+@functools.lru_cache(maxsize=HASH_CACHE_SIZE)
+def _hash32_cached(data, init_val):
     if isinstance(data, str):
         data = data.encode('ascii')
-    return hash32_func_bytes(data, init_val)
\ No newline at end of file
+    return _hash32_scalar(data, init_val)
+
+
+def hash32_func_bytes(data, init_val=0):
+    return _hash32_scalar(data, init_val)
+
+
+def hash32_func(data, init_val=0):
+    """
+    The 32 bit lookup3 hash of `data` (str or bytes), repeated names and paths come from an LRU cache.
+    """
+    if isinstance(data, (str, bytes)):
+        return _hash32_cached(data, init_val)
+    return _hash32_scalar(data, init_val)
+
+
+def _rot(x, k):
+    return (x << np.uint32(k)) | (x >> np.uint32(32 - k))
+
+
+def hash32_many(items, init_val=0):
+    """
+    `hash32_func` of every str or bytes in `items` as a list, the strings are hashed together with NumPy,
+    a group per number of 12 byte blocks.
+    """
+    items = [item.encode('ascii') if isinstance(item, str) else bytes(item) for item in items]
+    result = [0] * len(items)
+    by_blocks = {}
+    for i, data in enumerate(items):
+        by_blocks.setdefault((len(data) + 11) // 12, []).append(i)
+    for blocks, indexes in by_blocks.items():
+        lengths = np.array([len(items[i]) for i in indexes], dtype=np.uint64)
+        start = (np.uint64(0xdeadbeef) + lengths + np.uint64(init_val & M32)) & np.uint64(M32)
+        a = start.astype(np.uint32)
+        if blocks == 0:
+            for i, value in zip(indexes, a.tolist()):
+                result[i] = value
+            continue
+        b = a.copy()
+        c = a.copy()
+        padded = b''.join(items[i].ljust(blocks * 12, b'\x00') for i in indexes)
+        words = np.frombuffer(padded, dtype='<u4').reshape(len(indexes), blocks * 3)
+        for block in range(blocks):
+            a += words[:, block * 3]
+            b += words[:, block * 3 + 1]
+            c += words[:, block * 3 + 2]
+            if block == blocks - 1:
+                break
+            a -= c; a ^= _rot(c, 4);  c += b
+            b -= a; b ^= _rot(a, 6);  a += c
+            c -= b; c ^= _rot(b, 8);  b += a
+            a -= c; a ^= _rot(c, 16); c += b
+            b -= a; b ^= _rot(a, 19); a += c
+            c -= b; c ^= _rot(b, 4);  b += a
+        c ^= b; c -= _rot(b, 14)
+        a ^= c; a -= _rot(c, 11)
+        b ^= a; b -= _rot(a, 25)
+        c ^= b; c -= _rot(b, 16)
+        a ^= c; a -= _rot(c, 4)
+        b ^= a; b -= _rot(a, 14)
+        c ^= b; c -= _rot(b, 24)
+        for i, value in zip(indexes, c.tolist()):
+            result[i] = value
+    return result
+
+
+# Names for hashes, the application sets this to a `lookup(hash32, default)` (see apc.hash_names)
+# to have the ADF and RTPC dumps show names next to hashes.
+hash_name_lookup = None
+
+
+def hash_name(hash32, default=None):
+    # values read from ADF files are numpy integers
+    if hash_name_lookup is None or not isinstance(hash32, numbers.Integral):
+        return default
+    return hash_name_lookup(int(hash32), default)
@@ -2,4 +2,5 @@
 REM Build a new Animal Population Changer - Revived for Windows
 rmdir /s /q "%CD%\build" 2>nul
 rmdir /s /q "%CD%\dist\apcgui" 2>nul
+python -m apc.config_cache build
 pyinstaller apcgui.spec
\ No newline at end of file
@@ -0,0 +1,52 @@
+'''
+Time the config name and key lookups over every species, reserve and population file.
+
+  python scripts/bench_config.py [--repeat 200]
+
+Each lookup is timed on its own, and again right after `update_language` so the cost of rebuilding the
+  config index is included.
+'''
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from apc import config
+
+def lookups() -> dict:
+  species_keys = list(config.ANIMAL_NAMES)
+  species_names = [config.ANIMAL_NAMES[s]["animal_name"] for s in species_keys]
+  reserve_names = config.reserve_names()
+  filenames = [config.get_population_file_name(r) for r in config.reserve_keys()]
+  return {
+    "get_species_key": (species_names, config.get_species_key),
+    "get_reserve_key_from_name": (reserve_names, config.get_reserve_key_from_name),
+    "species_unique_to_reserve": (species_keys, config.species_unique_to_reserve),
+    "get_species_name(star)": (species_keys, lambda s: config.get_species_name(s, star=True)),
+    "get_population_reserve_key": (filenames, config.get_population_reserve_key),
+    "get_population_name": (filenames, config.get_population_name),
+    "reserve_names": ([None], lambda _: config.reserve_names()),
+  }
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Time the apc.config lookups")
+  parser.add_argument("--repeat", type=int, default=200, help="passes over the full key set")
+  args = parser.parse_args()
+
+  language = config.use_languages[0]
+  print(f"{'lookup':30} {'keys':>5} {'us/call':>9} {'cold us/call':>13}")
+  for name, (keys, lookup) in lookups().items():
+    def run():
+      for key in keys:
+        lookup(key)
+    warm = timeit.timeit(run, number=args.repeat) / (args.repeat * len(keys))
+    def cold():
+      config.update_language(language)
+      run()
+    cold_time = timeit.timeit(cold, number=max(args.repeat // 10, 1)) / (max(args.repeat // 10, 1) * len(keys))
+    print(f"{name:30} {len(keys):5} {warm * 1e6:9.2f} {cold_time * 1e6:13.2f}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,71 @@
+'''
+Check the fast lookup3 hashes in deca.hashes against the reference `hashlittle2`, and time them.
+
+  python scripts/bench_hashes.py [--count 20000] [--repeat 5]
+
+Known answers are the reference hashes of names used in the game files plus random strings of 0 to 80 bytes,
+  so every tail length is covered. The check fails (exit code 1) on any mismatch.
+`hash32_func` only gains from its LRU cache once the strings repeat, with `--count` above the cache size every run misses.
+'''
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from deca import hashes
+
+NAMES = [b"", b"a", b"name", b"_class", b"instance", b"Root", b"A_Animal", b"red_deer", b"animal_raccoondog_name", b"twelve bytes", b"thirteen bytes"]
+
+def samples(count: int, seed: int = 1) -> list[bytes]:
+  rng = random.Random(seed)
+  return NAMES + [rng.randbytes(rng.randint(0, 80)) for _ in range(count)]
+
+def check(data: list[bytes]) -> int:
+  mismatches = 0
+  for init_val in (0, 1, 0xdeadbeef):
+    expected = [hashes.hashlittle2(item, init_val)[0] for item in data]
+    mismatches += sum(hashes.hash32_func_bytes(item, init_val) != value for item, value in zip(data, expected))
+    mismatches += sum(hashes.hash32_func(item, init_val) != value for item, value in zip(data, expected))
+    mismatches += sum(value != other for value, other in zip(expected, hashes.hash32_many(data, init_val)))
+  return mismatches
+
+def _median_ms(case, repeat: int) -> float:
+  times = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    case()
+    times.append(time.perf_counter() - start)
+  return statistics.median(times) * 1000
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Check and benchmark the lookup3 hashes")
+  parser.add_argument("--count", type=int, default=20000, help="random strings to hash")
+  parser.add_argument("--repeat", type=int, default=5, help="runs to take the median of")
+  args = parser.parse_args()
+
+  data = samples(args.count)
+  mismatches = check(data)
+  print(f"known answers: {len(data)} strings x 3 seeds, {mismatches} mismatches")
+
+  def cached() -> None:
+    for item in data:
+      hashes.hash32_func(item)
+  cases = {
+    "hashlittle2 (reference)": lambda: [hashes.hashlittle2(item)[0] for item in data],
+    "hash32_func_bytes": lambda: [hashes.hash32_func_bytes(item) for item in data],
+    "hash32_func (cached)": cached,
+    "hash32_many": lambda: hashes.hash32_many(data),
+  }
+  print(f"{'case':24} {'ms':>9} {'us/hash':>8}")
+  for name, case in cases.items():
+    ms = _median_ms(case, args.repeat)
+    print(f"{name:24} {ms:9.1f} {ms * 1000 / len(data):8.2f}")
+  sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+  main()
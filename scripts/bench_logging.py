@@ -0,0 +1,95 @@
+'''
+Measure what logging costs in the add-animals and fur-party paths, on a synthetic population file.
+
+  python scripts/bench_logging.py [--groups 50] [--animals 8] [--add 50] [--repeat 3]
+
+Each run is timed with debug logging off (the normal case) and on, with the rich handler writing to a null device.
+The per-call cost of an eager f-string debug call, a lazy `%s` call and a guarded call is timed with debug off.
+'''
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_populations import Bench, synthetic_populations
+from rich.console import Console
+from rich.logging import RichHandler
+
+from apc import adf, config, populations
+from apc.config import Strategy
+from apc.logging_config import debug_enabled
+
+def _use_level(level: str, devnull) -> None:
+  root = logging.getLogger()
+  root.handlers = [RichHandler(console=Console(file=devnull), markup=True)]
+  root.setLevel(level)
+
+def _median(bench: Bench, case, repeat: int) -> float:
+  times = []
+  for _ in range(repeat):
+    loaded_reserve = bench.fresh()
+    loaded_reserve.begin()
+    start = time.perf_counter()
+    case(loaded_reserve)
+    times.append(time.perf_counter() - start)
+  return statistics.median(times) * 1000
+
+def per_call(animal: adf.AdfAnimal, number: int = 100_000) -> dict[str, float]:
+  logger = logging.getLogger("apc.adf")
+  cases = {
+    "f-string": lambda: logger.debug(f"Cloned animal: {animal}"),
+    "lazy %s": lambda: logger.debug("Cloned animal: %s", animal),
+    "guarded": lambda: debug_enabled(logger) and logger.debug("Cloned animal: %s", animal),
+  }
+  return {name: timeit.timeit(case, number=number) / number * 1e9 for name, case in cases.items()}
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Benchmark the logging overhead of adding animals and fur parties")
+  parser.add_argument("--reserve", default="hirsch")
+  parser.add_argument("--groups", type=int, default=50, help="groups per species")
+  parser.add_argument("--animals", type=int, default=8, help="animals per group")
+  parser.add_argument("--add", type=int, default=50, help="animals to add")
+  parser.add_argument("--repeat", type=int, default=3, help="runs to take the median of")
+  args = parser.parse_args()
+
+  species_key = config.get_reserve(args.reserve)["species"][0]
+  cases = {
+    f"add {args.add} animals": lambda loaded_reserve: populations.mod_animal_cnt(loaded_reserve, species_key, args.add, "male"),
+    "fur party (100%)": lambda loaded_reserve: populations.mod(loaded_reserve, species_key, Strategy.furs_some, 100, percentage=True),
+  }
+  with tempfile.TemporaryDirectory(prefix="apc-bench-") as directory, open(os.devnull, "w") as devnull:
+    directory = Path(directory)
+    source = directory / config.get_population_file_name(args.reserve)
+    adf.write_population_file(synthetic_populations(args.reserve, args.groups, args.animals), source)
+    mods = directory / "mods"
+    mods.mkdir()
+    config.MOD_DIR_PATH = mods
+    # the decompressed `.working/` copies go in the temporary directory too
+    config.APP_DIR_PATH = directory
+    bench = Bench(source, mods, args.reserve, args.repeat)
+
+    print(f"{'case':24} {'debug off ms':>13} {'debug on ms':>12}")
+    for name, case in cases.items():
+      _use_level("INFO", devnull)
+      off = _median(bench, case, args.repeat)
+      _use_level("DEBUG", devnull)
+      on = _median(bench, case, args.repeat)
+      print(f"{name:24} {off:13.1f} {on:12.1f}")
+
+    _use_level("INFO", devnull)
+    loaded_reserve = bench.fresh()
+    groups = populations._get_species_groups(args.reserve, loaded_reserve.parsed_adf.adf, species_key)
+    animal = adf.AdfAnimal(groups[0].value["Animals"].value[0], species_key, args.reserve)
+    print(f"\n{'debug call, debug off':24} {'ns/call':>13}")
+    for name, ns in per_call(animal).items():
+      print(f"{name:24} {ns:13.0f}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,172 @@
+'''
+Time parsing, describing, dumping, modding and saving a population file, built from scratch so no game files are needed.
+
+  python scripts/bench_populations.py [--reserve hirsch] [--groups 50] [--animals 8] [--repeat 5]
+
+The synthetic file has every species of the reserve with `--groups` groups of `--animals` animals, written by
+  `adf.write_population_file`. Each case runs on a fresh copy of the file, its median time
+  is taken over `--repeat` runs and its peak memory from one more run under `tracemalloc`.
+Results are appended to a history file, and compared with the last result for the same reserve and size.
+'''
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "populations_history.jsonl"
+
+from apc import adf, config, populations, thresholds
+from apc.config import Strategy
+
+def synthetic_populations(reserve_key: str, groups: int, animals: int, seed: int = 1) -> adf.PopulationModel:
+  '''Animals spread over each species' configured weight and score range, with a few Great Ones'''
+  rng = random.Random(seed)
+  result = []
+  for species_key in config.get_reserve(reserve_key)["species"]:
+    genders = config.get_species(species_key)["gender"]
+    species_groups = []
+    for _ in range(groups):
+      group = []
+      for _ in range(animals):
+        gender = rng.choice(("male", "female"))
+        great_one = f"great_one_{gender}" in genders and rng.random() < 0.05
+        bounds = genders[f"great_one_{gender}" if great_one else gender]
+        p = rng.random()
+        weight = bounds["weight_low"] + p * (bounds["weight_high"] - bounds["weight_low"])
+        score = bounds["score_low"] + p * (bounds["score_high"] - bounds["score_low"])
+        group.append(adf.PopulationAnimal(thresholds.MALE if gender == "male" else thresholds.FEMALE, weight, score, great_one, rng.getrandbits(32)))
+      species_groups.append(group)
+    result.append(species_groups)
+  return result
+
+class Bench:
+  '''Runs each case on a fresh copy of the synthetic file in `mods`, which stands in for the mods folder'''
+  def __init__(self, source: Path, mods: Path, reserve_key: str, repeat: int) -> None:
+    self.source = source
+    self.mods = mods
+    self.reserve_key = reserve_key
+    self.repeat = repeat
+    self.results = {}
+
+  def fresh(self) -> adf.LoadedReserve:
+    shutil.copyfile(self.source, self.mods / self.source.name)
+    return adf.LoadedReserve(self.reserve_key, modded=True, parse=True)
+
+  def time(self, name: str, case: Callable[[object], None], setup: Callable[[], object] = None) -> None:
+    times = []
+    for _ in range(self.repeat):
+      state = setup() if setup else None
+      start = time.perf_counter()
+      case(state)
+      times.append(time.perf_counter() - start)
+    state = setup() if setup else None
+    tracemalloc.start()
+    case(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    self.results[name] = {"ms": round(statistics.median(times) * 1000, 3), "peak_kb": round(peak / 1024, 1)}
+    print(f"{name:32} {self.results[name]['ms']:10.2f} ms {self.results[name]['peak_kb']:10.1f} KiB")
+
+def session(bench: Bench) -> adf.LoadedReserve:
+  # strategies save at the end, timed on its own by the "save" case
+  loaded_reserve = bench.fresh()
+  loaded_reserve.begin()
+  return loaded_reserve
+
+def run(bench: Bench, species_key: str, modifier: int) -> None:
+  bench.time("decompress", lambda _: adf._decompress_adf_file(bench.source))
+  decompressed = adf._decompress_adf_file(bench.source)
+  bench.time("deserialize", lambda _: adf.parse_adf(decompressed.filename))
+  parsed = bench.fresh().parsed_adf
+  bench.time("describe_reserve", lambda _: populations.describe_reserve(bench.reserve_key, parsed.adf, reserve_data=parsed.decompressed.data))
+  bench.time("describe_animals", lambda _: populations.describe_animals(bench.reserve_key, species_key, parsed.adf))
+  with open(os.devnull, "w") as devnull:
+    bench.time("dump txt", lambda _: parsed.adf.dump(devnull))
+    bench.time("dump jsonl", lambda _: parsed.adf.dump(devnull, jsonl=True))
+
+  for strategy in Strategy:
+    if strategy == Strategy.add:
+      case = lambda loaded_reserve: populations.mod_animal_cnt(loaded_reserve, species_key, modifier, "male")
+    elif strategy == Strategy.remove:
+      case = lambda loaded_reserve: populations.mod_animal_cnt(loaded_reserve, species_key, -modifier, "female")
+    else:
+      case = lambda loaded_reserve, strategy=strategy: populations.mod(loaded_reserve, species_key, strategy, modifier, percentage=True)
+    bench.time(f"strategy {strategy.value}", case, setup=lambda: session(bench))
+  bench.time("save", lambda loaded_reserve: loaded_reserve.save(), setup=bench.fresh)
+
+def _git_commit() -> str:
+  result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+  return result.stdout.strip() or None
+
+def compare(history: Path, record: dict) -> None:
+  if not history.exists():
+    return
+  previous = None
+  for line in history.read_text(encoding="utf-8").splitlines():
+    other = json.loads(line)
+    if other["params"] == record["params"]:
+      previous = other
+  if previous is None:
+    return
+  print(f"\ncompared with {previous['commit']} ({previous['date']}):")
+  for name, result in record["results"].items():
+    if isinstance(result, dict) and name in previous["results"]:
+      before = previous["results"][name]["ms"]
+      change = (result["ms"] - before) / before * 100 if before else 0
+      print(f"{name:32} {before:10.2f} -> {result['ms']:10.2f} ms  {change:+6.1f}%")
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Benchmark apc on a synthetic population file")
+  parser.add_argument("--reserve", default="hirsch", help="reserve whose species the file has")
+  parser.add_argument("--species", default=None, help="species to describe and mod, defaults to the reserve's first")
+  parser.add_argument("--groups", type=int, default=50, help="groups per species")
+  parser.add_argument("--animals", type=int, default=8, help="animals per group")
+  parser.add_argument("--modifier", type=int, default=10, help="percentage of animals the strategies change, and animals added/removed")
+  parser.add_argument("--repeat", type=int, default=5, help="runs to take the median of")
+  parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON lines file the result is appended to")
+  args = parser.parse_args()
+
+  species_key = args.species or config.get_reserve(args.reserve)["species"][0]
+  with tempfile.TemporaryDirectory(prefix="apc-bench-") as directory:
+    directory = Path(directory)
+    source = directory / config.get_population_file_name(args.reserve)
+    adf.write_population_file(synthetic_populations(args.reserve, args.groups, args.animals), source)
+    mods = directory / "mods"
+    mods.mkdir()
+    config.MOD_DIR_PATH = mods
+    # the decompressed `.working/` copies go in the temporary directory too
+    config.APP_DIR_PATH = directory
+    bench = Bench(source, mods, args.reserve, args.repeat)
+    file_bytes = source.stat().st_size
+    print(f"{args.reserve}: {args.groups} groups of {args.animals} animals per species, {file_bytes} bytes compressed")
+    run(bench, species_key, args.modifier)
+
+  record = {
+    "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    "commit": _git_commit(),
+    "python": platform.python_version(),
+    "params": {"reserve": args.reserve, "species": species_key, "groups": args.groups, "animals": args.animals, "modifier": args.modifier},
+    "file_bytes": file_bytes,
+    "results": bench.results,
+  }
+  compare(args.history, record)
+  args.history.parent.mkdir(exist_ok=True, parents=True)
+  with args.history.open("a", encoding="utf-8") as history:
+    history.write(json.dumps(record) + "\n")
+  print(f"appended to {args.history}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,83 @@
+'''
+Compare the stream, buffer and lazy RTPC decoders on the bundled global_animal_types.blo.
+
+  python scripts/bench_rtpc.py [--repeat 5] [--species red_deer] [--file apc/config/global_animal_types.blo]
+
+Times decoding the tree, then reading every property's `data`, and checks the decoders give the same tree.
+The lazy tree is also timed finding one species by name, which leaves the rest of the file undecoded.
+'''
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from deca.ff_rtpc import RtpcNode, h_prop_name, rtpc_from_binary, rtpc_from_buffer
+
+def _nodes(root: RtpcNode):
+  stack = [root]
+  while stack:
+    node = stack.pop()
+    yield node
+    stack.extend(node.child_table)
+
+def read_all(root: RtpcNode) -> int:
+  count = 0
+  for node in _nodes(root):
+    for prop in node.prop_table:
+      prop.data
+      count += 1
+  return count
+
+def same_tree(a: RtpcNode, b: RtpcNode) -> bool:
+  for x, y in zip(_nodes(a), _nodes(b), strict=True):
+    if (x.name_hash, x.data_offset, x.prop_count, x.child_count) != (y.name_hash, y.data_offset, y.prop_count, y.child_count):
+      return False
+    if [repr(p) for p in x.prop_table] != [repr(p) for p in y.prop_table]:
+      return False
+  return True
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Benchmark the RTPC decoders")
+  parser.add_argument("--file", type=Path, default=ROOT / "apc" / "config" / "global_animal_types.blo")
+  parser.add_argument("--species", default="red_deer", help="species the lazy tree is searched for")
+  parser.add_argument("--repeat", type=int, default=5, help="runs to take the median of")
+  args = parser.parse_args()
+
+  data = args.file.read_bytes()
+  decoders = {
+    "rtpc_from_binary": lambda: rtpc_from_binary(io.BytesIO(data)).root_node,
+    "rtpc_from_buffer": lambda: rtpc_from_buffer(data).root_node,
+    "lazy": lambda: rtpc_from_buffer(data, lazy=True).root_node,
+  }
+  print(f"{args.file.name}: {len(data)} bytes")
+  print(f"{'decoder':20} {'decode ms':>10} {'+ read data ms':>15}")
+  roots = {}
+  for name, decode in decoders.items():
+    decode_times = []
+    total_times = []
+    for _ in range(args.repeat):
+      start = time.perf_counter()
+      root = decode()
+      decode_times.append(time.perf_counter() - start)
+      read_all(root)
+      total_times.append(time.perf_counter() - start)
+    roots[name] = root
+    print(f"{name:20} {statistics.median(decode_times) * 1000:10.1f} {statistics.median(total_times) * 1000:15.1f}")
+
+  times = []
+  for _ in range(args.repeat):
+    start = time.perf_counter()
+    rtpc_from_buffer(data, lazy=True).root_node.child_table[0].find_child(h_prop_name, args.species.encode("utf-8")).prop_map
+    times.append(time.perf_counter() - start)
+  print(f"{'lazy, find ' + args.species:20} {statistics.median(times) * 1000:10.1f}")
+
+  first, *others = roots.values()
+  print(f"properties: {read_all(first)}, same tree: {all(same_tree(first, other) for other in others)}")
+
+if __name__ == "__main__":
+  main()
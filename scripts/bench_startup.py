@@ -0,0 +1,100 @@
+'''
+Measure application startup and append the result to a history file so regressions show up over time.
+
+  python scripts/bench_startup.py [--runs 5] [--history scripts/startup_history.jsonl]
+
+Import times come from `python -X importtime`, time to first window from building `gui.main_window()`
+  (skipped when there is no display).
+'''
+import argparse
+import datetime
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "startup_history.jsonl"
+IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+FIRST_WINDOW = '''
+import time
+start = time.perf_counter()
+from apcgui import gui
+window = gui.main_window()
+window.finalize()
+print(time.perf_counter() - start)
+window.close()
+'''
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+  return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+
+def import_times(module: str, top: int) -> dict:
+  result = _run(["-X", "importtime", "-c", f"import {module}"])
+  if result.returncode != 0:
+    raise RuntimeError(result.stderr.strip().splitlines()[-1])
+  modules = []
+  for line in result.stderr.splitlines():
+    if match := IMPORTTIME.match(line):
+      self_us, cumulative_us, indent, name = match.groups()
+      modules.append((name, int(self_us), int(cumulative_us), len(indent)))
+  total = next(m[2] for m in modules if m[0] == module)
+  slowest = sorted(modules, key=lambda m: m[1], reverse=True)[:top]
+  return {
+    "total_ms": total / 1000,
+    "slowest_self_ms": {name: self_us / 1000 for name, self_us, _, _ in slowest},
+  }
+
+def first_window() -> float:
+  result = _run(["-c", FIRST_WINDOW])
+  if result.returncode != 0:
+    return None
+  return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+def _git_commit() -> str:
+  result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+  return result.stdout.strip() or None
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Measure apc startup time")
+  parser.add_argument("--runs", type=int, default=5, help="runs to take the median of")
+  parser.add_argument("--top", type=int, default=10, help="slowest modules to record")
+  parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON lines file the result is appended to")
+  args = parser.parse_args()
+
+  config_ms = statistics.median(import_times("apc.config", args.top)["total_ms"] for _ in range(args.runs))
+  gui_runs = [import_times("apcgui.gui", args.top) for _ in range(args.runs)]
+  gui_ms = statistics.median(run["total_ms"] for run in gui_runs)
+  windows = [first_window() for _ in range(args.runs)]
+  window_ms = statistics.median(windows) if None not in windows else None
+
+  record = {
+    "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    "commit": _git_commit(),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "import_config_ms": round(config_ms, 1),
+    "import_gui_ms": round(gui_ms, 1),
+    "first_window_ms": round(window_ms, 1) if window_ms is not None else None,
+    "slowest_self_ms": gui_runs[-1]["slowest_self_ms"],
+  }
+  print(f"import apc.config: {record['import_config_ms']} ms")
+  print(f"import apcgui.gui: {record['import_gui_ms']} ms")
+  if window_ms is None:
+    print("first window: skipped, no display")
+  else:
+    print(f"first window: {record['first_window_ms']} ms")
+  for name, ms in record["slowest_self_ms"].items():
+    print(f"  {ms:8.1f} ms  {name}")
+
+  args.history.parent.mkdir(exist_ok=True, parents=True)
+  with args.history.open("a", encoding="utf-8") as history:
+    history.write(json.dumps(record) + "\n")
+  print(f"appended to {args.history}")
+
+if __name__ == "__main__":
+  main()